@@ -0,0 +1,81 @@
+"""
+Benchmark the float and fixed-point undistortion map representations.
+
+Reports the time to build the maps, their memory footprint, the time to remap a photo,
+and how much the fixed-point result differs from the float result.
+
+Usage:
+    uv run python benchmarks/undistort_maps.py [PHOTO] [--k1 0.1] [--repeat 5]
+
+Without a photo, a synthetic 6000x4000 photo is used.
+"""
+
+import time
+from pathlib import Path
+
+import click
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from preprocessor.processing.load_image import load_image
+from preprocessor.processing.params import UndistortMapType
+from preprocessor.processing.undistort import UNDISTORT_MAPS_CACHE_BYTES, UndistortMapsCache, undistort_image
+
+
+def _synthetic_photo(width: int, height: int) -> MatLike:
+    """Create a photo with fine detail, so that interpolation differences show up."""
+    rng = np.random.default_rng(42)
+    img = rng.integers(0, 256, (height // 8, width // 8, 3), dtype=np.uint8)
+    return cv2.resize(img, (width, height), interpolation=cv2.INTER_CUBIC)
+
+
+@click.command()
+@click.argument("photo", type=click.Path(exists=True, dir_okay=False, path_type=Path), required=False)
+@click.option("--k1", type=float, default=0.1, show_default=True, help="Radial distortion coefficient.")
+@click.option("--repeat", type=int, default=5, show_default=True, help="Number of remaps to average over.")
+def main(photo: Path | None, k1: float, repeat: int) -> None:
+    """Benchmark the float and fixed-point undistortion map representations."""
+    img = load_image(str(photo)) if photo is not None else _synthetic_photo(6000, 4000)
+    if img is None:
+        msg = f"Failed to load photo: {photo}"
+        raise click.ClickException(msg)
+    h, w = img.shape[:2]
+    camera_matrix = ((float(w), 0.0, w / 2.0), (0.0, float(w), h / 2.0), (0.0, 0.0, 1.0))
+    dist = [k1, 0.0, 0.0, 0.0, 0.0]
+    click.echo(f"Photo: {w}x{h} pixels, k1={k1}")
+
+    results: dict[UndistortMapType, MatLike] = {}
+    for map_type in UndistortMapType:
+        # A fresh cache, so that the maps are built rather than taken from an earlier run
+        maps_cache = UndistortMapsCache(UNDISTORT_MAPS_CACHE_BYTES)
+        start = time.perf_counter()
+        map1, map2 = maps_cache.get(camera_matrix, dist, w, h, map_type)
+        build_time = time.perf_counter() - start
+        size_mb = (map1.nbytes + map2.nbytes) / (1024 * 1024)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = undistort_image(img, camera_matrix, dist, map_type=map_type, maps_cache=maps_cache)
+        remap_time = (time.perf_counter() - start) / repeat
+        assert result is not None
+        results[map_type] = result
+
+        click.echo(
+            f"{map_type.value:>12}: build {build_time * 1000:7.1f} ms, "
+            f"maps {size_mb:7.1f} MB, remap {remap_time * 1000:7.1f} ms"
+        )
+
+    diff = np.abs(
+        results[UndistortMapType.FIXED_POINT].astype(np.int16) - results[UndistortMapType.FLOAT].astype(np.int16)
+    )
+    mse = float(np.mean(diff.astype(np.float64) ** 2))
+    psnr = float("inf") if mse == 0 else 10 * np.log10(255.0**2 / mse)
+    click.echo(
+        f"Fixed-point vs float: max abs diff {int(diff.max())}, mean abs diff {float(diff.mean()):.4f}, "
+        f"PSNR {psnr:.1f} dB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from preprocessor.main import main
+from preprocessor.cli import main
 
 if __name__ == "__main__":
     main()
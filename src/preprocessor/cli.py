@@ -0,0 +1,215 @@
+"""
+The command-line interface.
+
+The headless commands (`export`, `detect`, `undistort`) never import the Qt widgets or create a QApplication,
+so they can be run on a server without a display.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+import click
+
+from preprocessor import app_formal_name, app_version
+from preprocessor.model.project_model import ProjectModel
+from preprocessor.processing.parallel import default_worker_count
+
+logger = logging.getLogger(__name__)
+
+_jobs_option = click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of photos to process in parallel. [default: number of CPU cores]",
+)
+_quality_option = click.option(
+    "--quality",
+    type=click.IntRange(0, 100),
+    default=95,
+    show_default=True,
+    help="JPEG quality of the written photos.",
+)
+_project_argument = click.argument(
+    "project_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+
+
+@click.group(invoke_without_command=True)
+@click.option("-v", "--verbose", count=True, help="Log more details; repeat for debug output.")
+@click.version_option(app_version, prog_name=app_formal_name)
+@click.pass_context
+def cli(ctx: click.Context, verbose: int) -> None:
+    """Preprocess benthic photos. Without a command, the GUI is launched."""
+    if ctx.invoked_subcommand is None:
+        ctx.invoke(gui)
+        return
+    if ctx.invoked_subcommand != gui.name:
+        levels = [logging.WARNING, logging.INFO, logging.DEBUG]
+        logging.basicConfig(level=levels[min(verbose, len(levels) - 1)])
+
+
+@cli.command()
+def gui() -> None:
+    """Launch the GUI."""
+    # Only import Qt widgets when they are actually needed
+    from preprocessor.main import main
+
+    main()
+
+
+@cli.command()
+@_project_argument
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory to export to. [default: the export path of the project]",
+)
+@_quality_option
+@_jobs_option
+def export(project_file: Path, output: Path | None, quality: int, jobs: int | None) -> None:
+    """Undistort, fix the perspective, and export all photos of a project."""
+    from preprocessor.processing.export import create_export_jobs, export_photos
+
+    project = _read_project(project_file)
+    if output is not None:
+        project.export_path = output.resolve()
+    if project.export_path is None:
+        msg = "The project has no export path; specify one with --output."
+        raise click.UsageError(msg)
+    if project.target_width is None or project.target_height is None:
+        msg = "The project has no target width/height for export."
+        raise click.ClickException(msg)
+    project.export_path.mkdir(parents=True, exist_ok=True)
+
+    export_jobs = create_export_jobs(project, quality=quality)
+    workers = jobs or default_worker_count()
+    click.echo(f"Exporting {len(export_jobs)} photos to {project.export_path} using {workers} workers...")
+
+    start = time.perf_counter()
+    failed = 0
+    for result in export_photos(export_jobs, max_workers=workers):
+        if not result.ok:
+            failed += 1
+        if result.message:
+            click.echo(f"{result.severity.capitalize()}: {result.message}", err=True)
+    _report("Exported", len(export_jobs), failed, time.perf_counter() - start)
+
+
+@cli.command()
+@_project_argument
+@click.option("--force", is_flag=True, help="Also detect the quadrat in photos that already have corners.")
+@_jobs_option
+def detect(project_file: Path, force: bool, jobs: int | None) -> None:
+    """Detect the quadrat in the photos of a project, and save the corners in the project."""
+    from preprocessor.processing.detect import create_detect_jobs, detect_photos
+
+    project = _read_project(project_file)
+    detect_jobs = create_detect_jobs(project, only_missing=not force)
+    workers = jobs or default_worker_count()
+    click.echo(f"Detecting the quadrat in {len(detect_jobs)} photos using {workers} workers...")
+
+    start = time.perf_counter()
+    failed = 0
+    for result in detect_photos(detect_jobs, max_workers=workers):
+        if result.corners is None:
+            failed += 1
+            click.echo(f"Warning: {result.message}", err=True)
+            continue
+        project.photos[result.job.index].quadrat_corners = list(result.corners)
+    elapsed = time.perf_counter() - start
+
+    if project.dirty:
+        project.write_to_file(project.file)
+        click.echo(f"Saved {project.file}")
+    _report("Detected the quadrat in", len(detect_jobs), failed, elapsed)
+
+
+@cli.command()
+@_project_argument
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(file_okay=False, path_type=Path),
+    required=True,
+    help="Directory to write the undistorted photos to.",
+)
+@_quality_option
+@_jobs_option
+def undistort(project_file: Path, output: Path, quality: int, jobs: int | None) -> None:
+    """Undistort all photos of a project, keeping their paths relative to the project."""
+    from preprocessor.processing.parallel import run_in_processes
+    from preprocessor.processing.undistort import UndistortJob, undistort_photo_file
+
+    project = _read_project(project_file)
+    undistort_jobs = [
+        UndistortJob(
+            source_path=project.get_absolute_path(photo.original_filename),
+            output_path=output.resolve() / _output_relative_path(project, photo.original_filename),
+            camera_matrix=photo.camera_matrix,
+            distortion_coefficients=tuple(photo.distortion_coefficients),
+            undistort_map_type=project.undistort_map_type,
+            quality=quality,
+        )
+        for photo in project.photos
+    ]
+    # Never let one photo silently overwrite another
+    sources_by_output: dict[Path, Path] = {}
+    for job in undistort_jobs:
+        other = sources_by_output.setdefault(job.output_path, job.source_path)
+        if other != job.source_path:
+            msg = f"Photos {other} and {job.source_path} would both be written to {job.output_path}"
+            raise click.ClickException(msg)
+    for output_dir in {job.output_path.parent for job in undistort_jobs} | {output}:
+        output_dir.mkdir(parents=True, exist_ok=True)
+    workers = jobs or default_worker_count()
+    click.echo(f"Undistorting {len(undistort_jobs)} photos to {output} using {workers} workers...")
+
+    start = time.perf_counter()
+    failed = 0
+    for _job, message in run_in_processes(undistort_photo_file, undistort_jobs, max_workers=workers):
+        if message is not None:
+            failed += 1
+            click.echo(f"Error: {message}", err=True)
+    _report("Undistorted", len(undistort_jobs), failed, time.perf_counter() - start)
+
+
+def _output_relative_path(project: ProjectModel, original_filename: Path) -> Path:
+    """
+    Return the path to write the processed photo to, relative to the output directory.
+
+    This is the path of the photo relative to the project directory, or just its filename if it is outside of it.
+    """
+    project_dir = project.file.parent.resolve()
+    source_path = project.get_absolute_path(original_filename)
+    if source_path.is_relative_to(project_dir):
+        return source_path.relative_to(project_dir)
+    return Path(source_path.name)
+
+
+def _read_project(project_file: Path) -> ProjectModel:
+    """Read the project file, or fail with a user-friendly message."""
+    try:
+        return ProjectModel.read_from_file(project_file.resolve())
+    except (OSError, ValueError) as e:
+        msg = f"Failed to read project {project_file}: {e}"
+        raise click.ClickException(msg) from e
+
+
+def _report(action: str, total: int, failed: int, elapsed: float) -> None:
+    """Report the throughput, and exit with a non-zero exit code if any photo failed."""
+    succeeded = total - failed
+    throughput = total / elapsed if elapsed > 0 else 0.0
+    click.echo(f"{action} {succeeded} of {total} photos in {elapsed:.1f} s ({throughput:.2f} photos/s).")
+    if failed:
+        click.echo(f"{failed} photos failed.", err=True)
+        raise SystemExit(1)
+
+
+def main() -> None:
+    """Run the command-line interface."""
+    cli()
@@ -14,10 +14,8 @@ from PySide6.QtWidgets import (
 from preprocessor.gui.ui_export_dialog import Ui_ExportDialog
 from preprocessor.model.photo_model import PhotoModel
 from preprocessor.model.project_model import ProjectModel
-from preprocessor.processing.fix_perspective import fix_perspective
-from preprocessor.processing.load_image import load_image
-from preprocessor.processing.save_image import save_image
-from preprocessor.processing.undistort import undistort_photo
+from preprocessor.processing.export import create_export_jobs, determine_output_name, export_photos
+from preprocessor.processing.parallel import default_worker_count
 
 
 class ExportDialog(QDialog):
@@ -66,6 +64,7 @@ class ExportDialog(QDialog):
         default_height = getattr(self.current_project, "target_height", None) or 1024
         self.ui.numTargetWidth.setValue(int(default_width))
         self.ui.numTargetHeight.setValue(int(default_height))
+        self.ui.numWorkers.setValue(default_worker_count())
         # # Set the label displays to match the initial values
         # self.ui.lblTargetWidth_Value.setText(str(int(default_width)))
         # self.ui.lblTargetHeight_Value.setText(str(int(default_height)))
@@ -86,6 +85,7 @@ class ExportDialog(QDialog):
         # Disable UI controls while exporting
         self.ui.btnOutputDir.setEnabled(False)
         self.ui.txtOutputDir.setEnabled(False)
+        self.ui.numWorkers.setEnabled(False)
         self.ui.btnsDialog.button(QDialogButtonBox.StandardButton.SaveAll).setEnabled(False)
 
         # Save the settings
@@ -99,7 +99,7 @@ class ExportDialog(QDialog):
         self.ui.lblProgress_Status.setText("Starting export...")
 
         # Start export worker in background thread
-        worker = _ExportWorker(self.current_project)
+        worker = _ExportWorker(self.current_project, self.ui.numWorkers.value())
         thread = QThread(self)
         worker.moveToThread(thread)
         thread.started.connect(worker.run)
@@ -133,6 +133,7 @@ class ExportDialog(QDialog):
         # Re-enable UI
         self.ui.btnOutputDir.setEnabled(True)
         self.ui.txtOutputDir.setEnabled(True)
+        self.ui.numWorkers.setEnabled(True)
         self.ui.btnsDialog.button(QDialogButtonBox.StandardButton.SaveAll).setEnabled(True)
         # Swap Cancel -> Close
         self.ui.btnsDialog.button(QDialogButtonBox.StandardButton.Cancel).setVisible(False)
@@ -186,8 +187,8 @@ class ExportDialog(QDialog):
 
 class _ExportWorker(QObject):
     """
-    Background worker that exports photos one by one.
-    Emits progress and status updates; real export not implemented.
+    Background worker that exports photos on a pool of worker processes.
+    Emits progress and status updates as each photo finishes.
     """
 
     progress: Signal = Signal(int, int)  # processed, total
@@ -195,15 +196,17 @@ class _ExportWorker(QObject):
     message: Signal = Signal(str, str)  # severity, text
     finished: Signal = Signal()
 
-    def __init__(self, project: ProjectModel) -> None:
+    def __init__(self, project: ProjectModel, max_workers: int | None = None) -> None:
         super().__init__()
         self.project = project
+        self.max_workers = max_workers
         self._stop_requested = False
+        # Collect the jobs here, on the GUI thread, so that the worker thread doesn't touch the models
+        self.jobs = create_export_jobs(project) if len(project.photos) > 0 else []
 
     @Slot()
     def run(self) -> None:
-        photos = list(self.project.photos)
-        total = len(photos)
+        total = len(self.jobs)
         if total == 0:
             self.status.emit("No photos to export.")
             self.progress.emit(0, 0)
@@ -211,104 +214,27 @@ class _ExportWorker(QObject):
             self.finished.emit()
             return
 
-        assert self.project.export_path is not None, "Export path must be set before running export worker"
-
         success_count = 0
-
-        for idx, photo in enumerate(photos, start=1):
-            if self._stop_requested:
-                self.status.emit("Export canceled.")
-                break
-
-            try:
-                # Prepare names/paths
-                output_name = self.determine_output_name(photo, idx)
-                output_path = self.project.export_path / output_name
-                self.status.emit(f"Exporting {idx}/{total}: {output_name}")
-
-                # Prefer undistorted image when available. If undistort was canceled, stop export
-                img = None
-                try:
-                    # Provide a stop_checker callable so undistort_photo can cancel early
-                    img = undistort_photo(
-                        photo, self.project, progress_callback=None, stop_checker=lambda: self._stop_requested
-                    )
-                except Exception:
-                    img = None
-
-                # If undistort returned None and a cancellation was requested, stop export immediately
-                if img is None and self._stop_requested:
-                    self.status.emit("Export canceled.")
-                    break
-
-                # Otherwise fall back to loading the original image
-                if img is None:
-                    original_path = self.project.get_absolute_path(photo.original_filename)
-                    img = load_image(str(original_path))
-
-                if img is None:
-                    # Couldn't load image (either undistort failed & load failed)
-                    original_path = self.project.get_absolute_path(photo.original_filename)
-                    self.message.emit(
-                        "warning",
-                        f"Failed to load image: {original_path}",
-                    )
-                    # continue to next photo but still report progress
-                    self.progress.emit(idx, total)
-                    continue
-
-                # Check cancellation again before heavy processing
-                if self._stop_requested:
-                    self.status.emit("Export canceled.")
-                    break
-
-                # Ensure quadrat corners are set
-                if not photo.quadrat_corners:
-                    self.message.emit("warning", f"Skipping {output_name}: quadrat corners not set.")
-                    self.progress.emit(idx, total)
-                    continue
-
-                # Ensure target sizes are present
-                if self.project.target_width is None or self.project.target_height is None:
-                    self.message.emit("error", "Target width/height not set for export.")
-                    self.progress.emit(idx, total)
-                    continue
-
-                # Process perspective; guard against processing errors
-                try:
-                    final_img = fix_perspective(
-                        img,
-                        list(photo.quadrat_corners),
-                        self.project.target_width,
-                        self.project.target_height,
-                    )
-                except Exception as e:
-                    self.message.emit("error", f"Processing failed for {output_name}: {e}")
-                    self.progress.emit(idx, total)
-                    continue
-
-                # Save result
-                ok = save_image(output_path, final_img)
-                if not ok:
-                    self.message.emit("error", f"Failed to save image to {output_path}")
-                    self.progress.emit(idx, total)
-                    continue
-
-                # successful save
-                success_count += 1
-
-                # successful step; optionally send an info message
-                # self.message.emit("info", f"Exported {output_name}")
-
-            except Exception as e:
-                # Catch-all per-photo to avoid aborting the entire export
-                self.message.emit("error", f"Unexpected error for photo {idx}: {e}")
-
-            # report progress after each photo (whether success or failure)
-            self.progress.emit(idx, total)
+        processed = 0
+
+        try:
+            for result in export_photos(self.jobs, self.max_workers, stop_checker=lambda: self._stop_requested):
+                # Results arrive in the order in which they finish, so we count them rather than use their index
+                processed += 1
+                if result.ok:
+                    success_count += 1
+                if result.message is not None:
+                    self.message.emit(result.severity, result.message)
+                self.status.emit(f"Exported {processed}/{total}: {result.job.output_name}")
+                # report progress after each photo (whether success or failure)
+                self.progress.emit(processed, total)
+        except Exception as e:
+            # The pool itself failed (e.g., a worker process died)
+            self.message.emit("error", f"Export failed: {e}")
 
         # Final summary message: canceled vs finished
         if self._stop_requested:
+            self.status.emit("Export canceled.")
             self.message.emit("info", f"Export canceled after {success_count}/{total} photos exported.")
         else:
             self.message.emit("info", f"Export finished: {success_count}/{total} photos exported.")
@@ -319,18 +245,4 @@ class _ExportWorker(QObject):
         self._stop_requested = True
 
     def determine_output_name(self, photo: PhotoModel, index: int) -> str:
-        # Placeholder for any logic to determine output filename based on photo metadata
-        extension = Path(photo.original_filename).suffix.lower()
-        parts = [
-            self.project.metadata_group,
-            self.project.metadata_area,
-            self.project.metadata_site,
-            # year
-            self.project.metadata_season,
-            self.project.metadata_depth,
-            self.project.metadata_transect,
-            # date
-            f"{index:04d}",
-        ]
-        newname = "_".join([x for x in parts if x])
-        return newname + extension
+        return determine_output_name(self.project, photo, index)
@@ -1,10 +1,15 @@
+import logging
+import time
 import warnings
+from collections.abc import Callable
 
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QCloseEvent, QKeySequence, QIcon
-from PySide6.QtWidgets import QMainWindow, QWidget, QFileDialog, QMessageBox, QDialog
+from PySide6.QtWidgets import QMainWindow, QWidget, QFileDialog, QMessageBox, QDialog, QProgressDialog
 from pathlib import Path
 
+from cv2.typing import MatLike, Point2f
+
 from preprocessor import app_formal_name
 from preprocessor.gui.about_dialog import show_about_dialog
 from preprocessor.gui.editor_dock_widget import EditorDockWidget
@@ -17,16 +22,69 @@ from preprocessor.gui.launch_dialog import (
 )
 from preprocessor.gui.photo_editor_widget import PhotoEditorWidget
 from preprocessor.gui.project_settings_dialog import ProjectSettingsDialog
+from preprocessor.gui.preview_scheduler import PreviewScheduler
 from preprocessor.gui.properties_dock_widget import PropertiesDockWidget
 from preprocessor.gui.thumbnail_dock_widget import ThumbnailDockWidget
 from preprocessor.gui.ui_main import Ui_Main
 from preprocessor.gui.utils import icon_from_resource
+from preprocessor.gui.worker import Worker, start_worker
 from preprocessor.model.application_model import ApplicationModel
 from preprocessor.model.photo_model import PhotoModel
 from preprocessor.model.project_model import ProjectModel
-from preprocessor.processing.detect_quadrat import detect_quadrat
-from preprocessor.processing.load_image import load_image
-from preprocessor.processing.params import defaultParams
+from preprocessor.processing.detect import DetectJob, DetectResult, create_detect_jobs, detect_photos
+from preprocessor.processing.detect_quadrat import QuadratDetector
+from preprocessor.processing.load_image import load_image, read_image_sizes
+from preprocessor.processing.params import QuadratDetectionParams
+
+logger = logging.getLogger(__name__)
+
+
+def _detect_quadrat_corners(
+    detector: QuadratDetector,
+    img: MatLike | None,
+    path: Path,
+    params: QuadratDetectionParams,
+    progress_callback: Callable[[float], None],  # noqa: ARG001
+    stop_checker: Callable[[], bool],
+) -> list[Point2f] | None:
+    """Detect the quadrat corners in the image, loading it from the path if needed. Runs on a worker thread."""
+    if img is None:
+        img = load_image(str(path))
+    if img is None:
+        msg = f"Failed to load image:\n{path}"
+        raise OSError(msg)
+    result = detector.detect(img, params, stop_checker=stop_checker, draw_debug=False)
+    return result.corners if result is not None else None
+
+
+def _preview_quadrat_corners(
+    photo: PhotoModel,
+    detector: QuadratDetector,
+    img: MatLike | None,
+    path: Path,
+    params: QuadratDetectionParams,
+    progress_callback: Callable[[float], None],
+    stop_checker: Callable[[], bool],
+) -> tuple[PhotoModel, list[Point2f] | None]:
+    """Detect the quadrat corners for a preview, returning them with the photo they are for. Runs on a worker thread."""
+    return photo, _detect_quadrat_corners(detector, img, path, params, progress_callback, stop_checker)
+
+
+def _detect_all_quadrats(
+    jobs: list[DetectJob],
+    progress_callback: Callable[[float], None],
+    stop_checker: Callable[[], bool],
+) -> list[DetectResult]:
+    """Detect the quadrat in all photos of the jobs on a pool of worker processes. Runs on a worker thread."""
+    results: list[DetectResult] = []
+    for result in detect_photos(jobs, stop_checker=stop_checker):
+        results.append(result)
+        if result.ok:
+            logger.info(f"Detected the quadrat in {result.job.source_path.name} in {result.elapsed:.2f} s")
+        else:
+            logger.info(f"{result.message} ({result.elapsed:.2f} s)")
+        progress_callback(len(results) / len(jobs))
+    return results
 
 
 class MainWindow(QMainWindow):
@@ -42,6 +100,16 @@ class MainWindow(QMainWindow):
     central_widget: PhotoEditorWidget
     """The central widget showing the image."""
     _bound_project: ProjectModel | None = None
+    _detect_worker: Worker | None = None
+    """The worker detecting the quadrat in `_detect_photo`, if any."""
+    _detect_photo: PhotoModel | None = None
+    """The photo in which the quadrat is being detected, if any."""
+    _detect_all_worker: Worker | None = None
+    """The worker detecting the quadrat in all photos, if any."""
+    _quadrat_detector: QuadratDetector
+    """Caches the intermediate detection stages of the current photo."""
+    _preview_scheduler: PreviewScheduler
+    """Schedules the quadrat detection preview while the detection properties change."""
 
     def __init__(self, model: ApplicationModel, parent: QWidget | None = None) -> None:
         super().__init__(parent)
@@ -52,8 +120,11 @@ class MainWindow(QMainWindow):
         self._setup_keyboard_shortcuts()
         self._create_thumbnail_dock()
         self._create_editor_dock()
+        self._create_properties_dock()
         self._create_photo_editor()
 
+        self._quadrat_detector = QuadratDetector()
+        self._preview_scheduler = PreviewScheduler(_preview_quadrat_corners, parent=self)
         self.model = model
         self._connect_signals()
 
@@ -148,6 +219,16 @@ class MainWindow(QMainWindow):
         self.editor_dock.setAllowedAreas(Qt.DockWidgetArea.LeftDockWidgetArea | Qt.DockWidgetArea.RightDockWidgetArea)
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.editor_dock)
 
+    def _create_properties_dock(self) -> None:
+        """Create the quadrat detection properties dock widget, tabbed behind the editor dock."""
+        self.properties_dock = PropertiesDockWidget(self)
+        self.properties_dock.setAllowedAreas(
+            Qt.DockWidgetArea.LeftDockWidgetArea | Qt.DockWidgetArea.RightDockWidgetArea
+        )
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.properties_dock)
+        self.tabifyDockWidget(self.editor_dock, self.properties_dock)
+        self.editor_dock.raise_()
+
     def _create_photo_editor(self) -> None:
         """Create the central photo editor widget."""
         self.central_widget = PhotoEditorWidget(self)
@@ -166,10 +247,12 @@ class MainWindow(QMainWindow):
 
         # Edit menu
         self.ui.menuEdit_DetectQuadrat.triggered.connect(self._handle_detect_quadrat_action)
+        self.ui.menuEdit_DetectAllQuadrats.triggered.connect(self._handle_detect_all_quadrats_action)
 
         # Window menu
         self.ui.menuWindow_ShowThumbnailsPanel.triggered.connect(lambda: self.thumbnail_dock.setVisible(True))
         self.ui.menuWindow_ShowEditorPanel.triggered.connect(lambda: self.editor_dock.setVisible(True))
+        self.ui.menuWindow_ShowPropertiesPanel.triggered.connect(lambda: self.properties_dock.setVisible(True))
 
         # Help menu
         self.ui.menuHelp_About.triggered.connect(self._handle_help_about_action)
@@ -177,6 +260,10 @@ class MainWindow(QMainWindow):
         # Editor dock
         self.editor_dock.on_autodetect_quadrat_clicked.connect(self._handle_detect_quadrat_action)
 
+        # Properties dock
+        self.properties_dock.model.on_changed.connect(self._schedule_quadrat_preview)
+        self._preview_scheduler.on_preview_ready.connect(self._handle_quadrat_preview_ready)
+
         # Thumbnail dock
         self.thumbnail_dock.on_add_photos_action.connect(self._handle_add_photos_action)
         self.thumbnail_dock.on_remove_photos_action.connect(self._handle_remove_photos_action)
@@ -212,36 +299,157 @@ class MainWindow(QMainWindow):
             pass
 
     def _handle_detect_quadrat_action(self) -> None:
-        if self.model.current_photo is None:
+        photo = self.model.current_photo
+        if photo is None:
             return
 
+        # A newer request supersedes any running detection
+        self._cancel_detect_quadrat()
+
         # Prefer using the undistorted image currently shown in the editor (if available)
         img = None
         try:
             img = self.central_widget.get_processing_image()
         except Exception:
             img = None
-        if img is None:
-            original_path = self.model.current_project.get_absolute_path(self.model.current_photo.original_filename)
-            img = load_image(str(original_path))
-        if img is None:
-            QMessageBox.critical(
-                self,
-                "Load Image Failed",
-                f"Failed to load image:\n{original_path}",
-            )
+        original_path = self.model.current_project.get_absolute_path(photo.original_filename)
+
+        params = self.properties_dock.model.params
+
+        worker = Worker(_detect_quadrat_corners, self._quadrat_detector, img, original_path, params)
+        self._detect_worker = worker
+        self._detect_photo = photo
+
+        def _on_result(corners: list[Point2f] | None) -> None:
+            # Only apply the result if it's still relevant
+            if worker is not self._detect_worker or photo is not self.model.current_photo:
+                return
+            if not corners:
+                # No corners detected
+                return
+            photo.quadrat_corners = corners
+            # Trigger updating the opened editor
+            self._handle_current_photo_changed(photo)
+
+        def _on_error(error: tuple[type[BaseException], BaseException, str]) -> None:
+            if worker is not self._detect_worker:
+                return
+            _, value, _ = error
+            QMessageBox.critical(self, "Detect Quadrat Failed", str(value))
+
+        def _on_finished() -> None:
+            if worker is self._detect_worker:
+                self._detect_worker = None
+                self._detect_photo = None
+
+        worker.signals.result.connect(_on_result)
+        worker.signals.error.connect(_on_error)
+        worker.signals.finished.connect(_on_finished)
+        start_worker(worker)
+
+    def _cancel_detect_quadrat(self) -> None:
+        """Cancel the running quadrat detection, if any."""
+        if self._detect_worker is not None:
+            self._detect_worker.cancel()
+            self._detect_worker = None
+            self._detect_photo = None
+
+    def _schedule_quadrat_preview(self) -> None:
+        """Preview the quadrat detection in the current photo with the changed detection properties."""
+        photo = self.model.current_photo
+        img = self.central_widget.get_processing_image()
+        if photo is None or img is None:
             return
+        original_path = self.model.current_project.get_absolute_path(photo.original_filename)
+        self._preview_scheduler.schedule(
+            photo, self._quadrat_detector, img, original_path, self.properties_dock.model.params
+        )
 
-        params = defaultParams
+    def _handle_quadrat_preview_ready(self, result: tuple[PhotoModel, list[Point2f] | None], latency: float) -> None:
+        """Show the previewed quadrat corners, and the time it took to preview them."""
+        photo, corners = result
+        if photo is not self.model.current_photo:
+            # The preview is of a photo that is no longer shown
+            return
+        self.central_widget.set_preview_corners([(float(x), float(y)) for x, y in corners] if corners else None)
+        self.statusBar().showMessage(f"Quadrat detection preview: {latency * 1000:.0f} ms", 5000)
 
-        result = detect_quadrat(img, params)
-        if result is None or result.corners is None:
-            # No corners detected
+    def _handle_detect_all_quadrats_action(self) -> None:
+        if self._detect_all_worker is not None:
+            return
+        project = self.model.current_project
+        # Remember the photos, in case they change while detecting
+        photos = list(project.photos)
+        jobs = create_detect_jobs(project, only_missing=True)
+        if not jobs:
+            QMessageBox.information(self, "Detect Quadrats", "All photos already have quadrat corners.")
             return
 
-        self.model.current_photo.quadrat_corners = result.corners
-        # Trigger updating the opened editor
-        self._handle_current_photo_changed(self.model.current_photo)
+        worker = Worker(_detect_all_quadrats, jobs)
+        self._detect_all_worker = worker
+        self.ui.menuEdit_DetectAllQuadrats.setEnabled(False)
+        start = time.perf_counter()
+
+        progress = QProgressDialog(f"Detecting the quadrat in {len(jobs)} photos...", "Cancel", 0, len(jobs), self)
+        progress.setWindowTitle("Detect Quadrats")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.canceled.connect(worker.cancel)
+
+        def _on_progress(fraction: float) -> None:
+            progress.setValue(round(fraction * len(jobs)))
+
+        def _on_result(results: list[DetectResult]) -> None:
+            # The project may have changed while detecting
+            if project is not self.model.current_project:
+                return
+            # Skip the photos that have been removed meanwhile; a set keeps this linear in the number of photos
+            project_photos = set(project.photos)
+            corners = {
+                photos[r.job.index]: list(r.corners)
+                for r in results
+                if r.corners is not None and photos[r.job.index] in project_photos
+            }
+            current_photo = self.model.current_photo
+            current_corners = current_photo.quadrat_corners if current_photo is not None else None
+            project.set_quadrat_corners(corners)
+            if current_photo in corners and current_photo.quadrat_corners != current_corners:
+                # The editor draws the corners from the photo, so it only needs to be repainted
+                self.central_widget.update()
+            self._show_detect_all_summary(results, time.perf_counter() - start)
+
+        def _on_error(error: tuple[type[BaseException], BaseException, str]) -> None:
+            _, value, _ = error
+            QMessageBox.critical(self, "Detect Quadrats Failed", str(value))
+
+        def _on_finished() -> None:
+            progress.reset()
+            self._detect_all_worker = None
+            self.ui.menuEdit_DetectAllQuadrats.setEnabled(True)
+
+        worker.signals.progress.connect(_on_progress)
+        worker.signals.result.connect(_on_result)
+        worker.signals.error.connect(_on_error)
+        worker.signals.finished.connect(_on_finished)
+        start_worker(worker)
+
+    def _show_detect_all_summary(self, results: list[DetectResult], elapsed: float) -> None:
+        """Show which photos the quadrat was detected in, and how long it took."""
+        found = sum(1 for r in results if r.ok)
+        mean_time = sum(r.elapsed for r in results) / len(results) if results else 0.0
+        details = [
+            f"{r.job.source_path.name}: " + ("found" if r.ok else str(r.message)) + f" ({r.elapsed:.2f} s)"
+            for r in sorted(results, key=lambda r: r.job.index)
+        ]
+        msg_box = QMessageBox(self)
+        msg_box.setWindowTitle("Detect Quadrats")
+        msg_box.setIcon(QMessageBox.Icon.Information if found == len(results) else QMessageBox.Icon.Warning)
+        msg_box.setText(
+            f"Detected the quadrat in {found} of {len(results)} photos in {elapsed:.1f} s "
+            f"({mean_time:.2f} s per photo)."
+        )
+        msg_box.setDetailedText("\n".join(details))
+        msg_box.exec()
 
     def _handle_help_about_action(self) -> None:
         show_about_dialog(self)
@@ -252,8 +460,37 @@ class MainWindow(QMainWindow):
         if not paths:
             return
         project = self.model.current_project
-        for path in paths:
-            project.append_photo_model(Path(path))
+        photo_paths = [Path(path) for path in paths]
+
+        # Read the photo sizes on a worker thread, and add all photos at once when done
+        worker = Worker(read_image_sizes, photo_paths)
+        progress = QProgressDialog(f"Adding {len(photo_paths)} photos...", "Cancel", 0, len(photo_paths), self)
+        progress.setWindowTitle("Add Photos")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(500)
+        progress.canceled.connect(worker.cancel)
+
+        def _on_progress(fraction: float) -> None:
+            progress.setValue(round(fraction * len(photo_paths)))
+
+        def _on_result(sizes: list[tuple[int, int] | None] | None) -> None:
+            # The project may have changed while reading
+            if sizes is None or project is not self.model.current_project:
+                return
+            project.add_photos(photo_paths, sizes)
+            skipped = [path.name for path, size in zip(photo_paths, sizes, strict=True) if size is None]
+            if skipped:
+                QMessageBox.warning(self, "Add Photos", "These photos could not be read:\n" + "\n".join(skipped))
+
+        def _on_error(error: tuple[type[BaseException], BaseException, str]) -> None:
+            _, value, _ = error
+            QMessageBox.critical(self, "Add Photos Failed", str(value))
+
+        worker.signals.progress.connect(_on_progress)
+        worker.signals.result.connect(_on_result)
+        worker.signals.error.connect(_on_error)
+        worker.signals.finished.connect(progress.reset)
+        start_worker(worker)
 
     def _handle_remove_photos_action(self, selected: list[PhotoModel]) -> None:
         assert self.model.current_project is not None
@@ -283,6 +520,11 @@ class MainWindow(QMainWindow):
 
     def _handle_current_photo_changed(self, photo: PhotoModel | None) -> None:
         """Handle when the current photo changes."""
+        if photo is not self._detect_photo:
+            # The detection result would be discarded anyway
+            self._cancel_detect_quadrat()
+            self._preview_scheduler.cancel()
+            self._quadrat_detector.clear()
         self.central_widget.show_photo(photo, self.model.current_project)
         self.editor_dock.update_with_photo(photo)
         self._update_window_title()
@@ -1,19 +1,63 @@
 import contextlib
 import math
 from collections.abc import Callable
+from pathlib import Path
 
-from PySide6.QtCore import QPoint, Qt, QRect, QSize, QEvent
-from PySide6.QtGui import QPixmap, QMouseEvent, QPainter, QPaintEvent, QPen
-from PySide6.QtGui import QEnterEvent, QPainterPath, QPolygonF, QColor
+from PySide6.QtCore import QPoint, QPointF, Qt, QRect, QRectF, QSize, QEvent, QTimer
+from PySide6.QtGui import QImage, QPixmap, QMouseEvent, QPainter, QPaintEvent, QPen, QResizeEvent, QWheelEvent
+from PySide6.QtGui import QEnterEvent, QPainterPath, QPolygon, QPolygonF, QColor
 from PySide6.QtWidgets import QWidget
 from cv2.typing import MatLike
 
 from preprocessor.model.photo_model import PhotoModel
 from preprocessor.model.project_model import ProjectModel
-from preprocessor.processing.undistort import undistort_photo
-from preprocessor.processing.load_image import load_image
+from preprocessor.processing.undistort import UndistortMapsCache, scale_camera_matrix, undistort_image, undistort_photo
+from preprocessor.processing.image_cache import shared_image_cache
+from preprocessor.gui.tile_cache import TileCache
+from preprocessor.gui.utils import display_qimage_from_cv, qimage_from_cv
 from preprocessor.gui.worker import Worker, start_worker
 
+# fmt: off
+_CROSSHAIR_LENGTH = 10                      # Arm length, in pixels
+_CROSSHAIR_GAP = 5                          # Gap size, in pixels
+_CROSSHAIR_WIDTH = 2                        # Line width, in pixels
+_CROSSHAIR_BORDER = 1                       # Border width, in pixels
+_CROSSHAIR_BORDER_COLOR = Qt.GlobalColor.white  # Border color
+_CROSSHAIR_LINE_COLOR = Qt.GlobalColor.red  # Line color
+# fmt: on
+
+_ZOOM_STEP = 1.25
+"""The zoom factor of one step of the mouse wheel."""
+_MAX_RATIO = 4.0
+"""The maximum zoom, as the number of widget pixels per image pixel."""
+_PROXY_MAX_SIZE = 1024
+"""The maximum width and height of the proxy image that is undistorted while the distortion is being changed."""
+_REFINE_DELAY_MS = 250
+"""How long the distortion must stay unchanged before the full-resolution photo is undistorted, in milliseconds."""
+_PROXY_MAPS_CACHE_BYTES = 32 * 1024 * 1024
+"""
+The maximum memory taken by the cached undistortion maps of the proxy image, in bytes.
+
+The proxy has its own cache, so that the maps of every distortion it is shown with
+don't push the full-resolution maps out of the shared cache.
+"""
+
+
+def _undistort_for_display(
+    photo: PhotoModel,
+    project: ProjectModel,
+    image: MatLike | None,
+    progress_callback: Callable[[float], None],
+    stop_checker: Callable[[], bool],
+) -> tuple[MatLike, QImage] | None:
+    """Undistort the photo, and convert it for display. Runs on a worker thread, to keep the conversion off the GUI."""
+    undistorted = undistort_photo(
+        photo, project, progress_callback=progress_callback, stop_checker=stop_checker, image=image
+    )
+    if undistorted is None:
+        return None
+    return undistorted, display_qimage_from_cv(undistorted)
+
 
 class PhotoEditorWidget(QWidget):
     """Widget for viewing and editing photos."""
@@ -21,7 +65,18 @@ class PhotoEditorWidget(QWidget):
     _mouse_position: QPoint | None
     """Current mouse position over the photo."""
     _pixmap: QPixmap | None
-    """Current photo pixmap."""
+    """Current photo pixmap; this may be smaller than the photo (see `_pixmap_is_proxy`)."""
+    _pixmap_is_proxy: bool
+    """
+    Whether the pixmap is a proxy of another image than the processing image, such as while the distortion changes.
+    Otherwise a pixmap smaller than the photo is a pyramid level, whose larger levels have been dropped while zoomed in.
+    """
+    _image_size: QSize
+    """The size of the current photo, in image pixels."""
+    _pixmap_pyramid: list[QPixmap]
+    """The current photo pixmap, followed by successively halved copies of it; built as needed."""
+    _scaled_pixmap: QPixmap | None
+    """The current photo pixmap scaled to the size it is displayed at, if already computed."""
     _photo: PhotoModel | None
     """Current photo model."""
     _drag_index: int | None
@@ -34,15 +89,39 @@ class PhotoEditorWidget(QWidget):
     """The original image loaded as an OpenCV/numpy array (if available)."""
     _undistorted_cv_img: MatLike | None
     """Last undistorted cv image (cached)."""
+    _image_path: Path | None
+    """The path of the photo whose image is held in the shared image cache, if any."""
     _photo_signals_connected: bool
     """Whether we've connected model signals for the current photo."""
     _current_project: ProjectModel | None
     _current_undistort_worker: Worker | None
+    _undistort_generation: int
+    """Incremented whenever an undistortion is started or canceled, to discard the results of superseded ones."""
+    _proxy_cv_img: MatLike | None
+    """A downscaled copy of the original cv image, undistorted while the distortion is changing; built as needed."""
+    _proxy_maps_cache: UndistortMapsCache
+    """The undistortion maps of the proxy image."""
+    _refine_timer: QTimer
+    """Starts the full-resolution undistortion once the distortion has stopped changing."""
+    _preview_corners: list[tuple[float, float]] | None
+    """Corners of a quadrat preview to draw (in image coordinates), or None."""
+    _zoom: float
+    """The zoom relative to fitting the photo in the widget; 1.0 shows the whole photo."""
+    _view_offset: QPointF
+    """The position of the top-left of the photo in widget coordinates, when zoomed in."""
+    _pan_start: tuple[QPointF, QPointF] | None
+    """The mouse position and view offset at the start of panning (None when not panning)."""
+    _tiles: TileCache
+    """The tiles of the processing image, used to show the photo when zoomed in."""
 
     def __init__(self, parent: QWidget | None = None) -> None:
         QWidget.__init__(self, parent)
         self._mouse_position = None
         self._pixmap = None
+        self._pixmap_is_proxy = False
+        self._image_size = QSize()
+        self._pixmap_pyramid = []
+        self._scaled_pixmap = None
         self._photo = None
 
         self._drag_index = None
@@ -54,17 +133,43 @@ class PhotoEditorWidget(QWidget):
         # CV images (numpy arrays) used for undistortion
         self._original_cv_img = None
         self._undistorted_cv_img = None
+        self._image_path = None
         self._photo_signals_connected = False
 
         self.setMouseTracking(True)
         self._current_project = None
         self._current_undistort_worker = None
+        self._undistort_generation = 0
+        self._proxy_cv_img = None
+        self._proxy_maps_cache = UndistortMapsCache(_PROXY_MAPS_CACHE_BYTES)
+        self._refine_timer = QTimer(self)
+        self._refine_timer.setSingleShot(True)
+        self._refine_timer.setInterval(_REFINE_DELAY_MS)
+        self._refine_timer.timeout.connect(self._apply_undistort_and_update)
+        self._preview_corners = None
+        self._zoom = 1.0
+        self._view_offset = QPointF(0, 0)
+        self._pan_start = None
+        self._tiles = TileCache(parent=self)
+        self._tiles.on_tile_ready.connect(self._handle_tile_ready)
 
     def show_photo(self, photo: PhotoModel | None, project: ProjectModel) -> None:
+        # The undistortion of the previous photo is no longer needed
+        self._refine_timer.stop()
+        self._cancel_undistort()
+        self._proxy_cv_img = None
         if photo is not None:
             original_path = project.get_absolute_path(photo.original_filename)
-            # Load a QPixmap for fast rendering and also attempt to load a cv image
-            self._pixmap = QPixmap(str(original_path))
+            # Decode the photo only once: the pixmap, the processing image, and the undistortion all use it.
+            # Acquire it before releasing the previous photo, so that showing the same photo again doesn't decode it.
+            self._original_cv_img = shared_image_cache.acquire(original_path)
+            self._release_image()
+            self._image_path = original_path
+            self._undistorted_cv_img = None
+            if self._original_cv_img is not None:
+                self._set_pixmap(QPixmap.fromImage(qimage_from_cv(self._original_cv_img)))
+            else:
+                self._set_pixmap(None)
             # Disconnect signals from previous photo (if any)
             try:
                 if self._photo_signals_connected and self._photo is not None:
@@ -80,12 +185,6 @@ class PhotoEditorWidget(QWidget):
             self._photo = photo
             self._current_project = project
 
-            # Try to load the CV image lazily (used for undistortion) using the project's loader
-            try:
-                self._original_cv_img = load_image(str(original_path))
-            except Exception:
-                self._original_cv_img = None
-
             # Connect signals from the model so we can react when camera or distortion change
             # First disconnect any previous connections
             try:
@@ -109,7 +208,8 @@ class PhotoEditorWidget(QWidget):
                         self._photo.on_distortion_coefficients_changed.disconnect(self._on_camera_or_distortion_changed)
             except Exception:
                 pass
-            self._pixmap = None
+            self._release_image()
+            self._set_pixmap(None)
             self._photo = None
             # Clear any stored cv images & signal flags
             self._original_cv_img = None
@@ -119,13 +219,61 @@ class PhotoEditorWidget(QWidget):
         self._drag_index = None
         # discard any unfinished edit when switching photos
         self._edit_points = None
+        self._preview_corners = None
+        # Show the whole photo
+        self._zoom = 1.0
+        self._pan_start = None
+        self.update()
+
+    def set_preview_corners(self, corners: list[tuple[float, float]] | None) -> None:
+        """Show the corners (in image coordinates) of a previewed quadrat detection; or None to hide them."""
+        self._preview_corners = corners
         self.update()
 
+    def _release_image(self) -> None:
+        """Release the current photo's image from the shared image cache, if any."""
+        if self._image_path is not None:
+            shared_image_cache.release(self._image_path)
+            self._image_path = None
+
     def _on_camera_or_distortion_changed(self) -> None:
         """Handler called when the photo camera matrix or distortion coefficients change.
-        Applies undistortion to the currently displayed image and updates the pixmap.
+        Shows an undistorted low-resolution proxy of the photo right away,
+        and undistorts the full-resolution photo once the parameters have stopped changing.
         """
-        self._apply_undistort_and_update()
+        # The full-resolution undistortion in flight, if any, and the last one are already stale
+        self._cancel_undistort()
+        self._undistorted_cv_img = None
+        self._show_undistorted_proxy()
+        self._refine_timer.start()
+
+    def _show_undistorted_proxy(self) -> None:
+        """Undistort a downscaled copy of the photo, and show it in place of the photo."""
+        if self._photo is None or self._current_project is None or self._original_cv_img is None:
+            return
+        cam = getattr(self._photo, "camera_matrix", None)
+        dist = getattr(self._photo, "distortion_coefficients", None)
+        if cam is None or dist is None:
+            return
+
+        height, width = self._original_cv_img.shape[:2]
+        scale = min(1.0, _PROXY_MAX_SIZE / max(width, height))
+        if self._proxy_cv_img is None:
+            import cv2
+
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            self._proxy_cv_img = cv2.resize(self._original_cv_img, size, interpolation=cv2.INTER_AREA)
+        proxy = undistort_image(
+            self._proxy_cv_img,
+            scale_camera_matrix(cam, scale),
+            dist,
+            map_type=self._current_project.undistort_map_type,
+            maps_cache=self._proxy_maps_cache,
+        )
+        if proxy is None:
+            return
+        self._set_pixmap(QPixmap.fromImage(qimage_from_cv(proxy)), QSize(width, height))
+        self.update()
 
     def _apply_undistort_and_update(self) -> None:
         """Apply undistort() to the loaded CV image and update the displayed QPixmap.
@@ -158,32 +306,14 @@ class PhotoEditorWidget(QWidget):
             # Fall back to synchronous undistortion if async start fails
             try:
                 from preprocessor.processing.fix_lens_distortion import undistort
-                from PySide6.QtGui import QImage
 
                 und = undistort(self._original_cv_img, cam, list(dist))
                 if und is None:
                     msg = "undistort returned None"
                     raise RuntimeError(msg)
 
-                # und is in BGR/BGRA ordering (OpenCV). Convert to RGB/RGBA for QImage
-                import cv2
-
-                if und.ndim == 3 and und.shape[2] == 3:
-                    rgb = cv2.cvtColor(und, cv2.COLOR_BGR2RGB).copy()
-                    h, w, ch = rgb.shape
-                    bytes_per_line = ch * w
-                    qimg = QImage(rgb.data, w, h, bytes_per_line, QImage.Format.Format_RGB888).copy()
-                elif und.ndim == 3 and und.shape[2] == 4:
-                    rgba = cv2.cvtColor(und, cv2.COLOR_BGRA2RGBA).copy()
-                    h, w, ch = rgba.shape
-                    bytes_per_line = ch * w
-                    qimg = QImage(rgba.data, w, h, bytes_per_line, QImage.Format.Format_RGBA8888).copy()
-                else:
-                    gray = und.copy()
-                    h, w = gray.shape
-                    qimg = QImage(gray.data, w, h, w, QImage.Format.Format_Grayscale8).copy()
-
-                self._pixmap = QPixmap.fromImage(qimg)
+                # und is in BGR/BGRA ordering (OpenCV)
+                self._set_pixmap(QPixmap.fromImage(qimage_from_cv(und)))
                 self._undistorted_cv_img = und
                 self.update()
             except Exception:
@@ -193,28 +323,140 @@ class PhotoEditorWidget(QWidget):
     def get_processing_image(self) -> MatLike | None:
         """Return a cv2 image to use for processing (undistorted if available).
 
-        Returns the undistorted image if we've successfully computed it, otherwise
-        returns the original cv image if available, otherwise None.
+        Returns the undistorted image if we've successfully computed it for the current parameters,
+        otherwise returns the original cv image if available, otherwise None.
         """
         if self._undistorted_cv_img is not None:
             return self._undistorted_cv_img
         return self._original_cv_img
 
+    def _set_pixmap(self, pixmap: QPixmap | None, image_size: QSize | None = None) -> None:
+        """
+        Set the current photo pixmap, discarding the scaled copies of the previous one.
+
+        :param pixmap: The pixmap of the photo; or None to show no photo.
+        :param image_size: The size of the photo, if the pixmap is a proxy of a different size; or None.
+        """
+        self._pixmap = pixmap
+        self._pixmap_is_proxy = image_size is not None
+        if image_size is not None:
+            self._image_size = image_size
+        else:
+            self._image_size = pixmap.size() if pixmap is not None else QSize()
+        self._pixmap_pyramid = [pixmap] if pixmap is not None else []
+        self._scaled_pixmap = None
+
+    def _display_pixmap(self, size: QSize) -> QPixmap | None:
+        """
+        Return the current photo pixmap scaled to the given display size.
+
+        The pixmap is scaled down from the smallest pyramid level that is still at least as large as the display size,
+        which is much cheaper than scaling the full-resolution pixmap. The result is kept until the size changes,
+        so repaints (such as when the mouse moves) don't scale the pixmap at all.
+        """
+        if not self._pixmap_pyramid or size.isEmpty():
+            return None
+        if self._scaled_pixmap is not None and self._scaled_pixmap.size() == size:
+            return self._scaled_pixmap
+        largest = self._pixmap_pyramid[0]
+        if largest.width() < size.width() or largest.height() < size.height():
+            self._restore_full_resolution_pixmap()
+
+        # Halve the smallest level until the next halving would be smaller than the display size
+        level = self._pixmap_pyramid[-1]
+        while level.width() // 2 >= size.width() and level.height() // 2 >= size.height():
+            level = level.scaled(
+                level.width() // 2,
+                level.height() // 2,
+                Qt.AspectRatioMode.IgnoreAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+            self._pixmap_pyramid.append(level)
+        # Pick the smallest level that is at least as large as the display size
+        level = next(
+            (
+                level
+                for level in reversed(self._pixmap_pyramid)
+                if level.width() >= size.width() and level.height() >= size.height()
+            ),
+            self._pixmap_pyramid[0],
+        )
+        self._scaled_pixmap = level.scaled(
+            size, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation
+        )
+        return self._scaled_pixmap
+
+    def _drop_full_resolution_pixmap(self) -> None:
+        """
+        Drop the pyramid levels that are larger than needed to show the whole photo.
+
+        This is done while zoomed in, when the tiles show the photo at full resolution instead.
+        The levels are restored from the processing image when the photo is shown at a larger size again.
+        """
+        fit_ratio = self._fit_ratio()
+        fit_size = QSize(round(self._image_size.width() * fit_ratio), round(self._image_size.height() * fit_ratio))
+        if self._pixmap_is_proxy or self._display_pixmap(fit_size) is None:
+            return
+        # The pyramid has been built down to the smallest level that is at least as large as the fit size
+        index = max(
+            i
+            for i, level in enumerate(self._pixmap_pyramid)
+            if i == 0 or (level.width() >= fit_size.width() and level.height() >= fit_size.height())
+        )
+        if index > 0:
+            self._pixmap_pyramid = self._pixmap_pyramid[index:]
+            self._pixmap = self._pixmap_pyramid[0]
+
+    def _restore_full_resolution_pixmap(self) -> None:
+        """Restore the full-resolution pixmap from the processing image, if it was dropped."""
+        img = self.get_processing_image()
+        if self._pixmap is None or self._pixmap_is_proxy or self._pixmap.size() == self._image_size or img is None:
+            return
+        if img.shape[1] != self._image_size.width() or img.shape[0] != self._image_size.height():
+            return
+        self._pixmap = QPixmap.fromImage(display_qimage_from_cv(img))
+        self._pixmap_pyramid = [self._pixmap]
+        self._scaled_pixmap = None
+
     def _current_pixmap_info(self) -> tuple[float, QPoint, QSize]:
         """
         Return (ratio, top_left_offset, scaled_size) for the currently-loaded pixmap
         relative to widget coordinates. If no pixmap is present, returns ratio=1.0,
         offset=(0,0) and size equal to the widget size.
         """
-        if self._pixmap is None or self._pixmap.width() == 0 or self._pixmap.height() == 0:
+        if self._pixmap is None or self._image_size.isEmpty():
             return 1.0, QPoint(0, 0), QSize(self.width(), self.height())
-        ratio = min(self.width() / self._pixmap.width(), self.height() / self._pixmap.height())
-        scaled_w = round(self._pixmap.width() * ratio)
-        scaled_h = round(self._pixmap.height() * ratio)
-        # keep top-left at (0,0) (same behavior as the painter)
-        offset = QPoint(0, 0)
+        ratio = self._fit_ratio() * self._zoom
+        scaled_w = round(self._image_size.width() * ratio)
+        scaled_h = round(self._image_size.height() * ratio)
+        # keep top-left at (0,0) (same behavior as the painter), unless zoomed in
+        offset = self._view_offset.toPoint() if self._zoom > 1.0 else QPoint(0, 0)
         return ratio, offset, QSize(scaled_w, scaled_h)
 
+    def _fit_ratio(self) -> float:
+        """Return the ratio at which the whole pixmap fits in the widget."""
+        if self._pixmap is None or self._image_size.isEmpty():
+            return 1.0
+        return min(self.width() / self._image_size.width(), self.height() / self._image_size.height())
+
+    def _set_zoom(self, zoom: float, anchor: QPointF) -> None:
+        """Zoom in or out, keeping the image point under the anchor (in widget coordinates) in place."""
+        fit_ratio = self._fit_ratio()
+        zoom = min(max(zoom, 1.0), max(1.0, _MAX_RATIO / fit_ratio))
+        ratio, offset, _ = self._current_pixmap_info()
+        image_point = (anchor - QPointF(offset)) / ratio
+        self._zoom = zoom
+        self._view_offset = anchor - image_point * (fit_ratio * zoom)
+        self._clamp_view_offset()
+        self.update()
+
+    def _clamp_view_offset(self) -> None:
+        """Keep the zoomed-in photo covering the widget; along an axis where it is smaller, keep it at the top-left."""
+        _, _, size = self._current_pixmap_info()
+        x = min(0.0, max(self._view_offset.x(), self.width() - size.width()))
+        y = min(0.0, max(self._view_offset.y(), self.height() - size.height()))
+        self._view_offset = QPointF(x, y)
+
     def _image_to_widget_point(self, x: float, y: float) -> QPoint:
         """Map a point from image (model) coordinates to widget coordinates."""
         ratio, offset, _ = self._current_pixmap_info()
@@ -256,15 +498,17 @@ class PhotoEditorWidget(QWidget):
             img_pts = [self._widget_to_image_point(p) for p in pts]
             self._photo.quadrat_corners = [(float(x), float(y)) for x, y in img_pts]
 
-    def paintEvent(self, _event: QPaintEvent) -> None:
+    def paintEvent(self, event: QPaintEvent) -> None:
         painter = QPainter(self)
 
         # Draw the photo pixmap, scaled to fit the widget
-        if self._pixmap is not None:
+        if self._pixmap is not None and self._zoom > 1.0:
+            self._paint_zoomed_photo(painter, event.rect())
+        elif self._pixmap is not None:
             _ratio, offset, size = self._current_pixmap_info()
-            scaled_pixmap = self._pixmap.scaled(size, Qt.AspectRatioMode.KeepAspectRatio)
-            pixmap_rect = QRect(offset, size)
-            painter.drawPixmap(pixmap_rect, scaled_pixmap)
+            scaled_pixmap = self._display_pixmap(size)
+            if scaled_pixmap is not None:
+                painter.drawPixmap(QRect(offset, size), scaled_pixmap)
 
         # Determine quadrat points from model or working copy (as widget points)
         qcorners = self._widget_points()
@@ -287,6 +531,13 @@ class PhotoEditorWidget(QWidget):
             for a, b in zip(qcorners, [*qcorners[1:], qcorners[0]], strict=False):
                 painter.drawLine(a, b)
 
+        # Draw the previewed quadrat (if any), which is not editable
+        if self._preview_corners is not None and len(self._preview_corners) >= 2:
+            preview = [self._image_to_widget_point(x, y) for x, y in self._preview_corners]
+            painter.setPen(QPen(Qt.GlobalColor.yellow, 2, Qt.PenStyle.DashLine))
+            for a, b in zip(preview, [*preview[1:], preview[0]], strict=False):
+                painter.drawLine(a, b)
+
         # Draw handles for each corner (so they are visible and draggable)
         pts = qcorners or []
         if pts:
@@ -303,14 +554,12 @@ class PhotoEditorWidget(QWidget):
 
         # Draw a crosshair centered at the mouse position (drawn last so it's visible)
         if self._mouse_position is not None:
-            # fmt: off
-            length = 10                             # Arm length, in pixels
-            gap = 5                                 # Gap size, in pixels
-            width = 2                               # Line width, in pixels
-            border = 1                              # Border width, in pixels
-            border_color = Qt.GlobalColor.white     # Border color
-            line_color = Qt.GlobalColor.red         # Line color
-            # fmt: on
+            length = _CROSSHAIR_LENGTH
+            gap = _CROSSHAIR_GAP
+            width = _CROSSHAIR_WIDTH
+            border = _CROSSHAIR_BORDER
+            border_color = _CROSSHAIR_BORDER_COLOR
+            line_color = _CROSSHAIR_LINE_COLOR
             x = self._mouse_position.x()
             y = self._mouse_position.y()
 
@@ -326,6 +575,73 @@ class PhotoEditorWidget(QWidget):
             painter.setPen(QPen(line_color, width, Qt.PenStyle.SolidLine))
             draw_crosshair()
 
+    def _paint_zoomed_photo(self, painter: QPainter, exposed: QRect) -> None:
+        """
+        Paint the exposed part of the zoomed-in photo.
+
+        The photo is painted from the lowest-resolution pyramid level first, then overlaid with the tiles
+        that have been rendered at the resolution of the zoom. Missing tiles are requested, visible ones first.
+        While the tiles are shown, the full-resolution pixmap is dropped.
+        """
+        ratio, offset, size = self._current_pixmap_info()
+        target = QRectF(QRect(offset, size)).intersected(QRectF(exposed))
+        if target.isEmpty():
+            return
+        # The exposed part of the photo, in image coordinates
+        source = QRectF((target.topLeft() - QPointF(offset)) / ratio, target.size() / ratio)
+
+        # Paint a low-resolution version of the photo, scaled up, while the tiles are being rendered
+        fallback = self._pixmap_pyramid[-1]
+        scale = fallback.width() / self._image_size.width()
+        painter.drawPixmap(target, fallback, QRectF(source.topLeft() * scale, source.size() * scale))
+
+        # The tiles are cut from the processing image, which must match the shown photo (and not a proxy of it)
+        img = self.get_processing_image()
+        if (
+            img is None
+            or self._pixmap_is_proxy
+            or img.shape[1] != self._image_size.width()
+            or img.shape[0] != self._image_size.height()
+        ):
+            return
+        self._drop_full_resolution_pixmap()
+        self._tiles.set_source(img)
+        level = max(0, math.floor(math.log2(1.0 / ratio))) if ratio < 1.0 else 0
+        keys = self._tiles.tiles_in(level, source.toAlignedRect())
+        # Render the tiles closest to the center of the view first
+        center = source.center()
+        keys.sort(key=lambda key: (QRectF(self._tiles.source_rect(key)).center() - center).manhattanLength())
+        self._tiles.request(keys)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        for key in keys:
+            tile = self._tiles.tile(key)
+            if tile is None:
+                continue
+            rect = QRectF(self._tiles.source_rect(key))
+            painter.drawPixmap(QRectF(QPointF(offset) + rect.topLeft() * ratio, rect.size() * ratio), tile, tile.rect())
+        painter.restore()
+
+    def _handle_tile_ready(self, key: tuple[int, int, int]) -> None:
+        """Repaint the part of the widget showing the tile that has been rendered."""
+        if self._zoom <= 1.0:
+            return
+        ratio, offset, _ = self._current_pixmap_info()
+        rect = QRectF(self._tiles.source_rect(key))
+        self.update(QRectF(QPointF(offset) + rect.topLeft() * ratio, rect.size() * ratio).toAlignedRect())
+
+    def wheelEvent(self, event: QWheelEvent) -> None:
+        """Zoom in or out around the mouse position."""
+        if self._pixmap is None or self._edit_points is not None:
+            return
+        steps = event.angleDelta().y() / 120
+        self._set_zoom(self._zoom * _ZOOM_STEP**steps, event.position())
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        self._clamp_view_offset()
+        super().resizeEvent(event)
+
     def _find_handle_index(self, pos: QPoint) -> int | None:
         """Return index of handle under pos, or None."""
         pts = self._widget_points()
@@ -339,13 +655,19 @@ class PhotoEditorWidget(QWidget):
         return None
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
+        pos = event.position().toPoint()
+        if event.button() == Qt.MouseButton.MiddleButton and self._zoom > 1.0:
+            # Start panning the zoomed-in photo
+            self._pan_start = (event.position(), self._view_offset)
+            return
+
         if self._photo is None:
-            self._mouse_position = event.pos()
+            self._mouse_position = pos
             self.update()
             return
 
         if event.button() == Qt.MouseButton.LeftButton:
-            hit = self._find_handle_index(event.pos())
+            hit = self._find_handle_index(pos)
             if hit is not None:
                 # Begin dragging an existing point: make a working copy if needed
                 if self._edit_points is None:
@@ -358,12 +680,12 @@ class PhotoEditorWidget(QWidget):
                     # initialize working copy if not present
                     if self._edit_points is None:
                         self._edit_points = pts
-                    self._edit_points.append(event.pos())
+                    self._edit_points.append(pos)
                     self._drag_index = len(self._edit_points) - 1
-            self._mouse_position = event.pos()
+            self._mouse_position = pos
             self.update()
         elif event.button() == Qt.MouseButton.RightButton:
-            hit = self._find_handle_index(event.pos())
+            hit = self._find_handle_index(pos)
             if hit is not None:
                 # Remove an existing point under the cursor immediately (right-click is immediate)
                 pts = self._widget_points()
@@ -377,22 +699,54 @@ class PhotoEditorWidget(QWidget):
                 self._edit_points = None
                 self.update()
             else:
-                self._mouse_position = event.pos()
+                self._mouse_position = pos
                 self.update()
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
-        self._mouse_position = event.pos()
+        pos = event.position().toPoint()
+        if self._pan_start is not None:
+            start_position, start_offset = self._pan_start
+            self._view_offset = start_offset + event.position() - start_position
+            self._clamp_view_offset()
+            self._mouse_position = pos
+            self.update()
+            return
+        # Only repaint the regions that change: the old and new crosshair, and the dragged corner's edges
+        dirty = self._crosshair_rect(self._mouse_position).united(self._crosshair_rect(pos))
+        self._mouse_position = pos
         if self._drag_index is not None and self._photo is not None:
             # Dragging: update the working copy only (do not persist yet)
             if self._edit_points is None:
                 self._edit_points = self._widget_points()
             pts = self._edit_points
             if 0 <= self._drag_index < len(pts):
-                pts[self._drag_index] = event.pos()
+                dirty = dirty.united(self._drag_rect(pts, self._drag_index))
+                pts[self._drag_index] = pos
+                dirty = dirty.united(self._drag_rect(pts, self._drag_index))
             # do not call _write_widget_points here
-        self.update()
+        self.update(dirty)
+
+    @staticmethod
+    def _crosshair_rect(pos: QPoint | None) -> QRect:
+        """Return the widget area covered by the crosshair at the given position (an empty rect for None)."""
+        if pos is None:
+            return QRect()
+        extent = _CROSSHAIR_GAP + _CROSSHAIR_LENGTH + _CROSSHAIR_WIDTH + _CROSSHAIR_BORDER
+        return QRect(pos.x() - extent, pos.y() - extent, 2 * extent + 1, 2 * extent + 1)
+
+    def _drag_rect(self, pts: list[QPoint], index: int) -> QRect:
+        """
+        Return the widget area that depends on the position of the point at the given index:
+        its handle, the edges to its neighbors, and the shading between them.
+        """
+        neighbors = [pts[(index - 1) % len(pts)], pts[index], pts[(index + 1) % len(pts)]]
+        margin = self._handle_radius + 2
+        return QPolygon(neighbors).boundingRect().adjusted(-margin, -margin, margin, margin)
 
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
+        if event.button() == Qt.MouseButton.MiddleButton and self._pan_start is not None:
+            self._pan_start = None
+            return
         # Stop dragging and persist any working edits
         if self._edit_points is not None:
             # commit working copy into the model
@@ -400,7 +754,7 @@ class PhotoEditorWidget(QWidget):
             # discard working copy after commit
             self._edit_points = None
         self._drag_index = None
-        self._mouse_position = event.pos()
+        self._mouse_position = event.position().toPoint()
         self.update()
 
     def enterEvent(self, event: QEnterEvent) -> None:
@@ -458,53 +812,43 @@ class PhotoEditorWidget(QWidget):
         worker.signals.error.connect(_on_error)
         start_worker(worker)
 
+    def _cancel_undistort(self) -> None:
+        """Cancel the undistortion in flight, if any, and discard its result."""
+        self._undistort_generation += 1
+        if self._current_undistort_worker is not None:
+            self._current_undistort_worker.cancel()
+            self._current_undistort_worker = None
+
     def _start_undistort_for_current(self) -> None:
         """Internal: start async undistort for the currently shown photo and update the widget when done."""
         if self._photo is None or self._current_project is None:
             return
 
-        # If a previous worker is running, we won't cancel it here; just start another
-        worker = Worker(undistort_photo, self._photo, self._current_project)
+        # Only the newest undistortion is shown; stop the previous one mid-remap
+        self._cancel_undistort()
+        generation = self._undistort_generation
+        worker = Worker(_undistort_for_display, self._photo, self._current_project, self._original_cv_img)
         self._current_undistort_worker = worker
 
-        def _on_result(result: MatLike | None) -> None:
+        def _on_result(result: tuple[MatLike, QImage] | None) -> None:
+            if generation != self._undistort_generation:
+                # A newer undistortion has been started since (the result may be queued before the cancel)
+                return
             try:
                 if result is None:
                     self._undistorted_cv_img = None
                 else:
-                    self._undistorted_cv_img = result
-                    # update pixmap from result on the main thread
-                    try:
-                        from PySide6.QtGui import QImage
-
-                        und = result
-                        # Result is in BGR/BGRA ordering (OpenCV). Convert to RGB/RGBA for QImage
-                        import cv2
-
-                        if und.ndim == 3 and und.shape[2] == 3:
-                            rgb = cv2.cvtColor(und, cv2.COLOR_BGR2RGB).copy()
-                            h, w, ch = rgb.shape
-                            bytes_per_line = ch * w
-                            qimg = QImage(rgb.data, w, h, bytes_per_line, QImage.Format.Format_RGB888).copy()
-                        elif und.ndim == 3 and und.shape[2] == 4:
-                            rgba = cv2.cvtColor(und, cv2.COLOR_BGRA2RGBA).copy()
-                            h, w, ch = rgba.shape
-                            bytes_per_line = ch * w
-                            qimg = QImage(rgba.data, w, h, bytes_per_line, QImage.Format.Format_RGBA8888).copy()
-                        else:
-                            gray = und.copy()
-                            h, w = gray.shape
-                            qimg = QImage(gray.data, w, h, w, QImage.Format.Format_Grayscale8).copy()
-                        self._pixmap = QPixmap.fromImage(qimg)
-                    except Exception:
-                        # if conversion fails, leave pixmap as-is
-                        pass
+                    # The image has already been converted on the worker thread, so this doesn't copy the pixels
+                    self._undistorted_cv_img, image = result
+                    self._set_pixmap(QPixmap.fromImage(image))
             finally:
                 # Clear worker ref and repaint
                 self._current_undistort_worker = None
                 self.update()
 
         def _on_error() -> None:
+            if generation != self._undistort_generation:
+                return
             self._undistorted_cv_img = None
             self._current_undistort_worker = None
             self.update()
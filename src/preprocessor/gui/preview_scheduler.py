@@ -0,0 +1,115 @@
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from preprocessor.gui.worker import Worker, WorkerManager, default_worker_manager
+
+logger = logging.getLogger(__name__)
+
+
+class PreviewScheduler(QObject):
+    """
+    Schedules a preview task on a worker thread, for previews that update while the user changes a value.
+
+    Requests are debounced: the task only starts once no new request has been made for `delay_ms` milliseconds.
+    At most one task is in flight at a time. A new request cancels the task in flight (through its `stop_checker`),
+    and only the most recent request is run once it has finished; any requests in between are dropped.
+    The result of a superseded or canceled task is never signaled, even if it was already on its way.
+
+    Usage:
+        scheduler = PreviewScheduler(my_task)
+        scheduler.on_preview_ready.connect(handle_preview)
+        spinbox.valueChanged.connect(lambda value: scheduler.schedule(image, value))
+    """
+
+    on_preview_ready: Signal = Signal(object, float)
+    """Signals the result of a preview task, and its latency (in seconds) since the request it is the result of."""
+    on_preview_failed: Signal = Signal(tuple)
+    """Signals when a preview task raised an error. Emits a tuple of (exctype, value, traceback)."""
+
+    _fn: Callable[..., Any]
+    _worker_manager: WorkerManager
+    _timer: QTimer
+    _pending: tuple[tuple[Any, ...], float] | None = None
+    """The arguments and request time of the most recent request that has not been started yet, if any."""
+    _worker: Worker | None = None
+    """The worker running the task, if any."""
+    _generation: int = 0
+    """Incremented whenever a request is made or canceled, to discard the results of superseded tasks."""
+
+    def __init__(
+        self,
+        fn: Callable[..., Any],
+        delay_ms: int = 150,
+        worker_manager: WorkerManager | None = None,
+        parent: QObject | None = None,
+    ) -> None:
+        """
+        :param fn: The preview task; it is passed the arguments of the request,
+            and a `progress_callback` and `stop_checker` like any other `Worker` task.
+        :param delay_ms: How long to wait for further requests before starting the task, in milliseconds.
+        :param worker_manager: The worker manager to run the task on; or None to use the default worker manager.
+        """
+        super().__init__(parent)
+        self._fn = fn
+        self._worker_manager = worker_manager if worker_manager is not None else default_worker_manager
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start_pending)
+
+    @property
+    def busy(self) -> bool:
+        """Whether a preview is scheduled or in flight."""
+        return self._pending is not None or self._worker is not None
+
+    def schedule(self, *args: Any) -> None:
+        """Request a preview with the given arguments, superseding any earlier request."""
+        self._pending = (args, time.perf_counter())
+        self._generation += 1
+        if self._worker is not None:
+            # The result would be stale; it is started again once the worker has finished
+            self._worker.cancel()
+        self._timer.start()
+
+    def cancel(self) -> None:
+        """Cancel the scheduled and running preview, if any."""
+        self._timer.stop()
+        self._pending = None
+        self._generation += 1
+        if self._worker is not None:
+            self._worker.cancel()
+
+    def _start_pending(self) -> None:
+        """Start the most recent request, unless a (canceled) worker is still running."""
+        if self._pending is None or self._worker is not None:
+            return
+        args, requested_at = self._pending
+        self._pending = None
+
+        worker = Worker(self._fn, *args)
+        self._worker = worker
+        generation = self._generation
+
+        def _on_result(result: object) -> None:
+            if generation != self._generation:
+                # A newer request has been made, or the preview was canceled, since (the result may be queued before)
+                return
+            latency = time.perf_counter() - requested_at
+            logger.debug(f"Preview ready after {latency * 1000:.0f} ms")
+            self.on_preview_ready.emit(result, latency)
+
+        def _on_finished() -> None:
+            if self._worker is worker:
+                self._worker = None
+            # Start the request that was made while this worker was running, unless it is still being debounced
+            if not self._timer.isActive():
+                self._start_pending()
+
+        worker.signals.result.connect(_on_result)
+        worker.signals.error.connect(self.on_preview_failed.emit)
+        worker.signals.finished.connect(_on_finished)
+        self._worker_manager.start(worker)
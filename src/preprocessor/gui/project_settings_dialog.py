@@ -2,6 +2,7 @@ from PySide6.QtWidgets import QDialog, QWidget
 
 from preprocessor.gui.ui_project_settings_dialog import Ui_ProjectSettingsDialog
 from preprocessor.model.project_model import ProjectModel
+from preprocessor.processing.params import UndistortMapType
 
 
 class ProjectSettingsDialog(QDialog):
@@ -24,6 +25,7 @@ class ProjectSettingsDialog(QDialog):
         self.ui.txtSeason.setText(self.model.metadata_season)
         self.ui.txtDepth.setText(self.model.metadata_depth)
         self.ui.txtTransect.setText(self.model.metadata_transect)
+        self.ui.cmbUndistortMapType.setCurrentText(self.model.undistort_map_type.value)
 
     def _connect_signals(self) -> None:
         self.ui.btnsDialog.accepted.connect(self._handle_accept)
@@ -35,3 +37,4 @@ class ProjectSettingsDialog(QDialog):
         self.model.metadata_season = self.ui.txtSeason.text()
         self.model.metadata_depth = self.ui.txtDepth.text()
         self.model.metadata_transect = self.ui.txtTransect.text()
+        self.model.undistort_map_type = UndistortMapType.from_string(self.ui.cmbUndistortMapType.currentText())
@@ -1,12 +1,32 @@
-from PySide6.QtCore import Qt, QSize, Signal
-from PySide6.QtGui import QIcon, QPixmap
+from collections.abc import Callable
+from pathlib import Path
+
+from PySide6.QtCore import Qt, Signal, QStandardPaths, QThreadPool
+from PySide6.QtGui import QIcon, QImage, QPixmap
 from PySide6.QtWidgets import QDockWidget, QWidget, QListWidget, QListWidgetItem
 
 from preprocessor.gui.ui_thumbnail_dock import Ui_ThumbnailDock
 from preprocessor.gui.utils import icon_from_resource
+from preprocessor.gui.worker import Worker, WorkerManager
 from preprocessor.model.project_model import ProjectModel
 from preprocessor.model.qlistmodel import QListModel
 from preprocessor.model.photo_model import PhotoModel
+from preprocessor.processing.thumbnail import get_thumbnail
+
+
+def thumbnail_cache_dir() -> Path:
+    """The directory where the thumbnails are cached between sessions."""
+    return Path(QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)) / "thumbnails"
+
+
+def _load_thumbnail(path: Path, cache_dir: Path, progress_callback: Callable[[float], None]) -> QImage | None:  # noqa: ARG001
+    """Load the thumbnail of the photo from the cache, creating it if needed. Runs on a worker thread."""
+    thumbnail_path = get_thumbnail(path, cache_dir)
+    if thumbnail_path is None:
+        return None
+    # QImage (unlike QPixmap) may be used outside the GUI thread
+    image = QImage(str(thumbnail_path))
+    return image if not image.isNull() else None
 
 
 class ThumbnailDockWidget(QDockWidget):
@@ -26,6 +46,15 @@ class ThumbnailDockWidget(QDockWidget):
 
         self.model = None
 
+        self._thumbnail_cache_dir = thumbnail_cache_dir()
+        self._placeholder_icon = icon_from_resource("icons/fugue32/image.png")
+        self._thumbnail_items: dict[PhotoModel, QListWidgetItem] = {}
+        """The list items by photo, for filling in the thumbnails when they are loaded."""
+        self._thumbnail_workers: dict[PhotoModel, Worker] = {}
+        """The running thumbnail workers by photo, to keep them alive until they finish."""
+        # A separate thread pool, so that loading many thumbnails doesn't hold up the editor
+        self._thumbnail_worker_manager = WorkerManager(QThreadPool(self))
+
     def _setup_icons(self) -> None:
         """Set up icons for actions."""
         # Toolbar
@@ -91,6 +120,7 @@ class ThumbnailDockWidget(QDockWidget):
             if found_index is not None:
                 # takeItem returns the removed QListWidgetItem; Qt will handle deletion by parent
                 thumbnail_list.takeItem(found_index)
+            self._thumbnail_items.pop(photo, None)
 
         # Insert items for added PhotoModel instances at the correct index to preserve order
         for photo in added:
@@ -99,20 +129,33 @@ class ThumbnailDockWidget(QDockWidget):
             except ValueError:
                 insert_index = thumbnail_list.count()
 
-            # Show basename as text; if there's an image file, load it as a thumbnail icon
+            # Show basename as text, with a placeholder icon until the thumbnail is loaded
             display_text = photo.name
-            item = QListWidgetItem(display_text)
-
-            original_path = project.get_absolute_path(photo.original_filename)
-            pix = QPixmap(str(original_path))
-            if not pix.isNull():
-                thumb = pix.scaled(
-                    QSize(120, 120),
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation,
-                )
-                item.setIcon(QIcon(thumb))
+            item = QListWidgetItem(self._placeholder_icon, display_text)
 
             item.setData(Qt.ItemDataRole.UserRole, photo)
             # Insert at the position matching the project's photo index
             thumbnail_list.insertItem(insert_index, item)
+            self._thumbnail_items[photo] = item
+            self._start_thumbnail_worker(photo, project.get_absolute_path(photo.original_filename))
+
+    def _start_thumbnail_worker(self, photo: PhotoModel, path: Path) -> None:
+        """Load the thumbnail of the photo in the background, and show it when it is loaded."""
+        if photo in self._thumbnail_workers:
+            return
+        worker = Worker(_load_thumbnail, path, self._thumbnail_cache_dir)
+        worker.signals.result.connect(lambda image: self._handle_thumbnail_loaded(photo, image))
+        worker.signals.finished.connect(lambda: self._thumbnail_workers.pop(photo, None))
+        self._thumbnail_workers[photo] = worker
+        self._thumbnail_worker_manager.start(worker)
+
+    def _handle_thumbnail_loaded(self, photo: PhotoModel, image: QImage | None) -> None:
+        """Handle when the thumbnail of a photo has been loaded."""
+        item = self._thumbnail_items.get(photo)
+        if item is None:
+            # The photo has been removed in the meantime
+            return
+        if image is None:
+            item.setIcon(icon_from_resource("icons/fugue16/image--exclamation.png"))
+            return
+        item.setIcon(QIcon(QPixmap.fromImage(image)))
@@ -0,0 +1,185 @@
+import logging
+import math
+from collections import OrderedDict
+from collections.abc import Callable
+
+import cv2
+from cv2.typing import MatLike
+from PySide6.QtCore import QObject, QRect, QThreadPool, Signal
+from PySide6.QtGui import QImage, QPixmap
+
+from preprocessor.gui.utils import display_qimage_from_cv
+from preprocessor.gui.worker import Worker, WorkerManager
+
+logger = logging.getLogger(__name__)
+
+TILE_SIZE = 512
+"""The width and height of a tile, in pixels."""
+
+type TileKey = tuple[int, int, int]
+"""Identifies a tile by its (level, column, row); at level `n`, a tile shows the image at 1/2^n of its size."""
+
+
+def _render_tile(
+    img: MatLike,
+    source_rect: tuple[int, int, int, int],
+    level: int,
+    progress_callback: Callable[[float], None],  # noqa: ARG001
+    stop_checker: Callable[[], bool],
+) -> QImage | None:
+    """Cut a tile from the (BGR) image and scale it to its level. Runs on a worker thread."""
+    if stop_checker():
+        return None
+    x, y, w, h = source_rect
+    tile = img[y : y + h, x : x + w]
+    if level > 0:
+        size = (max(1, math.ceil(w / 2**level)), max(1, math.ceil(h / 2**level)))
+        tile = cv2.resize(tile, size, interpolation=cv2.INTER_AREA)
+    return display_qimage_from_cv(tile)
+
+
+class TileCache(QObject):
+    """
+    Renders an image in tiles on demand, on background workers, and caches them.
+
+    Tiles are rendered in the order in which they are requested, so that the visible tiles appear first;
+    requested tiles that are no longer requested before they start are skipped.
+    When the cache holds more than `max_bytes` of tiles, the least recently used tiles are evicted,
+    except for the tiles that were requested most recently.
+    """
+
+    on_tile_ready: Signal = Signal(tuple)
+    """Signals the key of a tile that has been rendered."""
+
+    _source: MatLike | None = None
+    _generation: int = 0
+    """Incremented whenever the source image changes, to discard tiles rendered from a previous source."""
+
+    def __init__(
+        self, tile_size: int = TILE_SIZE, max_bytes: int = 256 * 1024 * 1024, parent: QObject | None = None
+    ) -> None:
+        """
+        :param tile_size: The width and height of a tile, in pixels.
+        :param max_bytes: The memory cap of the cached tiles, in bytes.
+        """
+        super().__init__(parent)
+        self.tile_size = tile_size
+        self.max_bytes = max_bytes
+        self._tiles: OrderedDict[TileKey, QPixmap] = OrderedDict()
+        """The cached tiles, from least to most recently used."""
+        self._bytes = 0
+        """The memory used by the cached tiles, in bytes."""
+        self._workers: dict[TileKey, Worker] = {}
+        """The workers rendering a tile, by tile key."""
+        self._requested: set[TileKey] = set()
+        """The tiles that were requested most recently; these are never evicted."""
+        # Rendering tiles must not hold up the other background tasks
+        self._worker_manager = WorkerManager(QThreadPool(self))
+
+    @property
+    def source(self) -> MatLike | None:
+        """The image the tiles are rendered from, if any."""
+        return self._source
+
+    def set_source(self, img: MatLike | None) -> None:
+        """Set the image to render tiles from, discarding all tiles of the previous image."""
+        if img is self._source:
+            return
+        for worker in self._workers.values():
+            worker.cancel()
+        self._workers.clear()
+        self._tiles.clear()
+        self._bytes = 0
+        self._requested = set()
+        self._source = img
+        self._generation += 1
+
+    def tile(self, key: TileKey) -> QPixmap | None:
+        """Return the tile, if it has been rendered."""
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+        return tile
+
+    def source_rect(self, key: TileKey) -> QRect:
+        """Return the part of the source image the tile shows, in source image pixels."""
+        level, column, row = key
+        extent = self.tile_size * 2**level
+        rect = QRect(column * extent, row * extent, extent, extent)
+        if self._source is not None:
+            height, width = self._source.shape[:2]
+            rect = rect.intersected(QRect(0, 0, width, height))
+        return rect
+
+    def tiles_in(self, level: int, rect: QRect) -> list[TileKey]:
+        """Return the keys of the tiles at the level that cover the rect (in source image pixels), row by row."""
+        if self._source is None:
+            return []
+        height, width = self._source.shape[:2]
+        rect = rect.intersected(QRect(0, 0, width, height))
+        if rect.isEmpty():
+            return []
+        extent = self.tile_size * 2**level
+        return [
+            (level, column, row)
+            for row in range(rect.top() // extent, rect.bottom() // extent + 1)
+            for column in range(rect.left() // extent, rect.right() // extent + 1)
+        ]
+
+    def request(self, keys: list[TileKey]) -> None:
+        """
+        Render the tiles that are not cached yet, in the given order.
+
+        Any tiles requested earlier that are not in `keys` and have not started rendering yet are skipped.
+        """
+        self._requested = set(keys)
+        for key, worker in list(self._workers.items()):
+            if key not in self._requested:
+                worker.cancel()
+                del self._workers[key]
+        if self._source is None:
+            return
+        for priority, key in enumerate(reversed(keys)):
+            if key in self._tiles or key in self._workers:
+                continue
+            rect = self.source_rect(key)
+            if rect.isEmpty():
+                continue
+            worker = Worker(_render_tile, self._source, (rect.x(), rect.y(), rect.width(), rect.height()), key[0])
+            generation = self._generation
+            worker.signals.result.connect(
+                lambda image, key=key, generation=generation: self._handle_tile_rendered(key, generation, image)
+            )
+            worker.signals.finished.connect(lambda key=key, worker=worker: self._handle_worker_finished(key, worker))
+            self._workers[key] = worker
+            self._worker_manager.start(worker, priority)
+
+    def _handle_tile_rendered(self, key: TileKey, generation: int, image: QImage | None) -> None:
+        """Handle when a tile has been rendered."""
+        if image is None or generation != self._generation:
+            return
+        tile = QPixmap.fromImage(image)
+        self._tiles[key] = tile
+        self._bytes += _pixmap_bytes(tile)
+        self._evict()
+        self.on_tile_ready.emit(key)
+
+    def _handle_worker_finished(self, key: TileKey, worker: Worker) -> None:
+        """Handle when a worker rendering a tile has finished."""
+        if self._workers.get(key) is worker:
+            del self._workers[key]
+
+    def _evict(self) -> None:
+        """Evict the least recently used tiles that were not requested most recently, until under the memory cap."""
+        for key in list(self._tiles):
+            if self._bytes <= self.max_bytes:
+                break
+            if key in self._requested:
+                continue
+            self._bytes -= _pixmap_bytes(self._tiles.pop(key))
+        logger.debug(f"Tile cache holds {len(self._tiles)} tiles ({self._bytes / 2**20:.0f} MiB)")
+
+
+def _pixmap_bytes(pixmap: QPixmap) -> int:
+    """Return the (approximate) memory used by the pixmap, in bytes."""
+    return pixmap.width() * pixmap.height() * max(1, pixmap.depth() // 8)
@@ -35,7 +35,7 @@ class Ui_ExportDialog(object):
         self.frmMain.setWidgetResizable(True)
         self.layMain = QWidget()
         self.layMain.setObjectName(u"layMain")
-        self.layMain.setGeometry(QRect(0, 0, 573, 122))
+        self.layMain.setGeometry(QRect(0, 0, 573, 154))
         self.formLayout_2 = QFormLayout(self.layMain)
         self.formLayout_2.setObjectName(u"formLayout_2")
         self.formLayout_2.setFieldGrowthPolicy(QFormLayout.FieldGrowthPolicy.AllNonFixedFieldsGrow)
@@ -118,6 +118,18 @@ class Ui_ExportDialog(object):
 
         self.formLayout_2.setWidget(2, QFormLayout.ItemRole.LabelRole, self.lblTargetHeight)
 
+        self.lblWorkers = QLabel(self.layMain)
+        self.lblWorkers.setObjectName(u"lblWorkers")
+
+        self.formLayout_2.setWidget(3, QFormLayout.ItemRole.LabelRole, self.lblWorkers)
+
+        self.numWorkers = QSpinBox(self.layMain)
+        self.numWorkers.setObjectName(u"numWorkers")
+        self.numWorkers.setMinimum(1)
+        self.numWorkers.setMaximum(256)
+
+        self.formLayout_2.setWidget(3, QFormLayout.ItemRole.FieldRole, self.numWorkers)
+
         self.frmMain.setWidget(self.layMain)
 
         self.verticalLayout.addWidget(self.frmMain)
@@ -207,6 +219,10 @@ class Ui_ExportDialog(object):
         self.lblTargetWidth_Value.setText(QCoreApplication.translate("ExportDialog", u"0 px", None))
         self.lblTargetHeight_Value.setText(QCoreApplication.translate("ExportDialog", u"0 px", None))
         self.lblTargetHeight.setText(QCoreApplication.translate("ExportDialog", u"Target height:", None))
+        self.lblWorkers.setText(QCoreApplication.translate("ExportDialog", u"Parallel workers:", None))
+#if QT_CONFIG(tooltip)
+        self.numWorkers.setToolTip(QCoreApplication.translate("ExportDialog", u"The number of photos to export in parallel.", None))
+#endif // QT_CONFIG(tooltip)
         self.lblProgress.setText(QCoreApplication.translate("ExportDialog", u"Progress:", None))
         self.lblProgress_Status.setText(QCoreApplication.translate("ExportDialog", u"Ready", None))
         self.lblMessages.setText(QCoreApplication.translate("ExportDialog", u"Messages:", None))
@@ -54,10 +54,14 @@ class Ui_Main(object):
         self.menuFile_ExportAll.setObjectName(u"menuFile_ExportAll")
         self.menuEdit_DetectQuadrat = QAction(Main)
         self.menuEdit_DetectQuadrat.setObjectName(u"menuEdit_DetectQuadrat")
+        self.menuEdit_DetectAllQuadrats = QAction(Main)
+        self.menuEdit_DetectAllQuadrats.setObjectName(u"menuEdit_DetectAllQuadrats")
         self.menuWindow_ShowThumbnailsPanel = QAction(Main)
         self.menuWindow_ShowThumbnailsPanel.setObjectName(u"menuWindow_ShowThumbnailsPanel")
         self.menuWindow_ShowEditorPanel = QAction(Main)
         self.menuWindow_ShowEditorPanel.setObjectName(u"menuWindow_ShowEditorPanel")
+        self.menuWindow_ShowPropertiesPanel = QAction(Main)
+        self.menuWindow_ShowPropertiesPanel.setObjectName(u"menuWindow_ShowPropertiesPanel")
         self.menuFile_ProjectSettings = QAction(Main)
         self.menuFile_ProjectSettings.setObjectName(u"menuFile_ProjectSettings")
         self.menuFile_ProjectSettings.setMenuRole(QAction.MenuRole.NoRole)
@@ -98,8 +102,10 @@ class Ui_Main(object):
         self.menuFile.addAction(self.menuFile_Exit)
         self.menuHelp.addAction(self.menuHelp_About)
         self.menuEdit.addAction(self.menuEdit_DetectQuadrat)
+        self.menuEdit.addAction(self.menuEdit_DetectAllQuadrats)
         self.menuWindow.addAction(self.menuWindow_ShowThumbnailsPanel)
         self.menuWindow.addAction(self.menuWindow_ShowEditorPanel)
+        self.menuWindow.addAction(self.menuWindow_ShowPropertiesPanel)
         self.toolBar.addAction(self.menuFile_OpenProject)
         self.toolBar.addAction(self.menuFile_SaveProject)
 
@@ -139,8 +145,13 @@ class Ui_Main(object):
 #endif // QT_CONFIG(statustip)
         self.menuFile_ExportAll.setText(QCoreApplication.translate("Main", u"E&xport All...", None))
         self.menuEdit_DetectQuadrat.setText(QCoreApplication.translate("Main", u"Detect &quadrat", None))
+        self.menuEdit_DetectAllQuadrats.setText(QCoreApplication.translate("Main", u"Detect quadrat in &all photos...", None))
+#if QT_CONFIG(tooltip)
+        self.menuEdit_DetectAllQuadrats.setToolTip(QCoreApplication.translate("Main", u"Detect the quadrat in all photos that don't have quadrat corners yet", None))
+#endif // QT_CONFIG(tooltip)
         self.menuWindow_ShowThumbnailsPanel.setText(QCoreApplication.translate("Main", u"Thumbnails panel", None))
         self.menuWindow_ShowEditorPanel.setText(QCoreApplication.translate("Main", u"Editor panel", None))
+        self.menuWindow_ShowPropertiesPanel.setText(QCoreApplication.translate("Main", u"Detection properties panel", None))
         self.menuFile_ProjectSettings.setText(QCoreApplication.translate("Main", u"Project Se&ttings...", None))
         self.menuFile.setTitle(QCoreApplication.translate("Main", u"&File", None))
         self.menuHelp.setTitle(QCoreApplication.translate("Main", u"&Help", None))
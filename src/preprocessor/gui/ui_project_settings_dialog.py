@@ -15,9 +15,9 @@ from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
     QFont, QFontDatabase, QGradient, QIcon,
     QImage, QKeySequence, QLinearGradient, QPainter,
     QPalette, QPixmap, QRadialGradient, QTransform)
-from PySide6.QtWidgets import (QAbstractButton, QApplication, QDialog, QDialogButtonBox,
-    QFormLayout, QLabel, QLineEdit, QSizePolicy,
-    QTabWidget, QVBoxLayout, QWidget)
+from PySide6.QtWidgets import (QAbstractButton, QApplication, QComboBox, QDialog,
+    QDialogButtonBox, QFormLayout, QLabel, QLineEdit,
+    QSizePolicy, QTabWidget, QVBoxLayout, QWidget)
 
 class Ui_ProjectSettingsDialog(object):
     def setupUi(self, ProjectSettingsDialog):
@@ -42,35 +42,35 @@ class Ui_ProjectSettingsDialog(object):
 
         self.formLayout_2.setWidget(0, QFormLayout.ItemRole.FieldRole, self.txtGroup)
 
-        self.lblSeason = QLabel(self.tabMetadata)
-        self.lblSeason.setObjectName(u"lblSeason")
-
-        self.formLayout_2.setWidget(1, QFormLayout.ItemRole.LabelRole, self.lblSeason)
-
-        self.txtSeason = QLineEdit(self.tabMetadata)
-        self.txtSeason.setObjectName(u"txtSeason")
-
-        self.formLayout_2.setWidget(1, QFormLayout.ItemRole.FieldRole, self.txtSeason)
-
         self.lblArea = QLabel(self.tabMetadata)
         self.lblArea.setObjectName(u"lblArea")
 
-        self.formLayout_2.setWidget(2, QFormLayout.ItemRole.LabelRole, self.lblArea)
+        self.formLayout_2.setWidget(1, QFormLayout.ItemRole.LabelRole, self.lblArea)
 
         self.txtArea = QLineEdit(self.tabMetadata)
         self.txtArea.setObjectName(u"txtArea")
 
-        self.formLayout_2.setWidget(2, QFormLayout.ItemRole.FieldRole, self.txtArea)
+        self.formLayout_2.setWidget(1, QFormLayout.ItemRole.FieldRole, self.txtArea)
 
         self.lblSite = QLabel(self.tabMetadata)
         self.lblSite.setObjectName(u"lblSite")
 
-        self.formLayout_2.setWidget(3, QFormLayout.ItemRole.LabelRole, self.lblSite)
+        self.formLayout_2.setWidget(2, QFormLayout.ItemRole.LabelRole, self.lblSite)
 
         self.txtSite = QLineEdit(self.tabMetadata)
         self.txtSite.setObjectName(u"txtSite")
 
-        self.formLayout_2.setWidget(3, QFormLayout.ItemRole.FieldRole, self.txtSite)
+        self.formLayout_2.setWidget(2, QFormLayout.ItemRole.FieldRole, self.txtSite)
+
+        self.lblSeason = QLabel(self.tabMetadata)
+        self.lblSeason.setObjectName(u"lblSeason")
+
+        self.formLayout_2.setWidget(3, QFormLayout.ItemRole.LabelRole, self.lblSeason)
+
+        self.txtSeason = QLineEdit(self.tabMetadata)
+        self.txtSeason.setObjectName(u"txtSeason")
+
+        self.formLayout_2.setWidget(3, QFormLayout.ItemRole.FieldRole, self.txtSeason)
 
         self.lblDepth = QLabel(self.tabMetadata)
         self.lblDepth.setObjectName(u"lblDepth")
@@ -93,6 +93,23 @@ class Ui_ProjectSettingsDialog(object):
         self.formLayout_2.setWidget(5, QFormLayout.ItemRole.FieldRole, self.txtTransect)
 
         self.tabs.addTab(self.tabMetadata, "")
+        self.tabProcessing = QWidget()
+        self.tabProcessing.setObjectName(u"tabProcessing")
+        self.formLayout_3 = QFormLayout(self.tabProcessing)
+        self.formLayout_3.setObjectName(u"formLayout_3")
+        self.lblUndistortMapType = QLabel(self.tabProcessing)
+        self.lblUndistortMapType.setObjectName(u"lblUndistortMapType")
+
+        self.formLayout_3.setWidget(0, QFormLayout.ItemRole.LabelRole, self.lblUndistortMapType)
+
+        self.cmbUndistortMapType = QComboBox(self.tabProcessing)
+        self.cmbUndistortMapType.addItem("")
+        self.cmbUndistortMapType.addItem("")
+        self.cmbUndistortMapType.setObjectName(u"cmbUndistortMapType")
+
+        self.formLayout_3.setWidget(0, QFormLayout.ItemRole.FieldRole, self.cmbUndistortMapType)
+
+        self.tabs.addTab(self.tabProcessing, "")
 
         self.verticalLayout.addWidget(self.tabs)
 
@@ -117,11 +134,19 @@ class Ui_ProjectSettingsDialog(object):
     def retranslateUi(self, ProjectSettingsDialog):
         ProjectSettingsDialog.setWindowTitle(QCoreApplication.translate("ProjectSettingsDialog", u"Dialog", None))
         self.lblGroup.setText(QCoreApplication.translate("ProjectSettingsDialog", u"Group:", None))
-        self.lblSeason.setText(QCoreApplication.translate("ProjectSettingsDialog", u"Season:", None))
         self.lblArea.setText(QCoreApplication.translate("ProjectSettingsDialog", u"Area:", None))
         self.lblSite.setText(QCoreApplication.translate("ProjectSettingsDialog", u"Site:", None))
+        self.lblSeason.setText(QCoreApplication.translate("ProjectSettingsDialog", u"Season:", None))
         self.lblDepth.setText(QCoreApplication.translate("ProjectSettingsDialog", u"Depth:", None))
         self.lblTransect.setText(QCoreApplication.translate("ProjectSettingsDialog", u"Transect:", None))
         self.tabs.setTabText(self.tabs.indexOf(self.tabMetadata), QCoreApplication.translate("ProjectSettingsDialog", u"Metadata", None))
+        self.lblUndistortMapType.setText(QCoreApplication.translate("ProjectSettingsDialog", u"Undistortion maps:", None))
+        self.cmbUndistortMapType.setItemText(0, QCoreApplication.translate("ProjectSettingsDialog", u"Float", None))
+        self.cmbUndistortMapType.setItemText(1, QCoreApplication.translate("ProjectSettingsDialog", u"Fixed-point", None))
+
+#if QT_CONFIG(tooltip)
+        self.cmbUndistortMapType.setToolTip(QCoreApplication.translate("ProjectSettingsDialog", u"Fixed-point maps use less memory and undistort faster, at 1/32 pixel precision.", None))
+#endif // QT_CONFIG(tooltip)
+        self.tabs.setTabText(self.tabs.indexOf(self.tabProcessing), QCoreApplication.translate("ProjectSettingsDialog", u"Processing", None))
     # retranslateUi
 
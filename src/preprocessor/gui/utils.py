@@ -1,4 +1,5 @@
-from PySide6.QtGui import QIcon, QPixmap
+from cv2.typing import MatLike
+from PySide6.QtGui import QIcon, QImage, QPixmap
 from importlib import resources as _importlib_resources
 
 
@@ -8,3 +9,36 @@ def icon_from_resource(relpath: str) -> QIcon:
     pm = QPixmap()
     pm.loadFromData(data)
     return QIcon(pm)
+
+
+def qimage_from_cv(img: MatLike) -> QImage:
+    """
+    Wrap an OpenCV image (BGR, BGRA, or grayscale) in a QImage, without copying or converting the pixels.
+
+    The QImage shares the memory of the image, and keeps it alive; so the image must not be modified
+    while the QImage is in use. Images whose rows are not contiguous are copied first.
+    """
+    import numpy as np
+
+    if not img.flags.c_contiguous:
+        img = np.ascontiguousarray(img)
+    h, w = img.shape[:2]
+    if img.ndim == 3 and img.shape[2] == 3:
+        return QImage(img.data, w, h, img.strides[0], QImage.Format.Format_BGR888)
+    if img.ndim == 3 and img.shape[2] == 4:
+        # BGRA in memory is ARGB as a (little-endian) 32-bit value
+        return QImage(img.data, w, h, img.strides[0], QImage.Format.Format_ARGB32)
+    return QImage(img.data, w, h, img.strides[0], QImage.Format.Format_Grayscale8)
+
+
+def display_qimage_from_cv(img: MatLike) -> QImage:
+    """
+    Convert an OpenCV image (BGR, BGRA, or grayscale) to a QImage in the format that pixmaps use.
+
+    Converting such a QImage to a QPixmap does not convert the pixels again, so call this on the worker thread
+    that produced the image, and only call `QPixmap.fromImage` on the GUI thread.
+    """
+    image = qimage_from_cv(img)
+    if image.hasAlphaChannel():
+        return image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+    return image.convertToFormat(QImage.Format.Format_RGB32)
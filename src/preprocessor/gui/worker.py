@@ -1,5 +1,7 @@
+import inspect
 import logging
 import sys
+import threading
 import traceback
 from typing import Any
 from collections.abc import Callable
@@ -16,12 +18,19 @@ logger = logging.getLogger(__name__)
 class WorkerManager:
     """Manages a pool of worker threads to run tasks in the background."""
 
-    def __init__(self) -> None:
+    def __init__(self, threadpool: QThreadPool | None = None) -> None:
+        """
+        :param threadpool: The thread pool to run the workers on; or None to use the global thread pool.
+            Use a separate thread pool for many long-running background tasks,
+            so that they don't hold up the interactive tasks on the global thread pool.
+        """
         # Note sure what the trade-off is between using QThreadPool.globalInstance() vs creating a new QThreadPool().
-        self.threadpool = QThreadPool.globalInstance()
+        self.threadpool = threadpool if threadpool is not None else QThreadPool.globalInstance()
+        self._running: set[QRunnable] = set()
+        """The workers that have been started but not yet finished."""
 
-    def start(self, worker: QRunnable) -> None:
-        """Start a worker in the thread pool."""
+    def start(self, worker: QRunnable, priority: int = 0) -> None:
+        """Start a worker in the thread pool; queued workers with a higher priority are started first."""
         # By default, the threadpool will take ownership of the worker
         # and (as autoDelete is enabled) clean it up when done.
         # However, signals seem to not be emitted when autoDelete is True.
@@ -29,7 +38,11 @@ class WorkerManager:
         # indicates that this is due to Python performing double-free,
         # so we disable Qt auto-deletion here and let Python clean the worker up.
         worker.setAutoDelete(False)
-        self.threadpool.start(worker)
+        if isinstance(worker, Worker):
+            # Keep the worker alive until it finishes, even if the caller drops it (e.g., after canceling it)
+            self._running.add(worker)
+            worker.signals.finished.connect(lambda: self._running.discard(worker))
+        self.threadpool.start(worker, priority)
 
 
 # Provide a default global worker manager instance for convenience
@@ -41,6 +54,29 @@ def start_worker(worker: QRunnable) -> None:
     default_worker_manager.start(worker)
 
 
+class CancelToken:
+    """
+    A thread-safe flag to request a worker task to stop.
+
+    The token is callable, so it can be passed as the `stop_checker` of the processing functions.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Request the task to stop."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the task has been requested to stop."""
+        return self._event.is_set()
+
+    def __call__(self) -> bool:
+        return self._event.is_set()
+
+
 class WorkerSignals(QObject):
     """Defines the signals available from a running worker thread."""
 
@@ -59,8 +95,10 @@ class Worker(QRunnable):
     A worker for running tasks in the background.
 
     Usage:
-        def my_task(progress_callback):
+        def my_task(progress_callback, stop_checker):
             for i in range(100):
+                if stop_checker():
+                    return None
                 # do work...
                 progress_callback(i / 100)
             return result
@@ -72,12 +110,17 @@ class Worker(QRunnable):
         worker.signals.error.connect(handle_error)
 
         worker_manager.start(worker)
+
+    The task is passed a `progress_callback` keyword argument, and if it has a `stop_checker` parameter,
+    the worker's cancel token as the `stop_checker`. Once the worker is canceled, it no longer emits
+    its result or error, but it still emits `finished`.
     """
 
     fn: Callable[..., Any]
     args: tuple[Any, ...]
     kwargs: dict[str, Any]
     signals: WorkerSignals
+    cancel_token: CancelToken
 
     def __init__(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
         """
@@ -91,20 +134,41 @@ class Worker(QRunnable):
         self.kwargs = kwargs
         self.signals = WorkerSignals()
         # Add the progress callback to the kwargs
-        self.kwargs["progress_callback"] = self.signals.progress
+        self.kwargs["progress_callback"] = self.signals.progress.emit
+        # Add the cancel token to the kwargs, if the task supports it
+        self.cancel_token = CancelToken()
+        if "stop_checker" in inspect.signature(fn).parameters:
+            self.kwargs.setdefault("stop_checker", self.cancel_token)
+
+    def cancel(self) -> None:
+        """Request the task to stop, and discard its result."""
+        self.cancel_token.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the worker has been canceled."""
+        return self.cancel_token.cancelled
 
     @Slot()
     def run(self) -> None:
         try:
+            if self.cancelled:
+                logger.debug("Worker task was canceled before it started.")
+                return
             logger.debug("Starting worker task.")
             result = self.fn(*self.args, **self.kwargs)
             logger.debug("Worker task completed.")
         except Exception as e:
+            if self.cancelled:
+                return
             logger.error("Error in worker task: %s", e)
             traceback.print_exc()
             exctype, value = sys.exc_info()[:2]
             self.signals.error.emit((exctype, value, traceback.format_exc()))
         else:
+            if self.cancelled:
+                logger.debug("Worker task was canceled; discarding its result.")
+                return
             logger.debug("Emitting result from worker task.")
             self.signals.result.emit(result)
         finally:
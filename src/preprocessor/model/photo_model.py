@@ -57,12 +57,19 @@ class PhotoModel(QModel[PhotoData]):
 
     @classmethod
     def from_file(cls, fullpath: Path, basepath: Path | None) -> "PhotoModel":
-        """Create a PhotoModel from a photo file, extracting its dimensions."""
-        from PIL import Image
+        """
+        Create a PhotoModel from a photo file, extracting its dimensions from its header.
+
+        Raises OSError if the photo could not be read.
+        """
+        from preprocessor.processing.load_image import read_image_size
 
         relative_path = update_basepath(None, basepath, fullpath)
-        with Image.open(fullpath) as img:
-            width, height = img.size
+        size = read_image_size(fullpath)
+        if size is None:
+            msg = f"Failed to read the size of photo {fullpath}"
+            raise OSError(msg)
+        width, height = size
 
         data = PhotoData(
             original_filename=relative_path,
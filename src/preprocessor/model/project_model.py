@@ -1,10 +1,14 @@
 from PySide6.QtCore import Signal
 from pydantic import BaseModel, field_validator, ValidationError
 
+from preprocessor.model import Point2
 from preprocessor.model.camera_model import CameraModel, CameraData
 from preprocessor.model.qlistmodel import QListModel
 from preprocessor.model.photo_model import PhotoModel, PhotoData
+from preprocessor.processing.params import UndistortMapType
+from preprocessor.utils import update_basepath
 
+from collections.abc import Mapping, Sequence
 from pathlib import Path
 from typing import ClassVar, Any
 
@@ -26,6 +30,8 @@ class ProjectData(BaseModel):
     """The target width for perspective correction, or None if not set."""
     target_height: int | None = None
     """The target height for perspective correction, or None if not set."""
+    undistort_map_type: UndistortMapType = UndistortMapType.FLOAT
+    """The representation of the remap tables used for undistortion."""
     photos: list[PhotoData] = []
     """The list of photos in the project."""
     cameras: list[CameraData] = []
@@ -89,6 +95,7 @@ class ProjectModel(QModel[ProjectData]):
     on_export_path_changed: Signal = Signal(object)
     on_target_width_changed: Signal = Signal(object)
     on_target_height_changed: Signal = Signal(object)
+    on_undistort_map_type_changed: Signal = Signal(object)
 
     on_metadata_group_changed: Signal = Signal(object)
     on_metadata_area_changed: Signal = Signal(object)
@@ -109,6 +116,8 @@ class ProjectModel(QModel[ProjectData]):
         # Create QListModel containers for interactive use
         self._photos = QListModel[PhotoModel](parent=self)
         self._cameras = QListModel[CameraModel](parent=self)
+        self._add_child(self._photos)
+        self._add_child(self._cameras)
 
         # Track which model instances we've connected to
         self._connected_photos: set[PhotoModel] = set()
@@ -164,6 +173,15 @@ class ProjectModel(QModel[ProjectData]):
     def target_height(self, value: int | None) -> None:
         self._set_field("target_height", value)
 
+    @property
+    def undistort_map_type(self) -> UndistortMapType:
+        """The representation of the remap tables used for undistortion."""
+        return self._data.undistort_map_type
+
+    @undistort_map_type.setter
+    def undistort_map_type(self, value: UndistortMapType) -> None:
+        self._set_field("undistort_map_type", value)
+
     @property
     def photos(self) -> QListModel[PhotoModel]:
         """The list of photos in the project."""
@@ -295,6 +313,51 @@ class ProjectModel(QModel[ProjectData]):
         """Get the absolute file path of the photo, resolved from original_filename relative to the given basepath."""
         return (self.file.parent / path).resolve()
 
+    def set_quadrat_corners(self, corners: Mapping[PhotoModel, list[Point2]]) -> None:
+        """
+        Set the quadrat corners of many photos at once.
+
+        The photos don't emit their own change signals; instead the project emits a single change notification,
+        so that views don't update once for every photo.
+        """
+        if not corners:
+            return
+        for photo, photo_corners in corners.items():
+            was_blocked = photo.blockSignals(True)
+            try:
+                photo.quadrat_corners = photo_corners
+            finally:
+                photo.blockSignals(was_blocked)
+        self._photos.mark_dirty()
+        self._handle_child_changed()
+
+    def add_photos(
+        self,
+        paths: Sequence[Path],
+        sizes: Sequence[tuple[int, int] | None],
+    ) -> list[PhotoModel]:
+        """
+        Add many photos with the given sizes to the project at once.
+
+        The photos are inserted in a single batch, so that the project and the views are notified only once.
+        The sizes are read by the caller, for instance with `read_image_sizes` on a worker thread.
+        Photos whose size is None (because it couldn't be read) are skipped. Returns the photos that were added.
+        """
+        photos = [
+            PhotoModel(
+                PhotoData(
+                    original_filename=update_basepath(None, self.file.parent, path),
+                    width=size[0],
+                    height=size[1],
+                )
+            )
+            for path, size in zip(paths, sizes, strict=True)
+            if size is not None
+        ]
+        if photos:
+            self.photos[len(self.photos) :] = photos
+        return photos
+
     def append_photo_model(self, path: Path) -> PhotoModel:
         """Helper function to create a new PhotoModel with the given path and add it to the project."""
         photo = PhotoModel.from_file(path, self.file.parent)
@@ -1,3 +1,4 @@
+import operator
 from typing import TypeVar, cast, overload, SupportsIndex
 from collections.abc import Iterable, Iterator, Callable
 from PySide6.QtCore import QObject, Signal
@@ -20,10 +21,13 @@ class QListModel[E: QModel](QObject):
 
     _items: list[E]
     _dirty: bool
+    _bindings: list[tuple[QModel, str]]
+    """The owner models and the names of their fields that hold the data of the items; see `bind_to_model`."""
 
     def __init__(self, iterable: Iterable[E] | None = None, parent: QModel | None = None) -> None:
         super().__init__(parent)
         self._items = []
+        self._bindings = []
         if iterable:
             for item in iterable:
                 self.append(item)
@@ -58,28 +62,9 @@ class QListModel[E: QModel](QObject):
 
     def __setitem__(self, index: SupportsIndex | slice, value: E | Iterable[E]) -> None:
         if isinstance(index, slice):
-            items = list(value)  # type: ignore[arg-type,call-overload]
-            for item in items:
-                if not isinstance(item, QObject):
-                    msg = "QObjectList only accepts QObjects"
-                    raise TypeError(msg)
-                item.setParent(self)
-            old_items = self._items[index]
-            for old in old_items:
-                old.setParent(None)
-            self._items[index] = items
-            self.mark_dirty()
-            self.on_changed.emit(items, list(old_items))
+            self._replace(index, list(value))  # type: ignore[arg-type,call-overload]
         else:
-            if not isinstance(value, QObject):
-                msg = "QObjectList only accepts QObjects"
-                raise TypeError(msg)
-            old = self._items[index]
-            old.setParent(None)
-            value.setParent(self)
-            self._items[index] = value
-            self.mark_dirty()
-            self.on_changed.emit([value], [old])
+            self._replace(self._item_slice(index), [value])  # type: ignore[list-item]
 
     @overload
     def __delitem__(self, index: SupportsIndex) -> None:
@@ -90,21 +75,11 @@ class QListModel[E: QModel](QObject):
         pass
 
     def __delitem__(self, index: SupportsIndex | slice) -> None:
-        items = self._items[index] if isinstance(index, slice) else [self._items[index]]
-        for item in items:
-            item.setParent(None)
-        del self._items[index]
-        self.mark_dirty()
-        self.on_changed.emit([], list(items))
+        self._replace(index if isinstance(index, slice) else self._item_slice(index), [])
 
     def insert(self, index: SupportsIndex, value: E) -> None:
-        if not isinstance(value, QObject):
-            msg = "QObjectList only accepts QObjects"
-            raise TypeError(msg)
-        value.setParent(self)
-        self._items.insert(index, value)
-        self.mark_dirty()
-        self.on_changed.emit([value], [])
+        i = operator.index(index)
+        self._replace(slice(i, i), [value])
 
     def append(self, value: E) -> None:
         self.insert(len(self._items), value)
@@ -116,6 +91,60 @@ class QListModel[E: QModel](QObject):
     def index(self, value: E) -> int:
         return self._items.index(value)
 
+    def _item_slice(self, index: SupportsIndex) -> slice:
+        """Return the slice of the single item at the index; raises IndexError if there is no such item."""
+        i = range(len(self._items))[index]
+        return slice(i, i + 1)
+
+    def _replace(self, index: slice, items: list[E]) -> None:
+        """
+        Replace the items in the slice with the given items, and apply the same change to the bound fields.
+
+        Every change to the list goes through here, so that it emits a single on_changed.
+        """
+        for item in items:
+            if not isinstance(item, QObject):
+                msg = "QObjectList only accepts QObjects"
+                raise TypeError(msg)
+        old_items = self._items[index]
+        changed_fields = self._update_bound_data(index, items)
+        self._items[index] = items
+        for old in old_items:
+            old.setParent(None)
+        for item in items:
+            item.setParent(self)
+        self.mark_dirty()
+        self.on_changed.emit(items, old_items)
+        for owner, field_name in changed_fields:
+            owner._notify_field_changed(field_name)
+
+    def _update_bound_data(self, index: slice, items: list[E]) -> list[tuple[QModel, str]]:
+        """
+        Replace the data of the items in the slice of the bound fields, in place; see `bind_to_model`.
+
+        This is called before the items themselves are replaced.
+        Returns the bound owners and fields whose data has changed.
+        """
+        changed_fields: list[tuple[QModel, str]] = []
+        data = [item._data for item in items]
+        for owner, field_name in self._bindings:
+            data_list = getattr(owner._data, field_name)
+            if data_list is not None and len(data_list) == len(self._items):
+                # The field mirrors the items, so only the slice changes
+                old_data = data_list[index]
+                data_list[index] = data
+                changed = old_data != data
+            else:
+                # The field does not mirror the items yet, such as when the items are populated from it
+                new_items = list(self._items)
+                new_items[index] = items
+                new_data_list = [item._data for item in new_items]
+                changed = new_data_list != data_list
+                setattr(owner._data, field_name, new_data_list)
+            if changed:
+                changed_fields.append((owner, field_name))
+        return changed_fields
+
     @property
     def dirty(self) -> bool:
         """True if model has been modified since last clear_dirty()."""
@@ -126,16 +155,22 @@ class QListModel[E: QModel](QObject):
         Update dirty state.
 
         Propagates clean state to the children, and emits on_dirty_changed when it changes.
+        The children don't emit on_dirty_changed themselves, so that the whole subtree emits only once.
         """
         if self._dirty == value:
             return
         self._dirty = value
         if not value:
-            # Propagate clean state to children
             for item in self._items:
-                item.mark_clean()
+                item._clear_dirty()
         with contextlib.suppress(Exception):
-            self.on_dirty_changed.emit()
+            self.on_dirty_changed.emit(value)
+
+    def _clear_dirty(self) -> None:
+        """Mark this list and its items clean, without emitting on_dirty_changed."""
+        self._dirty = False
+        for item in self._items:
+            item._clear_dirty()
 
     def mark_dirty(self) -> None:
         """Mark the model as dirty (set dirty flag to True)."""
@@ -191,14 +226,15 @@ class QListModel[E: QModel](QObject):
     ) -> None:
         """
         Bind this QListModel to a parent `owner` (a QModel instance) and a pydantic
-        `field_name`. Whenever the list changes this will:
+        `field_name`, which holds the data of the items. Whenever the list changes this will:
           - connect `child.on_changed` -> `child_changed_callback` for added children
           - disconnect for removed children
-          - call `owner._set_field(field_name, payload)` where payload is a list of
-            plain dicts (or None if empty).
+          - apply the same insertion, removal, or replacement to the owner's field, in place
+          - notify the owner once that the field has changed, if the data in it changed.
 
-        Note: `owner._set_field` is used to validate and update the owner's pydantic model.
+        Updating the field in place takes time proportional to the size of the change, not of the list.
         """
+        self._bindings.append((owner, field_name))
 
         def _handler(added: list[E], removed: list[E]) -> None:
             # wire/unwire child change handlers
@@ -212,8 +248,5 @@ class QListModel[E: QModel](QObject):
                         r.on_changed.disconnect(child_changed_callback)  # type: ignore[attr-defined]
                         r.on_dirty_changed.disconnect(self._handle_child_dirty_changed)
 
-            payload = [item._data for item in self._items] if len(self._items) > 0 else []
-            owner._set_field(field_name, payload)
-
         # connect handler
         self.on_changed.connect(_handler)
@@ -1,10 +1,13 @@
 from pathlib import Path
-from typing import TypeVar, Any
+from typing import TYPE_CHECKING, TypeVar, Any
 
 from PySide6.QtCore import QObject, Signal
 from pydantic import BaseModel
 import contextlib
 
+if TYPE_CHECKING:
+    from preprocessor.model.qlistmodel import QListModel
+
 M = TypeVar("M", bound=BaseModel)
 
 
@@ -26,6 +29,8 @@ class QModel[M: BaseModel](QObject):
     _model_version: int
     _data: M
     _dirty: bool
+    _children: list["QModel | QListModel"]
+    """The child models, which are marked clean along with this model; see `_add_child`."""
 
     def __init__(
         self,
@@ -33,6 +38,7 @@ class QModel[M: BaseModel](QObject):
         data: M | dict[str, Any] | None,
     ) -> None:
         super().__init__()
+        self._children = []
         self._model_cls = model_cls
         self._model_version = int(getattr(model_cls, "SERIAL_VERSION", 1))
         self._set_data(data)
@@ -73,26 +79,32 @@ class QModel[M: BaseModel](QObject):
         """True if model has been modified since last clear_dirty()."""
         return self._dirty
 
+    def _add_child(self, child: "QModel | QListModel") -> None:
+        """Register a child model (or list of models), so that it is marked clean along with this model."""
+        self._children.append(child)
+
     def _set_dirty(self, value: bool) -> None:
         """
         Update dirty state.
 
         Propagates clean state to the children, and emits on_dirty_changed when it changes.
+        The children don't emit on_dirty_changed themselves, so that the whole subtree emits only once.
         """
         if self._dirty == value:
             return
         self._dirty = value
         if not value:
-            # Propagate clean state to children
-            from preprocessor.model.qlistmodel import QListModel
-
-            for attr_name in dir(self):
-                attr = getattr(self, attr_name)
-                if isinstance(attr, (QModel, QListModel)):
-                    attr.mark_clean()
+            for child in self._children:
+                child._clear_dirty()
         with contextlib.suppress(Exception):
             self.on_dirty_changed.emit(value)
 
+    def _clear_dirty(self) -> None:
+        """Mark this model and its children clean, without emitting on_dirty_changed."""
+        self._dirty = False
+        for child in self._children:
+            child._clear_dirty()
+
     def mark_dirty(self) -> None:
         """Mark the model as dirty (set dirty flag to True)."""
         self._set_dirty(True)
@@ -111,20 +123,23 @@ class QModel[M: BaseModel](QObject):
         """
         Validate and set a single field using the pydantic model.
 
-        Emits per-field and on_changed signals only if the validated model differs from the previous one.
+        Emits per-field and on_changed signals only if the value of the field differs from the previous one.
+        Only the field is compared, so that setting a field takes the same time however large the rest of the model is.
         """
         if field not in self._model_cls.model_fields:
             msg = f"{field!r} is not a valid field in this model's data"
             raise ValueError(msg)
 
         # We mutate the existing model, such that all references to it get the updated data
-        old_data = self._data.model_copy()
+        old_value = getattr(self._data, field)
         setattr(self._data, field, value)
-        new_data = self._data
 
-        if new_data != old_data:
-            self._set_dirty(True)
-            if getattr(new_data, field) != getattr(old_data, field):
-                self._emit_field_signal(field)
-            with contextlib.suppress(Exception):
-                self.on_changed.emit()
+        if getattr(self._data, field) != old_value:
+            self._notify_field_changed(field)
+
+    def _notify_field_changed(self, field: str) -> None:
+        """Mark the model dirty and emit the per-field and on_changed signals, after the field has changed."""
+        self._set_dirty(True)
+        self._emit_field_signal(field)
+        with contextlib.suppress(Exception):
+            self.on_changed.emit()
@@ -0,0 +1,147 @@
+import logging
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from preprocessor.model import Matrix3x3, Point2
+from preprocessor.model.project_model import ProjectModel
+from preprocessor.processing.detect_quadrat import detect_quadrat
+from preprocessor.processing.load_image import load_image, read_image_size, reduction_for_size
+from preprocessor.processing.params import QuadratDetectionParams, UndistortMapType, defaultParams
+from preprocessor.processing.parallel import run_in_processes
+from preprocessor.processing.undistort import scale_camera_matrix, undistort_image
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DetectJob:
+    """
+    A single photo to detect the quadrat in.
+
+    This only holds plain data (no Qt objects), so that it can be sent to a worker process.
+    """
+
+    index: int
+    """The 0-based index of the photo in the project."""
+    source_path: Path
+    """The absolute path to the original photo."""
+    camera_matrix: Matrix3x3 | None
+    """The camera matrix, or None to skip undistortion."""
+    distortion_coefficients: tuple[float, ...] | None
+    """The distortion coefficients, or None to skip undistortion."""
+    undistort_map_type: UndistortMapType
+    """The representation of the remap tables used for undistortion."""
+    params: QuadratDetectionParams
+    """The quadrat detection parameters."""
+
+
+@dataclass(frozen=True)
+class DetectResult:
+    """The result of detecting the quadrat in a single photo."""
+
+    job: DetectJob
+    """The job that was run."""
+    corners: tuple[Point2, ...] | None
+    """The detected corners, clockwise from the top-left; or None if no quadrat was found."""
+    message: str | None = None
+    """A message to report to the user, if any."""
+    elapsed: float = 0.0
+    """The time it took to detect the quadrat, in seconds."""
+
+    @property
+    def ok(self) -> bool:
+        """Whether the quadrat was found."""
+        return self.corners is not None
+
+
+def create_detect_jobs(
+    project: ProjectModel,
+    params: QuadratDetectionParams = defaultParams,
+    only_missing: bool = False,
+) -> list[DetectJob]:
+    """
+    Create a detection job for each photo in the project.
+
+    With `only_missing`, photos that already have their quadrat corners set are skipped.
+    """
+    jobs: list[DetectJob] = []
+    for idx, photo in enumerate(project.photos):
+        if only_missing and photo.quadrat_corners:
+            continue
+        jobs.append(
+            DetectJob(
+                index=idx,
+                source_path=project.get_absolute_path(photo.original_filename),
+                camera_matrix=photo.camera_matrix,
+                distortion_coefficients=tuple(photo.distortion_coefficients)
+                if photo.distortion_coefficients is not None
+                else None,
+                undistort_map_type=project.undistort_map_type,
+                params=params,
+            )
+        )
+    return jobs
+
+
+def detect_photo(job: DetectJob) -> DetectResult:
+    """
+    Detect the quadrat in a single photo.
+
+    The quadrat is detected in the undistorted photo, since that is what the quadrat corners refer to.
+    This function does not touch any Qt objects, so it can be run in a worker process.
+    It never raises; any failure is reported in the returned result.
+    """
+    start = time.perf_counter()
+    corners, message = _detect_photo_corners(job)
+    return DetectResult(job, corners, message, elapsed=time.perf_counter() - start)
+
+
+def _detect_photo_corners(job: DetectJob) -> tuple[tuple[Point2, ...] | None, str | None]:
+    """Detect the quadrat in a single photo; returns the corners or a message describing the failure."""
+    try:
+        # Detection downscales the photo anyway, so decode no more of the photo than it needs
+        reduction = 1
+        image_size = read_image_size(job.source_path)
+        if job.params.downscale.enabled and image_size is not None:
+            reduction = reduction_for_size(*image_size, job.params.downscale.max_size)
+        img = load_image(str(job.source_path), reduction)
+        if img is None:
+            return None, f"Failed to load image: {job.source_path}"
+
+        # Without distortion, the undistorted photo is the original photo
+        if job.camera_matrix is not None and job.distortion_coefficients and any(job.distortion_coefficients):
+            undistorted = undistort_image(
+                img,
+                scale_camera_matrix(job.camera_matrix, 1.0 / reduction),
+                job.distortion_coefficients,
+                map_type=job.undistort_map_type,
+            )
+            if undistorted is None:
+                return None, f"Failed to undistort image: {job.source_path}"
+            img = undistorted
+
+        result = detect_quadrat(img, job.params, draw_debug=False)
+        if result is None or not result.corners or len(result.corners) != 4:
+            return None, f"No quadrat found in {job.source_path.name}."
+        # Scale the corners back to the full-size photo
+        return tuple((float(x) * reduction, float(y) * reduction) for x, y in result.corners), None
+    except Exception as e:
+        logger.exception("Unexpected error detecting the quadrat in photo %d", job.index)
+        return None, f"Unexpected error for {job.source_path.name}: {e}"
+
+
+def detect_photos(
+    jobs: list[DetectJob],
+    max_workers: int | None = None,
+    stop_checker: Callable[[], bool] | None = None,
+) -> Iterator[DetectResult]:
+    """
+    Detect the quadrat in the photos on a pool of worker processes.
+
+    Yields the result of each job as soon as it finishes, so results may arrive out of order.
+    See `run_in_processes` for the meaning of `max_workers` and `stop_checker`.
+    """
+    for _job, result in run_in_processes(detect_photo, jobs, max_workers=max_workers, stop_checker=stop_checker):
+        yield result
@@ -1,11 +1,13 @@
 import logging
 import math
+import threading
+from collections.abc import Callable, Hashable
 from dataclasses import dataclass
+from typing import Any
 
 import cv2
 import numpy as np
 from cv2.typing import MatLike, Point2f
-from sklearn.cluster import KMeans
 
 from preprocessor.processing.params import (
     QuadratDetectionParams,
@@ -37,37 +39,153 @@ class QuadratDetectionResult:
 def detect_quadrat(
     original_img: MatLike,
     params: QuadratDetectionParams,
-) -> QuadratDetectionResult:
-    """Process the image and return it."""
-    if params.downscale.enabled:
-        original_img, scale = _downscale_image(original_img, params.downscale)
-    else:
-        scale = 1.0
+    stop_checker: Callable[[], bool] | None = None,
+    draw_debug: bool = True,
+) -> QuadratDetectionResult | None:
+    """Process the image and return it.
+
+    If ``stop_checker`` is provided it will be called between the processing steps; if it returns True
+    the detection will be aborted and None returned.
+    If ``draw_debug`` is False, no debug image is drawn, and the result's ``debug`` is None;
+    pass False when the debug image is not shown.
+    To detect the quadrat in the same image repeatedly, such as while tuning the parameters, use a `QuadratDetector`.
+    """
+    return QuadratDetector().detect(original_img, params, stop_checker, draw_debug)
+
+
+class QuadratDetector:
+    """
+    Detects the quadrat, caching the output of each processing stage.
+
+    The output of a stage is cached by the key of its input (the output of the previous stage) and its parameters.
+    When detecting again in the same image with only the parameters of a later stage changed,
+    such as the Hough threshold, the cached output of the earlier stages (downscale, blur, thresholding, Canny)
+    is reused. Only the most recent output of each stage is kept.
+
+    The input image is identified by the object, not by its contents, so it must not be modified in-place
+    while it is in use. The cached images are shared with the returned results, so they must not be modified either.
+    This class is thread-safe; stages are computed without holding the lock.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._image: MatLike | None = None
+        """The most recent input image; referenced to ensure its identity stays unique."""
+        self._image_generation = 0
+        """Incremented whenever the input image changes."""
+        self._cache: dict[str, tuple[Hashable, Any]] = {}
+        """The key and output of each stage, by stage name."""
+
+    def clear(self) -> None:
+        """Clear the cache, and release the input image."""
+        with self._lock:
+            self._image = None
+            self._cache.clear()
+
+    def detect(
+        self,
+        original_img: MatLike,
+        params: QuadratDetectionParams,
+        stop_checker: Callable[[], bool] | None = None,
+        draw_debug: bool = True,
+    ) -> QuadratDetectionResult | None:
+        """Detect the quadrat; see `detect_quadrat`."""
+        key = self._image_key(original_img)
+
+        key, (original_img, scale) = self._stage(
+            "downscale",
+            key,
+            params.downscale,
+            lambda: (
+                _downscale_image(original_img, params.downscale) if params.downscale.enabled else (original_img, 1.0)
+            ),
+        )
+        key, img = self._stage("grayscale", key, None, lambda: _grayscale_image(original_img))
+        key, img = self._stage(
+            "blur", key, params.blur, lambda: _blur_image(img, params.blur) if params.blur.enabled else img
+        )
+        key, img = self._stage(
+            "thresholding",
+            key,
+            params.thresholding,
+            lambda: (
+                _threshold_image(img, params.thresholding)
+                if params.thresholding.method != ThresholdingMethod.NONE
+                else img
+            ),
+        )
+        key, img = self._stage(
+            "canny", key, params.canny, lambda: _canny_image(img, params.canny) if params.canny.enabled else img
+        )
+
+        if stop_checker is not None and stop_checker():
+            return None
+
+        def hough() -> tuple[MatLike | None, list[Line]]:
+            # Create copy of processed image
+            debug_img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR) if draw_debug else None
+            if not params.hough.enabled:
+                return debug_img, []
+            return debug_img, _hough(img, params.hough, debug_img)
+
+        # Whether the debug image is drawn is part of the key, so that a cached output without it is not reused
+        key, (debug_img, lines) = self._stage("hough", key, (params.hough, draw_debug), hough)
 
-    img = _grayscale_image(original_img)
+        if stop_checker is not None and stop_checker():
+            return None
 
-    if params.blur.enabled:
-        img = _blur_image(img, params.blur)
+        def find_corners() -> tuple[MatLike | None, list[Point2f]]:
+            if not params.hough.enabled:
+                return debug_img, []
+            corners_debug_img = debug_img.copy() if debug_img is not None else None
+            height, width = img.shape[:2]
+            corners = _find_corners(lines, width, height, scale, corners_debug_img)
+            logger.debug(f"Detected corners: {corners}")
+            return corners_debug_img, corners
 
-    if params.thresholding.method != ThresholdingMethod.NONE:
-        img = _threshold_image(img, params.thresholding)
+        key, (debug_img, corners) = self._stage("corners", key, None, find_corners)
 
-    if params.canny.enabled:
-        img = _canny_image(img, params.canny)
+        if stop_checker is not None and stop_checker():
+            return None
 
-    # Create copy of processed image
-    debug_img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        key, debug_img = self._stage(
+            "find_contour",
+            key,
+            params.find_contour,
+            lambda: (
+                _find_contours(img, debug_img.copy(), params.find_contour)
+                if params.find_contour.enabled and debug_img is not None
+                else debug_img
+            ),
+        )
 
-    corners: list[Point2f] = []
-    if params.hough.enabled:
-        (debug_img, lines) = _hough(img, debug_img, params.hough)
-        corners = _find_corners(lines, debug_img, scale)
-        logger.debug(f"Detected corners: {corners}")
+        return QuadratDetectionResult(original_img, img, original_img, debug_img, scale, list(corners))
 
-    if params.find_contour.enabled:
-        debug_img = _find_contours(img, debug_img, params.find_contour)
+    def _image_key(self, img: MatLike) -> Hashable:
+        """Return the cache key of the input image."""
+        with self._lock:
+            if img is not self._image:
+                self._image = img
+                self._image_generation += 1
+            return self._image_generation
 
-    return QuadratDetectionResult(original_img, img, original_img, debug_img, scale, corners)
+    def _stage[T](self, name: str, input_key: Hashable, params: object, compute: Callable[[], T]) -> tuple[Hashable, T]:
+        """
+        Return the key and output of the stage, computing the output if it is not cached.
+
+        The key of the output is derived from the key of the input and the parameters of the stage.
+        """
+        key = (input_key, name, repr(params))
+        with self._lock:
+            cached = self._cache.get(name)
+        if cached is not None and cached[0] == key:
+            logger.debug(f"Reusing cached {name} stage.")
+            return key, cached[1]
+
+        output = compute()
+        with self._lock:
+            self._cache[name] = (key, output)
+        return key, output
 
 
 def _downscale_image(img: MatLike, params: DownscaleParams) -> tuple[MatLike, float]:
@@ -166,8 +284,8 @@ class Line:
     theta: float  # radians
 
 
-def _hough(img: MatLike, debug_img: MatLike, params: HoughParams) -> tuple[MatLike, list[Line]]:
-    """Apply Hough Transform to detect lines in the image."""
+def _hough(img: MatLike, params: HoughParams, debug_img: MatLike | None = None) -> list[Line]:
+    """Apply Hough Transform to detect lines in the image, drawing them on the debug image if one is given."""
     logger.debug("Applying Hough Transform...")
 
     result: list[Line] = []
@@ -187,9 +305,8 @@ def _hough(img: MatLike, debug_img: MatLike, params: HoughParams) -> tuple[MatLi
             logger.debug(f"Found {len(lines)} lines.")
             for i in range(len(lines)):
                 x1, y1, x2, y2 = lines[i][0]
-                pt1 = (x1, y1)
-                pt2 = (x2, y2)
-                cv2.line(debug_img, pt1, pt2, (0, 255, 0), 1, cv2.LINE_AA)
+                if debug_img is not None:
+                    cv2.line(debug_img, (x1, y1), (x2, y2), (0, 255, 0), 1, cv2.LINE_AA)
                 # Convert to (rho, theta)
                 a = x2 - x1
                 b = y2 - y1
@@ -215,63 +332,33 @@ def _hough(img: MatLike, debug_img: MatLike, params: HoughParams) -> tuple[MatLi
                 rho = lines[i][0][0]
                 theta = lines[i][0][1]
                 result.append(Line(rho, theta))
-                a = math.cos(theta)
-                b = math.sin(theta)
-                x0 = a * rho
-                y0 = b * rho
-                pt1 = (int(x0 + 1000 * (-b)), int(y0 + 1000 * a))
-                pt2 = (int(x0 - 1000 * (-b)), int(y0 - 1000 * a))
-                cv2.line(debug_img, pt1, pt2, (0, 0, 255), 1, cv2.LINE_AA)
+                if debug_img is not None:
+                    a = math.cos(theta)
+                    b = math.sin(theta)
+                    x0 = a * rho
+                    y0 = b * rho
+                    pt1 = (int(x0 + 1000 * (-b)), int(y0 + 1000 * a))
+                    pt2 = (int(x0 - 1000 * (-b)), int(y0 - 1000 * a))
+                    cv2.line(debug_img, pt1, pt2, (0, 0, 255), 1, cv2.LINE_AA)
         else:
             logger.debug("No lines found.")
 
-    return (debug_img, result)
+    return result
 
 
-def _find_corners(lines: list[Line], debug_img: MatLike, scale: float = 1.0, draw_debug: bool = True) -> list[Point2f]:
-    """Find corners from the detected lines."""
+def _find_corners(
+    lines: list[Line], width: int, height: int, scale: float = 1.0, debug_img: MatLike | None = None
+) -> list[Point2f]:
+    """Find corners from the detected lines in an image of the given size, drawing them on the debug image if given."""
     logger.debug("Finding corners from lines...")
-    corners: list[Point2f] = []
-    angle_threshold = math.radians(20)  # minimum angle difference to consider lines non-parallel
-    height, width = debug_img.shape[:2]
-
-    def intersection(line1: Line, line2: Line) -> tuple[int, int] | None:
-        # Solve for intersection of two lines in (rho, theta) form
-        # Line: x*cos(theta) + y*sin(theta) = rho
-        a1, b1, c1 = math.cos(line1.theta), math.sin(line1.theta), line1.rho
-        a2, b2, c2 = math.cos(line2.theta), math.sin(line2.theta), line2.rho
-        det = a1 * b2 - a2 * b1
-        if abs(det) < 1e-10:
-            return None
-        x = (b2 * c1 - b1 * c2) / det
-        y = (a1 * c2 - a2 * c1) / det
-        return round(x), round(y)
-
-    def angle_difference(theta1: float, theta2: float) -> float:
-        a = theta1 % math.pi
-        b = theta2 % math.pi
-        diff = abs(a - b)
-        return min(diff, math.pi - diff)
-
-    for i in range(len(lines)):
-        for j in range(i + 1, len(lines)):
-            theta1 = lines[i].theta
-            theta2 = lines[j].theta
-            angle_diff = angle_difference(theta1, theta2)
-            if angle_diff < angle_threshold:
-                continue  # skip nearly parallel lines
-            pt = intersection(lines[i], lines[j])
-            if pt is not None:
-                x, y = pt
-                if 0 <= x < width and 0 <= y < height:
-                    corners.append(pt)
-                    cv2.circle(debug_img, pt, 2, (255, 0, 0, 255), -1)
-    logger.debug(f"Found {len(corners)} candidate corners.")
-    if not corners:
+    points = _line_intersections(lines, width, height)  # shape (N,2)
+    if debug_img is not None:
+        for x, y in points:
+            cv2.circle(debug_img, (int(x), int(y)), 2, (255, 0, 0, 255), -1)
+    logger.debug(f"Found {len(points)} candidate corners.")
+    if len(points) == 0:
         return []
 
-    points = np.array(corners)  # shape (N,2)
-
     # Compute the centroid of the corners
     centroid = points.mean(axis=0)
 
@@ -280,9 +367,10 @@ def _find_corners(lines: list[Line], debug_img: MatLike, scale: float = 1.0, dra
     angles = np.arctan2(vecs[:, 1], vecs[:, 0])  # range [-pi, pi]
 
     # Cluster by angles into 4 quadrants
-    circle_coords = np.column_stack([np.cos(angles), np.sin(angles)])
-    kmeans = KMeans(n_clusters=4, n_init="auto").fit(circle_coords)
-    labels = kmeans.labels_
+    labels = _cluster_angles(angles, 4)
+    if labels is None:
+        logger.debug("Could not find 4 distinct corners.")
+        return []
 
     # For each cluster, pick the points closes to the centroid
     corner_points = []
@@ -309,13 +397,14 @@ def _find_corners(lines: list[Line], debug_img: MatLike, scale: float = 1.0, dra
     bl, br = bottom[bottom[:, 0].argsort()]
     ordered_corners = np.array([tl, tr, br, bl])  # Clockwise from the top-left
 
-    for c in ordered_corners:
-        cv2.circle(debug_img, (c[0], c[1]), 2, (0, 255, 0, 255), -1)
+    if debug_img is not None:
+        for c in ordered_corners:
+            cv2.circle(debug_img, (c[0], c[1]), 2, (0, 255, 0, 255), -1)
 
     def to_tuple(p: np.ndarray) -> tuple[int, int]:
         return int(p[0]), int(p[1])
 
-    if draw_debug and len(ordered_corners) > 1:
+    if debug_img is not None and len(ordered_corners) > 1:
         for i in range(len(ordered_corners)):
             pt1 = (int(ordered_corners[i][0]), int(ordered_corners[i][1]))
             pt2 = (int(ordered_corners[(i + 1) % 4][0]), int(ordered_corners[(i + 1) % 4][1]))
@@ -327,6 +416,71 @@ def _find_corners(lines: list[Line], debug_img: MatLike, scale: float = 1.0, dra
     return list(map(to_tuple, unscaled_corners))
 
 
+def _line_intersections(lines: list[Line], width: int, height: int) -> np.ndarray:
+    """
+    Return the intersections of all pairs of non-parallel lines that lie within the image, as an (N, 2) int array.
+
+    The intersections are in the order of the line pairs `(i, j)` with `i < j`.
+    """
+    angle_threshold = math.radians(20)  # minimum angle difference to consider lines non-parallel
+    if len(lines) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # NOTE: This computes the same values, in the same precision, as solving each pair with scalar math:
+    # the sines and cosines are computed with `math` in double precision,
+    # but arithmetic with `rho` and `theta` is done in their own precision (float32 for HoughLines).
+    rho = np.array([line.rho for line in lines])
+    theta = np.array([line.theta for line in lines])
+    cos = np.array([math.cos(line.theta) for line in lines])
+    sin = np.array([math.sin(line.theta) for line in lines])
+    i, j = np.triu_indices(len(lines), k=1)
+
+    # Skip nearly parallel lines
+    pi = theta.dtype.type(math.pi)
+    wrapped = theta % pi
+    angle_diff = np.abs(wrapped[i] - wrapped[j])
+    angle_diff = np.minimum(angle_diff, pi - angle_diff)
+    keep = angle_diff >= theta.dtype.type(angle_threshold)
+    i, j = i[keep], j[keep]
+
+    # Solve for intersection of two lines in (rho, theta) form
+    # Line: x*cos(theta) + y*sin(theta) = rho
+    det = cos[i] * sin[j] - cos[j] * sin[i]
+    keep = np.abs(det) >= 1e-10
+    i, j, det = i[keep], j[keep], det[keep].astype(rho.dtype)
+    cos, sin = cos.astype(rho.dtype), sin.astype(rho.dtype)
+    with np.errstate(over="ignore"):
+        x = np.rint((sin[j] * rho[i] - sin[i] * rho[j]) / det)
+        y = np.rint((cos[i] * rho[j] - cos[j] * rho[i]) / det)
+
+    inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+    return np.column_stack([x[inside], y[inside]]).astype(np.int64)
+
+
+def _cluster_angles(angles: np.ndarray, n_clusters: int) -> np.ndarray | None:
+    """
+    Cluster the angles (in radians) into `n_clusters` arcs of the circle, and return the cluster label of each angle.
+
+    The angles are split at the `n_clusters` largest gaps between consecutive angles around the circle.
+    Unlike k-means, this is deterministic, and it needs no more than a sort.
+    Returns None if there are fewer than `n_clusters` distinct angles.
+    """
+    order = np.argsort(angles, kind="stable")
+    sorted_angles = angles[order]
+    # The gap after each angle, up to the next angle around the circle
+    gaps = np.empty_like(sorted_angles)
+    gaps[:-1] = np.diff(sorted_angles)
+    gaps[-1] = sorted_angles[0] + 2 * math.pi - sorted_angles[-1]
+    if np.count_nonzero(gaps > 0) < n_clusters:
+        return None
+
+    # Each cut ends a cluster; the angles after the last cut wrap around to the first cluster
+    cuts = np.sort(np.argsort(-gaps, kind="stable")[:n_clusters])
+    labels = np.empty(len(angles), dtype=np.intp)
+    labels[order] = np.searchsorted(cuts, np.arange(len(angles))) % n_clusters
+    return labels
+
+
 def _find_contours(img: MatLike, debug_img: MatLike, params: FindContourParams) -> MatLike:
     """Find contours in the image."""
     logger.debug("Finding contours...")
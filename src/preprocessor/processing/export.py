@@ -0,0 +1,175 @@
+import logging
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from preprocessor.model import Matrix3x3, Point2
+from preprocessor.model.photo_model import PhotoModel
+from preprocessor.model.project_model import ProjectModel
+from preprocessor.processing.fix_perspective import fix_perspective, undistort_and_fix_perspective
+from preprocessor.processing.load_image import load_image
+from preprocessor.processing.params import UndistortMapType
+from preprocessor.processing.parallel import run_in_processes
+from preprocessor.processing.save_image import save_image
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ExportJob:
+    """
+    A single photo to export.
+
+    This only holds plain data (no Qt objects), so that it can be sent to a worker process.
+    """
+
+    index: int
+    """The 1-based index of the photo in the project."""
+    output_name: str
+    """The filename of the exported photo."""
+    source_path: Path
+    """The absolute path to the original photo."""
+    output_path: Path
+    """The absolute path to write the exported photo to."""
+    quadrat_corners: tuple[Point2, ...]
+    """The corners of the quadrat, clockwise from the top-left."""
+    camera_matrix: Matrix3x3 | None
+    """The camera matrix, or None to skip undistortion."""
+    distortion_coefficients: tuple[float, ...] | None
+    """The distortion coefficients, or None to skip undistortion."""
+    undistort_map_type: UndistortMapType
+    """The representation of the remap tables used for undistortion."""
+    target_width: int | None
+    """The width of the exported photo, in pixels."""
+    target_height: int | None
+    """The height of the exported photo, in pixels."""
+    quality: int = 95
+    """The JPEG quality, 0-100."""
+
+
+@dataclass(frozen=True)
+class ExportResult:
+    """The result of exporting a single photo."""
+
+    job: ExportJob
+    """The job that was run."""
+    ok: bool
+    """Whether the photo was exported."""
+    severity: str = "info"
+    """The severity of the message: 'error' | 'warning' | 'info'."""
+    message: str | None = None
+    """A message to report to the user, if any."""
+
+
+def determine_output_name(project: ProjectModel, photo: PhotoModel, index: int) -> str:
+    """Determine the filename of the exported photo from the project metadata."""
+    extension = Path(photo.original_filename).suffix.lower()
+    parts = [
+        project.metadata_group,
+        project.metadata_area,
+        project.metadata_site,
+        # year
+        project.metadata_season,
+        project.metadata_depth,
+        project.metadata_transect,
+        # date
+        f"{index:04d}",
+    ]
+    newname = "_".join([x for x in parts if x])
+    return newname + extension
+
+
+def create_export_jobs(project: ProjectModel, quality: int = 95) -> list[ExportJob]:
+    """Create an export job for each photo in the project."""
+    assert project.export_path is not None, "Export path must be set before creating export jobs"
+
+    jobs: list[ExportJob] = []
+    for idx, photo in enumerate(project.photos, start=1):
+        output_name = determine_output_name(project, photo, idx)
+        jobs.append(
+            ExportJob(
+                index=idx,
+                output_name=output_name,
+                source_path=project.get_absolute_path(photo.original_filename),
+                output_path=project.export_path / output_name,
+                quadrat_corners=tuple(photo.quadrat_corners or ()),
+                camera_matrix=photo.camera_matrix,
+                distortion_coefficients=tuple(photo.distortion_coefficients)
+                if photo.distortion_coefficients is not None
+                else None,
+                undistort_map_type=project.undistort_map_type,
+                target_width=project.target_width,
+                target_height=project.target_height,
+                quality=quality,
+            )
+        )
+    return jobs
+
+
+def export_photo(job: ExportJob) -> ExportResult:
+    """
+    Export a single photo: load, undistort, fix the perspective, and save it.
+
+    This function does not touch any Qt objects, so it can be run in a worker process.
+    It never raises; any failure is reported in the returned result.
+    """
+    try:
+        # Ensure quadrat corners are set
+        if not job.quadrat_corners:
+            return ExportResult(job, False, "warning", f"Skipping {job.output_name}: quadrat corners not set.")
+
+        # Ensure target sizes are present
+        if job.target_width is None or job.target_height is None:
+            return ExportResult(job, False, "error", "Target width/height not set for export.")
+
+        img = load_image(str(job.source_path))
+        if img is None:
+            return ExportResult(job, False, "warning", f"Failed to load image: {job.source_path}")
+
+        # Process perspective; guard against processing errors
+        try:
+            if job.camera_matrix is not None and job.distortion_coefficients is not None:
+                # Undistort and fix the perspective in one pass, straight from the original image
+                final_img = undistort_and_fix_perspective(
+                    img,
+                    job.camera_matrix,
+                    job.distortion_coefficients,
+                    list(job.quadrat_corners),
+                    job.target_width,
+                    job.target_height,
+                    map_type=job.undistort_map_type,
+                )
+            else:
+                final_img = fix_perspective(
+                    img,
+                    list(job.quadrat_corners),
+                    job.target_width,
+                    job.target_height,
+                )
+        except Exception as e:
+            return ExportResult(job, False, "error", f"Processing failed for {job.output_name}: {e}")
+
+        # Save result
+        if not save_image(job.output_path, final_img, quality=job.quality):
+            return ExportResult(job, False, "error", f"Failed to save image to {job.output_path}")
+
+        return ExportResult(job, True)
+    except Exception as e:
+        # Catch-all per-photo to avoid aborting the entire export
+        logger.exception("Unexpected error exporting photo %d", job.index)
+        return ExportResult(job, False, "error", f"Unexpected error for photo {job.index}: {e}")
+
+
+def export_photos(
+    jobs: list[ExportJob],
+    max_workers: int | None = None,
+    stop_checker: Callable[[], bool] | None = None,
+) -> Iterator[ExportResult]:
+    """
+    Export the photos on a pool of worker processes.
+
+    Yields the result of each job as soon as it finishes, so results may arrive out of order.
+    See `run_in_processes` for the meaning of `max_workers` and `stop_checker`.
+    """
+    for _job, result in run_in_processes(export_photo, jobs, max_workers=max_workers, stop_checker=stop_checker):
+        yield result
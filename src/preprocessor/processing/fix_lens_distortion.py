@@ -10,16 +10,15 @@ def undistort(
 ) -> MatLike:
     """Correct lens distortion in the given image using the specified parameters."""
     import cv2
-    import numpy as np
+
+    from preprocessor.processing.undistort import undistort_maps
 
     h, w = img.shape[:2]
-    np_camera_matrix = np.array(camera_matrix, dtype=np.float32)
-    np_dist_coeffs = np.array(dist_coeffs, dtype=np.float32)
 
-    # Compute the optimal new camera matrix to minimize distortion
-    new_camera_matrix, _ = cv2.getOptimalNewCameraMatrix(np_camera_matrix, np_dist_coeffs, (w, h), 1)
+    # Use the (cached) remap tables for the optimal new camera matrix, which minimizes distortion
+    map1, map2 = undistort_maps(camera_matrix, dist_coeffs, w, h)
 
-    # Undistort the image using the computed camera matrix and distortion coefficients
-    undistorted_img = cv2.undistort(img, np_camera_matrix, np_dist_coeffs, None, new_camera_matrix)
+    # Undistort the image using the computed maps
+    undistorted_img = cv2.remap(img, map1, map2, interpolation=cv2.INTER_LINEAR)
 
     return undistorted_img
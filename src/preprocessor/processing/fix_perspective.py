@@ -1,9 +1,14 @@
 import logging
+from collections.abc import Sequence
 
 import cv2
 import numpy as np
 from cv2.typing import MatLike, Point2f
 
+from preprocessor.model import Matrix3x3
+from preprocessor.processing.params import UndistortMapType
+from preprocessor.processing.undistort import undistorted_camera_matrix
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,19 +32,79 @@ def fix_perspective(
     #     + (src_pts[2][1] - src_pts[1][1]) * (src_pts[2][1] - src_pts[1][1])
     # )
     # tgt_width = ratio * tgt_height
-    src_pts2 = np.float32(src_pts)
+    M = perspective_transform(src_pts, tgt_width, tgt_height)
+
+    dst = cv2.warpPerspective(img, M, (tgt_width, tgt_height))
+
+    return dst
+
+
+def undistort_and_fix_perspective(
+    img: MatLike,
+    camera_matrix: Matrix3x3,
+    distortion_coefficients: Sequence[float],
+    src_pts: list[Point2f],
+    tgt_width: int,
+    tgt_height: int,
+    map_type: UndistortMapType = UndistortMapType.FLOAT,
+) -> MatLike:
+    """Correct lens distortion and apply a perspective transformation in a single resampling pass.
+
+    This gives the same result as `undistort_image` followed by `fix_perspective`
+    (up to interpolation differences), but it only computes the remap tables for the target grid
+    and samples the original image directly, without creating an undistorted full-size copy of the image.
+    This makes it much faster and uses much less memory when the target image is smaller than the original.
+
+    Args:
+        img: The original (distorted) input image.
+        camera_matrix: The camera matrix of the original image.
+        distortion_coefficients: The distortion coefficients of the original image.
+        src_pts: A list of four points defining the source quadrilateral in the undistorted image
+            (clockwise from the top-left).
+        tgt_width: The width of the target image, in pixels.
+        tgt_height: The height of the target image, in pixels.
+        map_type: The representation of the remap tables.
+    """
+    h, w = img.shape[:2]
+    M = perspective_transform(src_pts, tgt_width, tgt_height)
+    new_camera_matrix = undistorted_camera_matrix(camera_matrix, distortion_coefficients, w, h)
+
+    # A target pixel maps back to the undistorted image through inv(M), and from there to normalized
+    # camera coordinates through inv(new_camera_matrix). initUndistortRectifyMap() inverts the product
+    # of its "new camera matrix" and rotation, so passing M @ new_camera_matrix gives exactly that chain,
+    # followed by the lens-distortion model to find the pixel in the original image.
+    map1, map2 = cv2.initUndistortRectifyMap(
+        np.array(camera_matrix, dtype=np.float32),
+        np.array(distortion_coefficients, dtype=np.float32),
+        np.eye(3),
+        np.asarray(M @ new_camera_matrix, dtype=np.float64),
+        (tgt_width, tgt_height),
+        cv2.CV_32FC1,
+    )
+    if map_type == UndistortMapType.FIXED_POINT:
+        map1, map2 = cv2.convertMaps(map1, map2, cv2.CV_16SC2)
+
+    return cv2.remap(img, map1, map2, interpolation=cv2.INTER_LINEAR)
+
+
+def perspective_transform(src_pts: list[Point2f], tgt_width: int, tgt_height: int) -> MatLike:
+    """Return the 3x3 homography that maps the source quadrilateral onto the target rectangle.
+
+    Args:
+        src_pts: A list of four points defining the source quadrilateral
+            (top-left, top-right, bottom-right, bottom-left) (clockwise from the top-left).
+        tgt_width: The width of the target image, in pixels.
+        tgt_height: The height of the target image, in pixels.
+    """
+    src_pts2 = np.array(src_pts, dtype=np.float32)
     src_pts3 = src_pts2[[0, 1, 3, 2]]  # rearrange to tl, tr, bl, br
     # fmt: off
-    tgt_pts = np.float32([
+    tgt_pts = np.array([
         [      0.0,        0.0],  # top-left
         [tgt_width,        0.0],  # top-right
         [      0.0, tgt_height],  # bottom-left
         [tgt_width, tgt_height],  # bottom-right
-    ])
+    ], dtype=np.float32)
     # fmt: on
 
-    M = cv2.getPerspectiveTransform(src_pts3, tgt_pts)
-
-    dst = cv2.warpPerspective(img, M, (tgt_width, tgt_height))
-
-    return dst
+    return cv2.getPerspectiveTransform(src_pts3, tgt_pts)
@@ -0,0 +1,92 @@
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from cv2.typing import MatLike
+
+from preprocessor.processing.load_image import load_image
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    refs: int
+    """The number of holders of the image."""
+    img: MatLike | None = None
+    """The decoded image; or None if it failed to load, or is still being decoded."""
+    error: BaseException | None = None
+    """The exception raised while decoding the image, if any."""
+    loaded: threading.Event = field(default_factory=threading.Event)
+    """Set once the image has been decoded (or failed to)."""
+
+
+class ImageCache:
+    """
+    A reference-counted cache of decoded photos, so that each photo is decoded only once while it is in use.
+
+    Every call to `acquire` must be matched by a call to `release`, also when it returned None;
+    but not when it raised, as the image is then dropped from the cache for all its holders.
+    An image is dropped from the cache when it is no longer held.
+    The cached images are shared, so they are read-only.
+    This class is thread-safe; an image that is being decoded by one thread is waited for by the others.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[Path, _Entry] = {}
+
+    def acquire(self, path: Path) -> MatLike | None:
+        """Return the decoded image at the given path, decoding it if it is not cached; or None if it failed to load."""
+        path = path.resolve()
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None:
+                cached.refs += 1
+            else:
+                entry = self._entries[path] = _Entry(refs=1)
+        if cached is not None:
+            # The image is decoded by whoever acquired it first
+            cached.loaded.wait()
+            if cached.error is not None:
+                raise cached.error
+            return cached.img
+
+        try:
+            img = load_image(str(path))
+        except BaseException as e:
+            entry.error = e
+            with self._lock:
+                del self._entries[path]
+            raise
+        else:
+            if img is None:
+                logger.error(f"Failed to load image {path}")
+            else:
+                img.flags.writeable = False
+            entry.img = img
+        finally:
+            entry.loaded.set()
+        return img
+
+    def release(self, path: Path) -> None:
+        """Release the image at the given path, dropping it from the cache if it is no longer held."""
+        path = path.resolve()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None:
+                msg = f"Image was not acquired: {path}"
+                raise KeyError(msg)
+            entry.refs -= 1
+            if entry.refs == 0:
+                del self._entries[path]
+
+    def __len__(self) -> int:
+        """The number of images in the cache."""
+        with self._lock:
+            return len(self._entries)
+
+
+shared_image_cache = ImageCache()
+"""The image cache shared by the GUI."""
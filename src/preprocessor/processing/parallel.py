@@ -0,0 +1,64 @@
+import logging
+import multiprocessing
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_count() -> int:
+    """Return the default number of worker processes, which is the number of CPU cores available to us."""
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        # Not available on macOS and Windows
+        return max(1, os.cpu_count() or 1)
+
+
+def run_in_processes[J, R](
+    fn: Callable[[J], R],
+    jobs: Iterable[J],
+    max_workers: int | None = None,
+    stop_checker: Callable[[], bool] | None = None,
+    poll_interval: float = 0.1,
+) -> Iterator[tuple[J, R]]:
+    """
+    Run `fn` for each of the jobs on a pool of worker processes.
+
+    Yields `(job, result)` pairs in the order in which the jobs finish, which is not necessarily the order
+    in which they were given. The function and the jobs must be picklable,
+    so they should be module-level functions and plain data (not Qt objects).
+    If `fn` raises an exception, it is re-raised from the iterator.
+
+    If `stop_checker` is provided it is called every `poll_interval` seconds; once it returns True,
+    all jobs that have not started yet are canceled and the iterator stops.
+    Jobs that are already running in a worker process are allowed to finish, but their results are discarded.
+
+    With `max_workers=1` the jobs are run one by one in the calling process, which avoids the overhead of
+    starting a worker process and makes debugging easier.
+    """
+    workers = max_workers if max_workers is not None else default_worker_count()
+    if workers <= 1:
+        for job in jobs:
+            if stop_checker is not None and stop_checker():
+                return
+            yield job, fn(job)
+        return
+
+    # Use 'spawn' rather than 'fork': forking a process that runs Qt (or any other) threads is unsafe.
+    context = multiprocessing.get_context("spawn")
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    try:
+        futures: dict[Future[R], J] = {executor.submit(fn, job): job for job in jobs}
+        logger.debug(f"Submitted {len(futures)} jobs to {workers} worker processes.")
+        pending: set[Future[R]] = set(futures)
+        while pending:
+            if stop_checker is not None and stop_checker():
+                logger.info("Stop requested, canceling %d pending jobs.", len(pending))
+                return
+            done, pending = wait(pending, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield futures[future], future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
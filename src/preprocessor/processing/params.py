@@ -34,6 +34,23 @@ class ContourApproximationMethod(Enum):
         raise NotImplementedError(msg)
 
 
+class UndistortMapType(Enum):
+    """The representation of the remap tables used for undistortion."""
+
+    FLOAT = "Float"
+    """A pair of `CV_32FC1` maps: exact, but large and slower to remap."""
+    FIXED_POINT = "Fixed-point"
+    """A `CV_16SC2` + `CV_16UC1` map pair: a quarter less memory and faster to remap, at 1/32 pixel precision."""
+
+    @staticmethod
+    def from_string(type_name: str) -> "UndistortMapType":
+        for map_type in UndistortMapType:
+            if map_type.value == type_name:
+                return map_type
+        msg = f"Unknown UndistortMapType: {type_name}"
+        raise NotImplementedError(msg)
+
+
 @dataclass
 class DownscaleParams:
     enabled: bool
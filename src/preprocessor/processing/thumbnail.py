@@ -0,0 +1,71 @@
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+import cv2
+
+from preprocessor.processing.load_image import load_image, read_image_size, reduction_for_size
+from preprocessor.processing.save_image import save_image
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = 120
+"""The maximum width and height of a thumbnail, in pixels."""
+
+
+def thumbnail_cache_key(path: Path, size: int = THUMBNAIL_SIZE) -> str:
+    """
+    Return the key of the cached thumbnail for the photo at the given path.
+
+    The key is derived from the absolute path, modification time, and file size of the photo,
+    so a thumbnail is regenerated when the photo changes.
+    Raises OSError if the photo does not exist.
+    """
+    st = path.stat()
+    identity = f"{path.resolve()}\0{st.st_mtime_ns}\0{st.st_size}\0{size}"
+    return hashlib.sha1(identity.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def get_thumbnail(path: Path, cache_dir: Path, size: int = THUMBNAIL_SIZE) -> Path | None:
+    """
+    Return the path to the cached thumbnail of the photo, creating the thumbnail if needed.
+
+    This function does not touch any Qt objects, so it is safe to call from a worker thread.
+    Returns None if the photo could not be read.
+    """
+    try:
+        key = thumbnail_cache_key(path, size)
+    except OSError as e:
+        logger.warning(f"Cannot create thumbnail for {path}: {e}")
+        return None
+
+    # Spread the thumbnails over subdirectories, to keep the directories small
+    thumbnail_path = cache_dir / key[:2] / f"{key}.jpg"
+    if thumbnail_path.exists():
+        return thumbnail_path
+
+    # Decode no more of the photo than we need for the thumbnail
+    image_size = read_image_size(path)
+    reduction = reduction_for_size(*image_size, size) if image_size is not None else 1
+    img = load_image(str(path), reduction)
+    if img is None:
+        return None
+    h, w = img.shape[:2]
+    scale = min(1.0, size / max(h, w))
+    thumb = cv2.resize(img, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+
+    # Write to a temporary file first, so that other threads or processes never see a partial thumbnail
+    thumbnail_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(suffix=".jpg", dir=thumbnail_path.parent)
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        if not save_image(tmp_path, thumb, quality=85):
+            return None
+        tmp_path.replace(thumbnail_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    logger.debug(f"Created thumbnail for {path}")
+    return thumbnail_path
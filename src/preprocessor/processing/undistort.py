@@ -1,26 +1,43 @@
 import contextlib
 import logging
-from collections.abc import Callable
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
 
 from cv2.typing import MatLike
 
+from preprocessor.model import Matrix3x3
 from preprocessor.model.photo_model import PhotoModel
 from preprocessor.model.project_model import ProjectModel
 from preprocessor.processing.load_image import load_image
+from preprocessor.processing.params import UndistortMapType
+from preprocessor.processing.save_image import save_image
 
 logger = logging.getLogger(__name__)
 
+UNDISTORT_MAPS_CACHE_BYTES = 256 * 1024 * 1024
+"""
+The maximum memory taken by the cached undistortion maps, in bytes.
+
+A pair of maps for a 24 MP photo takes about 190 MB (about 140 MB as fixed-point maps), so this holds one of them.
+The cache is per process: every worker process of `run_in_processes` may take this much on top of the main process.
+"""
+
 
 def undistort_photo(
     photo: PhotoModel,
     project: ProjectModel,
     progress_callback: Callable[[float], None] | None = None,
     stop_checker: Callable[[], bool] | None = None,
+    image: MatLike | None = None,
 ) -> MatLike | None:
     """Load the photo (from project paths) and apply undistortion using the model's params.
 
     This function is safe to call from a worker thread. It returns the undistorted image
     (as a cv-compatible numpy array) or None on failure.
+    Pass the already decoded photo as ``image`` to avoid loading it again.
 
     If ``stop_checker`` is provided it will be called periodically; if it returns True
     the operation will be aborted and None returned.
@@ -31,13 +48,80 @@ def undistort_photo(
     if cam is None or dist is None:
         return None
 
-    # Load the image from disk
-    original_path = project.get_absolute_path(photo.original_filename)
-    img = load_image(str(original_path))
+    # Load the image from disk, unless it has already been decoded
+    img = image
     if img is None:
-        logger.error("Failed to load image %s", original_path)
-        return None
+        original_path = project.get_absolute_path(photo.original_filename)
+        img = load_image(str(original_path))
+        if img is None:
+            logger.error("Failed to load image %s", original_path)
+            return None
+
+    return undistort_image(
+        img,
+        cam,
+        dist,
+        map_type=project.undistort_map_type,
+        progress_callback=progress_callback,
+        stop_checker=stop_checker,
+    )
+
+
+@dataclass(frozen=True)
+class UndistortJob:
+    """
+    A single photo to undistort and save.
+
+    This only holds plain data (no Qt objects), so that it can be sent to a worker process.
+    """
+
+    source_path: Path
+    """The absolute path to the original photo."""
+    output_path: Path
+    """The absolute path to write the undistorted photo to."""
+    camera_matrix: Matrix3x3
+    """The camera matrix."""
+    distortion_coefficients: tuple[float, ...]
+    """The distortion coefficients."""
+    undistort_map_type: UndistortMapType
+    """The representation of the remap tables used for undistortion."""
+    quality: int = 95
+    """The JPEG quality, 0-100."""
+
+
+def undistort_photo_file(job: UndistortJob) -> str | None:
+    """
+    Load, undistort, and save a single photo.
+
+    This function does not touch any Qt objects, so it can be run in a worker process.
+    Returns None on success, or a message describing the failure.
+    """
+    img = load_image(str(job.source_path))
+    if img is None:
+        return f"Failed to load image: {job.source_path}"
+    undistorted = undistort_image(img, job.camera_matrix, job.distortion_coefficients, map_type=job.undistort_map_type)
+    if undistorted is None:
+        return f"Failed to undistort image: {job.source_path}"
+    if not save_image(job.output_path, undistorted, quality=job.quality):
+        return f"Failed to save image to {job.output_path}"
+    return None
 
+
+def undistort_image(
+    img: MatLike,
+    camera_matrix: Matrix3x3,
+    distortion_coefficients: Sequence[float],
+    map_type: UndistortMapType = UndistortMapType.FLOAT,
+    progress_callback: Callable[[float], None] | None = None,
+    stop_checker: Callable[[], bool] | None = None,
+    maps_cache: "UndistortMapsCache | None" = None,
+) -> MatLike | None:
+    """Apply undistortion to an already loaded image, using remap tables of the given type.
+
+    This function does not touch any Qt objects, so it is safe to call from a worker thread or process.
+    It returns the undistorted image or None on failure or when ``stop_checker`` requested a stop.
+    The remap tables are taken from ``maps_cache``, or from the cache shared by the process if it is None.
+    """
     # Quick progress kick-off
     if progress_callback is not None:
         with contextlib.suppress(Exception):
@@ -49,26 +133,10 @@ def undistort_photo(
         import numpy as np
 
         h, w = img.shape[:2]
-        np_camera_matrix = np.array(cam, dtype=np.float32)
-        np_dist_coeffs = np.array(list(dist), dtype=np.float32)
-
-        # Compute optimal new camera matrix (same as fix_lens_distortion.undistort)
-        new_camera_matrix, _ = cv2.getOptimalNewCameraMatrix(
-            np_camera_matrix,
-            np_dist_coeffs,
-            (w, h),
-            1,
-        )
-
-        # Build remap matrices
-        map1, map2 = cv2.initUndistortRectifyMap(
-            np_camera_matrix,
-            np_dist_coeffs,
-            None,
-            new_camera_matrix,
-            (w, h),
-            cv2.CV_32FC1,
-        )
+        if stop_checker is not None and stop_checker():
+            logger.info("undistort_image: stop requested")
+            return None
+        map1, map2 = undistort_maps(camera_matrix, distortion_coefficients, w, h, map_type, cache=maps_cache)
 
         # Prepare destination image
         dst = np.empty_like(img)
@@ -97,7 +165,7 @@ def undistort_photo(
             if stop_checker is not None:
                 try:
                     if stop_checker():
-                        logger.info("undistort_photo: stop requested for %s", original_path)
+                        logger.info("undistort_image: stop requested")
                         return None
                 except Exception:
                     # swallow errors from stop_checker
@@ -111,5 +179,168 @@ def undistort_photo(
         return dst
 
     except Exception as exc:
-        logger.exception("Failed to undistort image %s: %s", original_path, exc)
+        logger.exception("Failed to undistort image: %s", exc)
         return None
+
+
+class UndistortMapsCache:
+    """
+    A least-recently-used cache of undistortion maps, limited by the memory the maps take.
+
+    The most recently used maps are always kept, even if they take more than the limit by themselves.
+    This class is thread-safe.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, tuple[MatLike, MatLike]] = OrderedDict()
+        self._bytes = 0
+
+    def get(
+        self,
+        camera_matrix: Matrix3x3,
+        distortion_coefficients: Sequence[float],
+        width: int,
+        height: int,
+        map_type: UndistortMapType,
+    ) -> tuple[MatLike, MatLike]:
+        """Return the maps for the given parameters, building them if they are not cached."""
+        key = (
+            tuple(tuple(float(v) for v in row) for row in camera_matrix),
+            tuple(float(v) for v in distortion_coefficients),
+            int(width),
+            int(height),
+            map_type,
+        )
+        with self._lock:
+            maps = self._entries.get(key)
+            if maps is not None:
+                self._entries.move_to_end(key)
+                return maps
+
+        # Build the maps outside of the lock, so that other threads can use the cache meanwhile
+        maps = _build_undistort_maps(camera_matrix, distortion_coefficients, int(width), int(height), map_type)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = maps
+                self._bytes += maps[0].nbytes + maps[1].nbytes
+            while len(self._entries) > 1 and self._bytes > self._max_bytes:
+                _, (map1, map2) = self._entries.popitem(last=False)
+                self._bytes -= map1.nbytes + map2.nbytes
+        return maps
+
+    def clear(self) -> None:
+        """Drop all cached maps."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        """The memory taken by the cached maps, in bytes."""
+        with self._lock:
+            return self._bytes
+
+    def __len__(self) -> int:
+        """The number of cached map pairs."""
+        with self._lock:
+            return len(self._entries)
+
+
+_shared_maps_cache = UndistortMapsCache(UNDISTORT_MAPS_CACHE_BYTES)
+"""The undistortion maps cache shared by the process."""
+
+
+def undistort_maps(
+    camera_matrix: Matrix3x3,
+    distortion_coefficients: Sequence[float],
+    width: int,
+    height: int,
+    map_type: UndistortMapType = UndistortMapType.FLOAT,
+    cache: UndistortMapsCache | None = None,
+) -> tuple[MatLike, MatLike]:
+    """
+    Return the remap tables `(map1, map2)` of the given type that undistort an image of the given size.
+
+    The maps are cached (up to `UNDISTORT_MAPS_CACHE_BYTES` in the cache shared by the process, unless another
+    cache is given), since all photos in a transect typically share the same camera parameters and resolution.
+    The returned arrays are shared, and are therefore read-only.
+    """
+    if cache is None:
+        cache = _shared_maps_cache
+    return cache.get(camera_matrix, distortion_coefficients, width, height, map_type)
+
+
+def _build_undistort_maps(
+    camera_matrix: Matrix3x3,
+    distortion_coefficients: Sequence[float],
+    width: int,
+    height: int,
+    map_type: UndistortMapType,
+) -> tuple[MatLike, MatLike]:
+    import cv2
+    import numpy as np
+
+    logger.debug(f"Building {map_type.value} undistortion maps for {width}x{height} pixels...")
+    np_camera_matrix = np.array(camera_matrix, dtype=np.float32)
+    np_dist_coeffs = np.array(distortion_coefficients, dtype=np.float32)
+    new_camera_matrix = undistorted_camera_matrix(camera_matrix, distortion_coefficients, width, height)
+
+    # Build remap matrices
+    map1, map2 = cv2.initUndistortRectifyMap(
+        np_camera_matrix,
+        np_dist_coeffs,
+        None,
+        new_camera_matrix,
+        (width, height),
+        cv2.CV_32FC1,
+    )
+
+    if map_type == UndistortMapType.FIXED_POINT:
+        # Convert to fixed-point: map1 holds the integer coordinates, map2 the interpolation table indices
+        map1, map2 = cv2.convertMaps(map1, map2, cv2.CV_16SC2)
+
+    # The maps are shared between callers, so make sure nobody modifies them
+    map1.flags.writeable = False
+    map2.flags.writeable = False
+    logger.debug(f"Built undistortion maps for {width}x{height} pixels")
+    return map1, map2
+
+
+def undistorted_camera_matrix(
+    camera_matrix: Matrix3x3,
+    distortion_coefficients: Sequence[float],
+    width: int,
+    height: int,
+) -> MatLike:
+    """
+    Return the camera matrix of the undistorted image.
+
+    This is the optimal new camera matrix that keeps all pixels of the original image (alpha=1),
+    so it maps normalized camera coordinates to pixel coordinates in the undistorted image.
+    """
+    import cv2
+    import numpy as np
+
+    new_camera_matrix, _ = cv2.getOptimalNewCameraMatrix(
+        np.array(camera_matrix, dtype=np.float32),
+        np.array(distortion_coefficients, dtype=np.float32),
+        (int(width), int(height)),
+        1,
+    )
+    return new_camera_matrix
+
+
+def scale_camera_matrix(camera_matrix: Matrix3x3, scale: float) -> Matrix3x3:
+    """
+    Return the camera matrix for the same photo, scaled by the given factor.
+
+    The focal lengths and the principal point are in pixels, so they scale with the photo.
+    """
+    (fx, s, cx), (_, fy, cy), _ = camera_matrix
+    return (
+        (fx * scale, s * scale, cx * scale),
+        (0.0, fy * scale, cy * scale),
+        (0.0, 0.0, 1.0),
+    )
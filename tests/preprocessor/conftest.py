@@ -0,0 +1,45 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from preprocessor.model.photo_model import PhotoModel, PhotoData
+from preprocessor.model.project_model import ProjectModel
+
+
+@pytest.fixture
+def create_project(tmp_path: Path) -> Callable[..., ProjectModel]:
+    """
+    Return a function that creates a project file in `tmp_path`, with the given number of blank photos.
+
+    The photos are named after the `filename` pattern, which is formatted with their index `i`.
+    Every photo has quadrat corners and a small distortion, so that it can be detected, undistorted, and exported.
+    """
+
+    def create(count: int, filename: str = "photo{i}.jpg") -> ProjectModel:
+        project = ProjectModel(file=tmp_path / "test.pbproj")
+        project.export_path = tmp_path / "export"
+        project.export_path.mkdir(exist_ok=True)
+        project.target_width = 64
+        project.target_height = 48
+        for i in range(count):
+            path = tmp_path / filename.format(i=i)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            cv2.imwrite(str(path), np.full((120, 160, 3), i * 10, dtype=np.uint8))
+            project.photos.append(
+                PhotoModel(
+                    PhotoData(
+                        original_filename=path.relative_to(tmp_path),
+                        width=160,
+                        height=120,
+                        quadrat_corners=[(10.0, 10.0), (150.0, 10.0), (150.0, 110.0), (10.0, 110.0)],
+                        distortion_coefficients=[0.05, 0.0, 0.0, 0.0, 0.0],
+                    )
+                )
+            )
+        project.write_to_file(project.file)
+        return project
+
+    return create
@@ -0,0 +1,246 @@
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+from cv2.typing import MatLike
+from PySide6.QtCore import QEvent, QPoint, QPointF, QRect, QSize, Qt, QThreadPool
+from PySide6.QtGui import QMouseEvent, QPixmap
+from pytestqt.qtbot import QtBot
+
+from preprocessor.gui import photo_editor_widget as photo_editor_widget_module
+from preprocessor.gui.photo_editor_widget import PhotoEditorWidget
+from preprocessor.gui.utils import qimage_from_cv
+from preprocessor.model.photo_model import PhotoModel
+from preprocessor.model.project_model import ProjectModel
+from preprocessor.processing import image_cache as image_cache_module
+from preprocessor.processing import undistort as undistort_module
+from preprocessor.processing.image_cache import shared_image_cache
+
+
+class TestPhotoEditorWidget:
+    def test_display_pixmap_uses_pyramid(self, qtbot: QtBot) -> None:
+        # Arrange
+        widget = PhotoEditorWidget()
+        qtbot.addWidget(widget)
+        widget._set_pixmap(QPixmap(2000, 1000))
+
+        # Act
+        scaled = widget._display_pixmap(QSize(300, 150))
+
+        # Assert: the pyramid was built down to the smallest level still larger than the display size
+        assert scaled is not None
+        assert scaled.size() == QSize(300, 150)
+        assert [level.size() for level in widget._pixmap_pyramid] == [
+            QSize(2000, 1000),
+            QSize(1000, 500),
+            QSize(500, 250),
+        ]
+
+    def test_display_pixmap_is_cached_until_resized(self, qtbot: QtBot) -> None:
+        # Arrange
+        widget = PhotoEditorWidget()
+        qtbot.addWidget(widget)
+        widget._set_pixmap(QPixmap(2000, 1000))
+
+        # Act
+        first = widget._display_pixmap(QSize(300, 150))
+        second = widget._display_pixmap(QSize(300, 150))
+        resized = widget._display_pixmap(QSize(600, 300))
+
+        # Assert
+        assert first is second
+        assert resized is not first
+        assert resized is not None
+        assert resized.size() == QSize(600, 300)
+
+    def test_mouse_move_repaints_only_the_crosshair(self, qtbot: QtBot, monkeypatch: pytest.MonkeyPatch) -> None:
+        # Arrange
+        widget = PhotoEditorWidget()
+        qtbot.addWidget(widget)
+        widget.resize(800, 600)
+        updates: list[QRect] = []
+        monkeypatch.setattr(widget, "update", lambda *args: updates.append(QRect(*args)))
+        widget._mouse_position = QPoint(100, 100)
+
+        # Act
+        widget.mouseMoveEvent(_mouse_move_event(QPoint(110, 100)))
+
+        # Assert: the old and new crosshair are repainted, not the whole widget
+        assert len(updates) == 1
+        for end in (QPoint(85, 100), QPoint(125, 100), QPoint(100, 85), QPoint(110, 115)):
+            assert updates[0].contains(end)
+        assert updates[0].width() < 100
+        assert updates[0].height() < 100
+
+    def test_zoom_keeps_the_point_under_the_mouse(self, qtbot: QtBot) -> None:
+        # Arrange
+        widget = PhotoEditorWidget()
+        qtbot.addWidget(widget)
+        widget.resize(400, 200)
+        widget._set_pixmap(QPixmap(2000, 1000))
+        anchor = QPointF(100, 50)
+        before = widget._widget_to_image_point(anchor.toPoint())
+
+        # Act
+        widget._set_zoom(4.0, anchor)
+
+        # Assert
+        ratio, _, size = widget._current_pixmap_info()
+        assert ratio == 0.8
+        assert size == QSize(1600, 800)
+        assert widget._widget_to_image_point(anchor.toPoint()) == before
+
+    def test_zoom_is_limited(self, qtbot: QtBot) -> None:
+        # Arrange
+        widget = PhotoEditorWidget()
+        qtbot.addWidget(widget)
+        widget.resize(400, 200)
+        widget._set_pixmap(QPixmap(2000, 1000))
+
+        # Act
+        widget._set_zoom(1000.0, QPointF(0, 0))
+        max_ratio, _, _ = widget._current_pixmap_info()
+        widget._set_zoom(0.1, QPointF(0, 0))
+        min_ratio, offset, _ = widget._current_pixmap_info()
+
+        # Assert
+        assert max_ratio == 4.0
+        assert min_ratio == 0.2
+        assert offset == QPoint(0, 0)
+
+    def test_drops_the_full_resolution_pixmap_while_zoomed_in(self, qtbot: QtBot) -> None:
+        # Arrange
+        widget = PhotoEditorWidget()
+        qtbot.addWidget(widget)
+        widget.resize(400, 200)
+        img = np.full((1000, 2000, 3), 128, dtype=np.uint8)
+        widget._original_cv_img = img
+        widget._set_pixmap(QPixmap.fromImage(qimage_from_cv(img)))
+
+        # Act
+        widget._set_zoom(4.0, QPointF(0, 0))
+        widget.grab()
+        zoomed_size = widget._pixmap.size() if widget._pixmap is not None else None
+        qtbot.waitUntil(lambda: not widget._tiles._workers)
+        widget._set_zoom(1.0, QPointF(0, 0))
+        widget.resize(1600, 800)
+        widget.grab()
+
+        # Assert: only the level needed to show the whole photo is kept, until the photo is shown larger
+        assert zoomed_size == QSize(500, 250)
+        assert widget._image_size == QSize(2000, 1000)
+        assert widget._pixmap is not None
+        assert widget._pixmap.size() == QSize(2000, 1000)
+
+    def test_only_the_newest_undistortion_is_shown(
+        self, qtbot: QtBot, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        # Arrange
+        widget = PhotoEditorWidget()
+        qtbot.addWidget(widget)
+        widget._photo = PhotoModel({"original_filename": "photo.jpg", "width": 60, "height": 40})
+        widget._current_project = ProjectModel(tmp_path / "project.json")
+        stop_checkers: list[Callable[[], bool]] = []
+        results: list[MatLike] = []
+        release_second = threading.Event()
+
+        def undistort_photo(*_args: object, stop_checker: Callable[[], bool], **_kwargs: object) -> MatLike:
+            stop_checkers.append(stop_checker)
+            if len(stop_checkers) == 2:
+                release_second.wait(5)
+            results.append(np.full((40, 60, 3), len(results), dtype=np.uint8))
+            return results[-1]
+
+        monkeypatch.setattr(photo_editor_widget_module, "undistort_photo", undistort_photo)
+
+        # Act: the first result is queued on the event loop before the second undistortion is started
+        widget._start_undistort_for_current()
+        QThreadPool.globalInstance().waitForDone()
+        widget._start_undistort_for_current()
+        qtbot.wait(50)
+        stale_img = widget._undistorted_cv_img
+        second_worker = widget._current_undistort_worker
+        release_second.set()
+        qtbot.waitUntil(lambda: widget._current_undistort_worker is None)
+
+        # Assert
+        assert stop_checkers[0]()
+        assert not stop_checkers[1]()
+        assert stale_img is None
+        assert second_worker is not None
+        assert widget._undistorted_cv_img is results[1]
+
+    def test_showing_the_same_photo_again_does_not_decode_it(
+        self, qtbot: QtBot, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        # Arrange
+        cv2.imwrite(str(tmp_path / "photo.png"), np.full((40, 60, 3), 128, dtype=np.uint8))
+        photo = PhotoModel({"original_filename": "photo.png", "width": 60, "height": 40})
+        project = ProjectModel(tmp_path / "project.json")
+        widget = PhotoEditorWidget()
+        qtbot.addWidget(widget)
+        calls: list[str] = []
+        original_load_image = image_cache_module.load_image
+
+        def load_image(filename: str) -> MatLike | None:
+            calls.append(filename)
+            return original_load_image(filename)
+
+        monkeypatch.setattr(image_cache_module, "load_image", load_image)
+
+        # Act
+        widget.show_photo(photo, project)
+        widget.show_photo(photo, project)
+        qtbot.waitUntil(lambda: widget._current_undistort_worker is None)
+
+        # Assert
+        assert len(calls) == 1
+        assert len(shared_image_cache) == 1
+        widget.show_photo(None, project)
+        assert len(shared_image_cache) == 0
+
+    def test_shows_a_proxy_while_the_distortion_changes(self, qtbot: QtBot, tmp_path: Path) -> None:
+        # Arrange
+        cv2.imwrite(str(tmp_path / "photo.png"), np.full((1536, 2048, 3), 128, dtype=np.uint8))
+        photo = PhotoModel({"original_filename": "photo.png", "width": 2048, "height": 1536})
+        widget = PhotoEditorWidget()
+        qtbot.addWidget(widget)
+        widget.resize(400, 300)
+        widget.show_photo(photo, ProjectModel(tmp_path / "project.json"))
+        qtbot.waitUntil(lambda: widget._current_undistort_worker is None)
+
+        shared_maps = len(undistort_module._shared_maps_cache)
+        undistorted_img = widget.get_processing_image()
+
+        # Act
+        photo.distortion_coefficients = [0.1, 0, 0, 0, 0]
+        proxy_size = widget._pixmap.size() if widget._pixmap is not None else None
+        proxy_ratio = widget._fit_ratio()
+        processing_img = widget.get_processing_image()
+        proxy_shared_maps = len(undistort_module._shared_maps_cache)
+        qtbot.waitUntil(lambda: widget._pixmap is not None and widget._pixmap.width() == 2048)
+
+        # Assert: the proxy is shown at the size of the photo, without using the shared maps cache,
+        # and the stale undistorted image is not used for processing
+        assert proxy_size == QSize(1024, 768)
+        assert proxy_ratio == 400 / 2048
+        assert widget._image_size == QSize(2048, 1536)
+        assert proxy_shared_maps == shared_maps
+        assert len(widget._proxy_maps_cache) == 1
+        assert undistorted_img is not widget._original_cv_img
+        assert processing_img is widget._original_cv_img
+        widget.show_photo(None, ProjectModel(tmp_path / "project.json"))
+
+
+def _mouse_move_event(pos: QPoint) -> QMouseEvent:
+    return QMouseEvent(
+        QEvent.Type.MouseMove,
+        QPointF(pos),
+        QPointF(pos),
+        Qt.MouseButton.NoButton,
+        Qt.MouseButton.NoButton,
+        Qt.KeyboardModifier.NoModifier,
+    )
@@ -0,0 +1,104 @@
+import threading
+from collections.abc import Callable
+
+from PySide6.QtCore import QThreadPool
+from pytestqt.qtbot import QtBot
+
+from preprocessor.gui.preview_scheduler import PreviewScheduler
+
+
+class _Task:
+    """A preview task that records its calls, and blocks until released."""
+
+    def __init__(self) -> None:
+        self.calls: list[int] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(
+        self,
+        value: int,
+        progress_callback: Callable[[float], None],  # noqa: ARG002
+        stop_checker: Callable[[], bool],
+    ) -> int:
+        self.calls.append(value)
+        self.started.set()
+        while not self.release.is_set() and not stop_checker():
+            threading.Event().wait(0.01)
+        return value
+
+
+class TestPreviewScheduler:
+    def test_debounces_requests(self, qtbot: QtBot) -> None:
+        # Arrange
+        task = _Task()
+        task.release.set()
+        scheduler = PreviewScheduler(task, delay_ms=50)
+        results: list[int] = []
+        scheduler.on_preview_ready.connect(lambda result, _latency: results.append(result))
+
+        # Act
+        with qtbot.waitSignal(scheduler.on_preview_ready, timeout=5000):
+            for value in range(5):
+                scheduler.schedule(value)
+        qtbot.waitUntil(lambda: not scheduler.busy, timeout=5000)
+
+        # Assert: only the last request was run
+        assert task.calls == [4]
+        assert results == [4]
+
+    def test_supersedes_running_preview(self, qtbot: QtBot) -> None:
+        # Arrange
+        task = _Task()
+        scheduler = PreviewScheduler(task, delay_ms=0)
+        results: list[tuple[int, float]] = []
+        scheduler.on_preview_ready.connect(lambda result, latency: results.append((result, latency)))
+        scheduler.schedule(1)
+        qtbot.waitUntil(task.started.is_set, timeout=5000)
+
+        # Act: requests made while the first preview is running
+        scheduler.schedule(2)
+        scheduler.schedule(3)
+        task.release.set()
+        qtbot.waitUntil(lambda: not scheduler.busy, timeout=5000)
+
+        # Assert: the running preview was canceled, and only the last request was run after it
+        assert task.calls == [1, 3]
+        assert [result for result, _ in results] == [3]
+        assert results[0][1] >= 0.0
+
+    def test_cancel(self, qtbot: QtBot) -> None:
+        # Arrange
+        task = _Task()
+        scheduler = PreviewScheduler(task, delay_ms=0)
+        results: list[int] = []
+        scheduler.on_preview_ready.connect(lambda result, _latency: results.append(result))
+        scheduler.schedule(1)
+        qtbot.waitUntil(task.started.is_set, timeout=5000)
+
+        # Act
+        scheduler.cancel()
+        qtbot.waitUntil(lambda: not scheduler.busy, timeout=5000)
+
+        # Assert
+        assert task.calls == [1]
+        assert results == []
+
+    def test_cancel_drops_a_queued_result(self, qtbot: QtBot) -> None:
+        # Arrange: the task has finished, and its result is queued on the event loop
+        task = _Task()
+        scheduler = PreviewScheduler(task, delay_ms=0)
+        results: list[int] = []
+        scheduler.on_preview_ready.connect(lambda result, _latency: results.append(result))
+        scheduler.schedule(1)
+        qtbot.waitUntil(task.started.is_set, timeout=5000)
+        task.release.set()
+        QThreadPool.globalInstance().waitForDone()
+
+        # Act
+        scheduler.cancel()
+        qtbot.waitUntil(lambda: not scheduler.busy, timeout=5000)
+
+        # Assert
+        assert task.calls == [1]
+        assert results == []
@@ -0,0 +1,64 @@
+import numpy as np
+from PySide6.QtCore import QRect
+from pytestqt.qtbot import QtBot
+
+from preprocessor.gui.tile_cache import TileCache
+
+
+class TestTileCache:
+    def test_tiles_in(self) -> None:
+        # Arrange
+        cache = TileCache(tile_size=100)
+        cache.set_source(np.zeros((250, 450, 3), dtype=np.uint8))
+
+        # Act
+        keys = cache.tiles_in(0, QRect(150, 50, 100, 100))
+
+        # Assert
+        assert keys == [(0, 1, 0), (0, 2, 0), (0, 1, 1), (0, 2, 1)]
+        assert cache.source_rect((0, 4, 2)) == QRect(400, 200, 50, 50)
+        assert cache.tiles_in(1, QRect(0, 0, 1000, 1000)) == [
+            (1, 0, 0),
+            (1, 1, 0),
+            (1, 2, 0),
+            (1, 0, 1),
+            (1, 1, 1),
+            (1, 2, 1),
+        ]
+
+    def test_renders_requested_tiles(self, qtbot: QtBot) -> None:
+        # Arrange
+        img = np.zeros((250, 450, 3), dtype=np.uint8)
+        img[:, :, 2] = 255  # red, in BGR
+        cache = TileCache(tile_size=100)
+        cache.set_source(img)
+
+        # Act
+        with qtbot.waitSignals([cache.on_tile_ready, cache.on_tile_ready], timeout=5000):
+            cache.request([(0, 4, 2), (1, 2, 1)])
+
+        # Assert: tiles at the image edge are cropped, and tiles at level 1 are at half resolution
+        edge_tile = cache.tile((0, 4, 2))
+        level_tile = cache.tile((1, 2, 1))
+        assert edge_tile is not None
+        assert edge_tile.size().toTuple() == (50, 50)
+        assert edge_tile.toImage().pixelColor(0, 0).red() == 255
+        assert level_tile is not None
+        assert level_tile.size().toTuple() == (25, 25)
+
+    def test_evicts_tiles_that_are_no_longer_requested(self, qtbot: QtBot) -> None:
+        # Arrange: room for two tiles of 100x100 pixels
+        cache = TileCache(tile_size=100, max_bytes=2 * 100 * 100 * 4)
+        cache.set_source(np.zeros((200, 200, 3), dtype=np.uint8))
+        with qtbot.waitSignals([cache.on_tile_ready, cache.on_tile_ready], timeout=5000):
+            cache.request([(0, 0, 0), (0, 1, 0)])
+
+        # Act
+        with qtbot.waitSignals([cache.on_tile_ready, cache.on_tile_ready], timeout=5000):
+            cache.request([(0, 0, 1), (0, 1, 1)])
+
+        # Assert
+        assert cache.tile((0, 0, 0)) is None
+        assert cache.tile((0, 1, 0)) is None
+        assert cache.tile((0, 0, 1)) is not None
+        assert cache.tile((0, 1, 1)) is not None
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from PySide6.QtGui import QColor, QImage
+
+from preprocessor.gui.utils import display_qimage_from_cv, qimage_from_cv
+
+
+class TestQImageFromCv:
+    @pytest.mark.parametrize(
+        ("pixel", "expected"),
+        [
+            ([10, 20, 30], QColor(30, 20, 10)),
+            ([10, 20, 30, 255], QColor(30, 20, 10, 255)),
+            (40, QColor(40, 40, 40)),
+        ],
+    )
+    def test_colors(self, pixel: list[int] | int, expected: QColor) -> None:
+        # Arrange
+        img = np.full((3, 4, *np.shape(pixel)), pixel, dtype=np.uint8)
+
+        # Act
+        image = qimage_from_cv(img)
+        display_image = display_qimage_from_cv(img)
+
+        # Assert
+        assert image.pixelColor(1, 2) == expected
+        assert display_image.pixelColor(1, 2) == expected
+
+    def test_shares_the_image_memory(self) -> None:
+        # Arrange
+        img = np.zeros((3, 4, 3), dtype=np.uint8)
+
+        # Act
+        image = qimage_from_cv(img)
+        img[2, 1] = (10, 20, 30)
+
+        # Assert
+        assert image.format() == QImage.Format.Format_BGR888
+        assert image.pixelColor(1, 2) == QColor(30, 20, 10)
+
+    def test_copies_non_contiguous_images(self) -> None:
+        # Arrange
+        img = np.zeros((10, 10, 3), dtype=np.uint8)
+        img[3, 4] = (10, 20, 30)
+
+        # Act
+        image = qimage_from_cv(img[2:5, 3:7])
+
+        # Assert
+        assert image.size().toTuple() == (4, 3)
+        assert image.pixelColor(1, 1) == QColor(30, 20, 10)
+
+    def test_display_image_uses_the_pixmap_format(self) -> None:
+        # Act
+        image = display_qimage_from_cv(np.zeros((3, 4, 3), dtype=np.uint8))
+
+        # Assert
+        assert image.format() == QImage.Format.Format_RGB32
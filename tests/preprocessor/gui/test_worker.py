@@ -0,0 +1,54 @@
+import threading
+from collections.abc import Callable
+
+from pytestqt.qtbot import QtBot
+
+from preprocessor.gui.worker import Worker, start_worker
+
+
+def _wait_until_stopped(
+    started: threading.Event,
+    progress_callback: Callable[[float], None],  # noqa: ARG001
+    stop_checker: Callable[[], bool],
+) -> str:
+    started.set()
+    while not stop_checker():
+        threading.Event().wait(0.01)
+    return "stopped"
+
+
+def _add(a: int, b: int, progress_callback: Callable[[float], None]) -> int:  # noqa: ARG001
+    return a + b
+
+
+class TestWorker:
+    def test_worker_emits_result(self, qtbot: QtBot) -> None:
+        # Arrange
+        worker = Worker(_add, 1, 2)
+        results: list[int] = []
+        worker.signals.result.connect(results.append)
+
+        # Act
+        with qtbot.waitSignal(worker.signals.finished, timeout=5000):
+            start_worker(worker)
+
+        # Assert
+        assert "stop_checker" not in worker.kwargs
+        assert results == [3]
+
+    def test_canceled_worker_stops_and_discards_result(self, qtbot: QtBot) -> None:
+        # Arrange
+        started = threading.Event()
+        worker = Worker(_wait_until_stopped, started)
+        results: list[str] = []
+        worker.signals.result.connect(results.append)
+
+        # Act
+        with qtbot.waitSignal(worker.signals.finished, timeout=5000):
+            start_worker(worker)
+            assert started.wait(5)
+            worker.cancel()
+
+        # Assert
+        assert worker.cancelled
+        assert results == []
@@ -36,6 +36,18 @@ class Item(QModel[ItemData]):
         return f"Item({self.name})"
 
 
+class OwnerData(BaseModel):
+    items: list[ItemData] = []
+
+
+class Owner(QModel[OwnerData]):
+    def __init__(self, data: OwnerData | dict[str, Any] | None = None) -> None:
+        super().__init__(model_cls=OwnerData, data=data)
+        self.items = QListModel[Item](parent=self)
+        self.items.bind_to_model(self, "items")
+        self.items.populate_from_data(self._data.items, Item)
+
+
 @pytest.fixture
 def model() -> QListModel[Item]:
     return QListModel[Item]()
@@ -207,3 +219,53 @@ class TestQListModel:
         # Act: iter() returns an iterator
         it_obj = iter(model)
         assert hasattr(it_obj, "__next__")
+
+    def test_bound_field_mirrors_the_items(self) -> None:
+        # Arrange
+        owner = Owner(OwnerData(items=[ItemData(name="a"), ItemData(name="b")]))
+        owner_changes: list[None] = []
+        owner.on_changed.connect(lambda: owner_changes.append(None))
+
+        # Act / Assert: every change is applied to the owner's field, with one notification each
+        owner.items.append(Item(ItemData(name="c")))
+        owner.items.insert(0, Item(ItemData(name="d")))
+        del owner.items[1]
+        owner.items[-1] = Item(ItemData(name="e"))
+        owner.items[0:1] = []
+        assert [item.name for item in owner._data.items] == ["b", "e"]
+        assert [item._data for item in owner.items] == owner._data.items
+        assert len(owner_changes) == 5
+
+    def test_bound_field_is_updated_in_place(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # Arrange
+        owner = Owner(OwnerData(items=[ItemData(name="a")]))
+        items_data = owner._data.items
+        owner.mark_clean()
+
+        def set_field(*_args: object) -> None:
+            msg = "The whole field must not be set"
+            raise AssertionError(msg)
+
+        monkeypatch.setattr(owner, "_set_field", set_field)
+
+        # Act
+        owner.items.append(Item(ItemData(name="b")))
+
+        # Assert
+        assert owner._data.items is items_data
+        assert [item.name for item in items_data] == ["a", "b"]
+        assert owner.dirty
+
+    def test_populating_does_not_change_the_bound_field(self) -> None:
+        # Arrange
+        owner_changes: list[None] = []
+
+        # Act
+        owner = Owner(OwnerData(items=[ItemData(name="a"), ItemData(name="b")]))
+        owner.on_changed.connect(lambda: owner_changes.append(None))
+        owner.items.populate_from_data(owner._data.items, Item)
+
+        # Assert
+        assert owner_changes == []
+        assert not owner.dirty
+        assert [item.name for item in owner.items] == ["a", "b"]
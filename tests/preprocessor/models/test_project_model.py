@@ -15,12 +15,17 @@ def _ensure_qapp(qapp: QApplication) -> QApplication:
 
 
 import json
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
+from PIL import Image
+
 from preprocessor.model.project_model import ProjectModel, ProjectData
 from preprocessor.model.photo_model import PhotoModel, PhotoData
 from preprocessor.model.qlistmodel import QListModel
+from preprocessor.processing.load_image import read_image_sizes
 
 
 class TestProjectModel:
@@ -185,3 +190,113 @@ class TestProjectModel:
         project.mark_clean()
         project.photos.remove(p)
         assert project.dirty
+
+    def test_set_quadrat_corners_emits_single_change(self) -> None:
+        # Arrange
+        project = ProjectModel(file=Path("test.pbproj"))
+        photos = [
+            PhotoModel(PhotoData(original_filename=Path(f"photo{i}.jpg"), width=100, height=100)) for i in range(3)
+        ]
+        for photo in photos:
+            project.photos.append(photo)
+        project.mark_clean()
+        project_changes: list[None] = []
+        photo_changes: list[None] = []
+        project.on_changed.connect(lambda: project_changes.append(None))
+        for photo in photos:
+            photo.on_quadrat_corners_changed.connect(lambda: photo_changes.append(None))
+        corners = [(1.0, 1.0), (9.0, 1.0), (9.0, 9.0), (1.0, 9.0)]
+
+        # Act
+        project.set_quadrat_corners({photos[0]: corners, photos[2]: corners})
+
+        # Assert
+        assert len(project_changes) == 1
+        assert photo_changes == []
+        assert project.dirty
+        assert photos[0].quadrat_corners == corners
+        assert photos[1].quadrat_corners == []
+        assert photos[2].quadrat_corners == corners
+        assert json.loads(project.write_to_json())["photos"][2]["quadrat_corners"] == [list(c) for c in corners]
+
+    def test_set_field_does_not_copy_the_model(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # Arrange
+        project = ProjectModel(file=Path("test.pbproj"))
+        for i in range(3):
+            project.photos.append(PhotoModel(PhotoData(original_filename=Path(f"photo{i}.jpg"), width=100, height=100)))
+        project.mark_clean()
+        changes: list[None] = []
+        project.on_changed.connect(lambda: changes.append(None))
+
+        def model_copy(*_args: object, **_kwargs: object) -> ProjectData:
+            msg = "The model must not be copied"
+            raise AssertionError(msg)
+
+        monkeypatch.setattr(ProjectData, "model_copy", model_copy)
+
+        # Act
+        project.metadata_site = "Reef"
+        project.metadata_site = "Reef"
+
+        # Assert
+        assert changes == [None]
+        assert project.dirty
+        assert project.metadata_site == "Reef"
+
+    def test_add_photos_emits_single_change(self, tmp_path: Path) -> None:
+        # Arrange
+        project = ProjectModel(file=tmp_path / "test.pbproj")
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"photo{i}.jpg"
+            Image.new("RGB", (40 + i, 30)).save(path)
+            paths.append(path)
+        paths.append(tmp_path / "missing.jpg")
+        project.mark_clean()
+        project_changes: list[None] = []
+        list_changes: list[None] = []
+        project.on_changed.connect(lambda: project_changes.append(None))
+        project.photos.on_changed.connect(lambda _added, _removed: list_changes.append(None))
+
+        # Act
+        photos = project.add_photos(paths, read_image_sizes(paths))
+
+        # Assert: the unreadable photo is skipped
+        assert list(project.photos) == photos
+        assert [photo.original_filename for photo in photos] == [Path(f"photo{i}.jpg") for i in range(3)]
+        assert [photo._data.width for photo in photos] == [40, 41, 42]
+        assert len(project_changes) == 1
+        assert len(list_changes) == 1
+        assert project.dirty
+
+    def test_model_does_not_import_opencv(self) -> None:
+        # Act
+        code = "import sys, preprocessor.model.project_model; print('cv2' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+
+        # Assert
+        assert output.strip() == "False"
+
+    def test_mark_clean_emits_once_for_the_whole_project(self) -> None:
+        # Arrange
+        project = ProjectModel(file=Path("test.pbproj"))
+        photos = [
+            PhotoModel(PhotoData(original_filename=Path(f"photo{i}.jpg"), width=100, height=100)) for i in range(3)
+        ]
+        project.photos[0:0] = photos
+        for photo in photos:
+            photo.quadrat_corners = [(1.0, 1.0), (9.0, 1.0), (9.0, 9.0), (1.0, 9.0)]
+        project_dirty_changes: list[bool] = []
+        photo_dirty_changes: list[bool] = []
+        project.on_dirty_changed.connect(project_dirty_changes.append)
+        for photo in photos:
+            photo.on_dirty_changed.connect(photo_dirty_changes.append)
+
+        # Act
+        project.mark_clean()
+
+        # Assert
+        assert project_dirty_changes == [False]
+        assert photo_dirty_changes == []
+        assert not project.photos.dirty
+        assert not any(photo.dirty for photo in photos)
@@ -0,0 +1,188 @@
+import copy
+import math
+from typing import Any
+
+import cv2
+import numpy as np
+import pytest
+from cv2.typing import MatLike
+
+from preprocessor.processing import detect_quadrat as detect_quadrat_module
+from preprocessor.processing.detect_quadrat import (
+    Line,
+    QuadratDetector,
+    _cluster_angles,
+    _line_intersections,
+    detect_quadrat,
+)
+from preprocessor.processing.params import defaultParams
+
+
+def _scalar_line_intersections(lines: list[Line], width: int, height: int) -> list[tuple[int, int]]:
+    """Compute the intersections one pair at a time, as a reference."""
+    corners = []
+    for i in range(len(lines)):
+        for j in range(i + 1, len(lines)):
+            a = lines[i].theta % math.pi
+            b = lines[j].theta % math.pi
+            if min(abs(a - b), math.pi - abs(a - b)) < math.radians(20):
+                continue
+            a1, b1, c1 = math.cos(lines[i].theta), math.sin(lines[i].theta), lines[i].rho
+            a2, b2, c2 = math.cos(lines[j].theta), math.sin(lines[j].theta), lines[j].rho
+            det = a1 * b2 - a2 * b1
+            if abs(det) < 1e-10:
+                continue
+            x = round((b2 * c1 - b1 * c2) / det)
+            y = round((a1 * c2 - a2 * c1) / det)
+            if 0 <= x < width and 0 <= y < height:
+                corners.append((x, y))
+    return corners
+
+
+def _quadrat_image() -> np.ndarray:
+    """Return an image of a white quadrat on a dark background."""
+    img = np.full((600, 800, 3), 60, dtype=np.uint8)
+    corners = np.array([[100, 80], [700, 90], [680, 520], [120, 500]])
+    cv2.polylines(img, [corners], isClosed=True, color=(255, 255, 255), thickness=8)
+    return img
+
+
+class TestQuadratDetector:
+    def test_matches_detect_quadrat(self) -> None:
+        # Arrange
+        img = _quadrat_image()
+        detector = QuadratDetector()
+        params = copy.deepcopy(defaultParams)
+
+        # Act
+        first = detector.detect(img, defaultParams)
+        params.hough.threshold += 10
+        second = detector.detect(img, params)
+
+        # Assert
+        expected_first = detect_quadrat(img, defaultParams)
+        expected_second = detect_quadrat(img, params)
+        assert first is not None
+        assert second is not None
+        assert expected_first is not None
+        assert expected_second is not None
+        assert first.corners == expected_first.corners
+        assert second.corners == expected_second.corners
+        assert len(second.corners or []) == 4
+
+    def test_without_debug_image(self) -> None:
+        # Arrange
+        img = _quadrat_image()
+        detector = QuadratDetector()
+
+        # Act
+        without_debug = detector.detect(img, defaultParams, draw_debug=False)
+        with_debug = detector.detect(img, defaultParams)
+
+        # Assert: the same corners are found, and the output without the debug image is not reused for it
+        assert without_debug is not None
+        assert with_debug is not None
+        assert without_debug.debug is None
+        assert with_debug.debug is not None
+        assert without_debug.corners == with_debug.corners
+        assert len(without_debug.corners or []) == 4
+
+    def test_reuses_earlier_stages(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # Arrange
+        img = _quadrat_image()
+        detector = QuadratDetector()
+        params = copy.deepcopy(defaultParams)
+        calls: list[str] = []
+        original_canny_image = detect_quadrat_module._canny_image
+        original_hough = detect_quadrat_module._hough
+
+        def canny_image(*args: Any) -> MatLike:
+            calls.append("canny")
+            return original_canny_image(*args)
+
+        def hough(*args: Any) -> list[Line]:
+            calls.append("hough")
+            return original_hough(*args)
+
+        monkeypatch.setattr(detect_quadrat_module, "_canny_image", canny_image)
+        monkeypatch.setattr(detect_quadrat_module, "_hough", hough)
+
+        # Act
+        detector.detect(img, params)
+        params.hough.threshold += 10
+        detector.detect(img, params)
+        detector.detect(img.copy(), params)
+
+        # Assert: only the Hough stage is recomputed, until the image changes
+        assert calls == ["canny", "hough", "hough", "canny", "hough"]
+
+
+class TestLineIntersections:
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    def test_matches_scalar_computation(self, dtype: type[np.floating]) -> None:
+        # Arrange
+        rng = np.random.default_rng(42)
+        rho = rng.uniform(-300, 300, 80).astype(dtype)
+        theta = rng.uniform(0, math.pi, 80).astype(dtype)
+        lines = [Line(r, t) for r, t in zip(rho, theta, strict=True)]
+
+        # Act
+        result = _line_intersections(lines, 320, 240)
+
+        # Assert
+        assert result.tolist() == [list(p) for p in _scalar_line_intersections(lines, 320, 240)]
+
+    def test_parallel_lines_do_not_intersect(self) -> None:
+        # Arrange
+        lines = [Line(10.0, 0.0), Line(50.0, 0.0), Line(20.0, math.pi)]
+
+        # Act
+        result = _line_intersections(lines, 100, 100)
+
+        # Assert
+        assert result.shape == (0, 2)
+
+    def test_perpendicular_lines(self) -> None:
+        # Arrange
+        lines = [Line(10.0, 0.0), Line(20.0, math.pi / 2)]
+
+        # Act
+        result = _line_intersections(lines, 100, 100)
+
+        # Assert
+        assert result.tolist() == [[10, 20]]
+
+
+class TestClusterAngles:
+    def test_clusters_around_the_circle(self) -> None:
+        # Arrange: four groups of angles, one of which wraps around +/-pi
+        angles = np.array([0.1, -3.1, 1.6, 0.0, 3.1, 1.5, -1.5, -1.6, 0.05])
+
+        # Act
+        labels = _cluster_angles(angles, 4)
+
+        # Assert
+        assert labels is not None
+        groups = {frozenset(np.flatnonzero(labels == c).tolist()) for c in range(4)}
+        assert groups == {frozenset({0, 3, 8}), frozenset({1, 4}), frozenset({2, 5}), frozenset({6, 7})}
+
+    def test_is_deterministic(self) -> None:
+        # Arrange
+        angles = np.random.default_rng(42).uniform(-math.pi, math.pi, 200)
+
+        # Act
+        labels1 = _cluster_angles(angles, 4)
+        labels2 = _cluster_angles(angles.copy(), 4)
+
+        # Assert
+        assert labels1 is not None
+        assert labels2 is not None
+        assert np.array_equal(labels1, labels2)
+        assert set(labels1.tolist()) == {0, 1, 2, 3}
+
+    def test_too_few_distinct_angles(self) -> None:
+        # Act
+        labels = _cluster_angles(np.array([0.0, 0.0, 1.0, 2.0, 2.0]), 4)
+
+        # Assert
+        assert labels is None
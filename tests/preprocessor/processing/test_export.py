@@ -0,0 +1,43 @@
+from collections.abc import Callable
+
+import cv2
+
+from preprocessor.model.project_model import ProjectModel
+from preprocessor.processing.export import create_export_jobs, export_photos
+
+
+class TestExport:
+    def test_export_photos_in_parallel(self, create_project: Callable[..., ProjectModel]) -> None:
+        # Arrange
+        project = create_project(4)
+        project.photos[2].quadrat_corners = []
+        jobs = create_export_jobs(project)
+
+        # Act
+        results = list(export_photos(jobs, max_workers=2))
+
+        # Assert: every job reported exactly once, the one without corners was skipped
+        assert sorted(r.job.index for r in results) == [1, 2, 3, 4]
+        failed = [r for r in results if not r.ok]
+        assert len(failed) == 1
+        assert failed[0].job.index == 3
+        assert failed[0].severity == "warning"
+        for r in results:
+            assert r.job.output_path.exists() == r.ok
+            if r.ok:
+                img = cv2.imread(str(r.job.output_path))
+                assert img.shape == (48, 64, 3)
+
+    def test_export_photos_stops_when_requested(self, create_project: Callable[..., ProjectModel]) -> None:
+        # Arrange
+        project = create_project(3)
+        jobs = create_export_jobs(project)
+
+        # Act: request a stop after the first photo has been exported
+        results = []
+        for result in export_photos(jobs, max_workers=1, stop_checker=lambda: len(results) >= 1):
+            results.append(result)
+
+        # Assert
+        assert len(results) == 1
+        assert results[0].ok
@@ -0,0 +1,46 @@
+import cv2
+import numpy as np
+
+from preprocessor.processing.fix_perspective import fix_perspective, undistort_and_fix_perspective
+from preprocessor.processing.undistort import undistort_image
+
+CAMERA_MATRIX = ((400.0, 0.0, 160.0), (0.0, 400.0, 120.0), (0.0, 0.0, 1.0))
+DISTORTION_COEFFICIENTS = [-0.2, 0.05, 0.0, 0.0, 0.0]
+QUADRAT_CORNERS = [(60.0, 40.0), (250.0, 50.0), (240.0, 200.0), (70.0, 190.0)]
+
+
+def _smooth_image() -> np.ndarray:
+    """Create an image with smooth detail, so that interpolation differences stay small."""
+    rng = np.random.default_rng(42)
+    img = rng.integers(0, 256, (24, 32, 3), dtype=np.uint8)
+    return cv2.resize(img, (320, 240), interpolation=cv2.INTER_CUBIC)
+
+
+class TestUndistortAndFixPerspective:
+    def test_matches_two_step_result(self) -> None:
+        # Arrange
+        img = _smooth_image()
+        undistorted = undistort_image(img, CAMERA_MATRIX, DISTORTION_COEFFICIENTS)
+        assert undistorted is not None
+        expected = fix_perspective(undistorted, QUADRAT_CORNERS, 150, 200)
+
+        # Act
+        result = undistort_and_fix_perspective(img, CAMERA_MATRIX, DISTORTION_COEFFICIENTS, QUADRAT_CORNERS, 150, 200)
+
+        # Assert: the two-step result was resampled twice, so allow for interpolation differences
+        assert result.shape == expected.shape
+        diff = np.abs(result.astype(np.int16) - expected.astype(np.int16))
+        assert diff.mean() < 1.0
+        assert np.percentile(diff, 99) <= 8
+
+    def test_without_distortion_matches_fix_perspective(self) -> None:
+        # Arrange
+        img = _smooth_image()
+        expected = fix_perspective(img, QUADRAT_CORNERS, 150, 200)
+
+        # Act
+        result = undistort_and_fix_perspective(img, CAMERA_MATRIX, [0.0] * 5, QUADRAT_CORNERS, 150, 200)
+
+        # Assert
+        diff = np.abs(result.astype(np.int16) - expected.astype(np.int16))
+        assert diff.max() <= 1
@@ -0,0 +1,116 @@
+import threading
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+from cv2.typing import MatLike
+
+from preprocessor.processing import image_cache as image_cache_module
+from preprocessor.processing.image_cache import ImageCache
+
+
+def _write_photo(tmp_path: Path) -> Path:
+    path = tmp_path / "photo.png"
+    cv2.imwrite(str(path), np.full((40, 60, 3), 128, dtype=np.uint8))
+    return path
+
+
+class TestImageCache:
+    def test_decodes_once_while_held(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        # Arrange
+        path = _write_photo(tmp_path)
+        cache = ImageCache()
+        calls: list[str] = []
+        original_load_image = image_cache_module.load_image
+
+        def load_image(filename: str) -> MatLike | None:
+            calls.append(filename)
+            return original_load_image(filename)
+
+        monkeypatch.setattr(image_cache_module, "load_image", load_image)
+
+        # Act
+        first = cache.acquire(path)
+        second = cache.acquire(tmp_path / "." / "photo.png")
+
+        # Assert
+        assert first is not None
+        assert second is first
+        assert len(calls) == 1
+        assert not first.flags.writeable
+
+    def test_drops_image_when_released(self, tmp_path: Path) -> None:
+        # Arrange
+        path = _write_photo(tmp_path)
+        cache = ImageCache()
+        cache.acquire(path)
+        cache.acquire(path)
+
+        # Act
+        cache.release(path)
+        held = len(cache)
+        cache.release(path)
+
+        # Assert
+        assert held == 1
+        assert len(cache) == 0
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        # Arrange
+        cache = ImageCache()
+
+        # Act
+        img = cache.acquire(tmp_path / "missing.png")
+
+        # Assert
+        assert img is None
+        assert len(cache) == 1
+        cache.release(tmp_path / "missing.png")
+        assert len(cache) == 0
+
+    def test_release_unknown_path(self, tmp_path: Path) -> None:
+        # Arrange
+        cache = ImageCache()
+
+        # Act / Assert
+        with pytest.raises(KeyError):
+            cache.release(tmp_path / "photo.png")
+
+    def test_decode_error(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        # Arrange
+        path = _write_photo(tmp_path)
+        cache = ImageCache()
+        started = threading.Event()
+        resume = threading.Event()
+
+        def load_image(_filename: str) -> MatLike | None:
+            started.set()
+            resume.wait()
+            raise MemoryError
+
+        monkeypatch.setattr(image_cache_module, "load_image", load_image)
+        errors: list[BaseException] = []
+
+        def acquire() -> None:
+            try:
+                cache.acquire(path)
+            except MemoryError as e:
+                errors.append(e)
+
+        first = threading.Thread(target=acquire)
+        first.start()
+        started.wait()
+        second = threading.Thread(target=acquire)
+        second.start()
+
+        # Act
+        resume.set()
+        first.join(timeout=5)
+        second.join(timeout=5)
+
+        # Assert
+        assert not first.is_alive()
+        assert not second.is_alive()
+        assert len(errors) == 2
+        assert len(cache) == 0
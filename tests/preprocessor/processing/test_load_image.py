@@ -0,0 +1,141 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from preprocessor.processing.load_image import (
+    _probe_image_size,
+    load_image,
+    read_image_size,
+    read_image_sizes,
+    reduction_for_size,
+)
+
+
+class TestLoadImage:
+    @pytest.mark.parametrize(
+        ("width", "height", "max_size", "expected"),
+        [
+            (6000, 4000, 400, 8),
+            (4000, 6000, 400, 8),
+            (3000, 2000, 400, 4),
+            (1000, 800, 400, 2),
+            (600, 400, 400, 1),
+            (300, 200, 400, 1),
+        ],
+    )
+    def test_reduction_for_size(self, width: int, height: int, max_size: int, expected: int) -> None:
+        # Act
+        reduction = reduction_for_size(width, height, max_size)
+
+        # Assert
+        assert reduction == expected
+
+    def test_load_reduced_image(self, tmp_path: Path) -> None:
+        # Arrange
+        path = tmp_path / "photo.jpg"
+        cv2.imwrite(str(path), np.full((400, 640, 3), 128, dtype=np.uint8))
+
+        # Act
+        img = load_image(str(path), 4)
+
+        # Assert
+        assert img is not None
+        assert img.shape == (100, 160, 3)
+        assert read_image_size(path) == (640, 400)
+
+    def test_load_image_with_unsupported_reduction(self, tmp_path: Path) -> None:
+        # Act / Assert
+        with pytest.raises(ValueError, match="Unsupported reduction"):
+            load_image(str(tmp_path / "photo.jpg"), 3)
+
+    def test_read_image_sizes(self, tmp_path: Path) -> None:
+        # Arrange
+        paths = []
+        for i in range(5):
+            path = tmp_path / f"photo{i}.jpg"
+            cv2.imwrite(str(path), np.zeros((10 + i, 20, 3), dtype=np.uint8))
+            paths.append(path)
+        paths.insert(2, tmp_path / "missing.jpg")
+        progress: list[float] = []
+
+        # Act
+        sizes = read_image_sizes(paths, max_workers=3, progress_callback=progress.append)
+
+        # Assert: the sizes are in the order of the paths
+        assert sizes == [(20, 10), (20, 11), None, (20, 12), (20, 13), (20, 14)]
+        assert progress[-1] == 1.0
+
+    def test_read_image_sizes_stopped(self, tmp_path: Path) -> None:
+        # Act
+        sizes = read_image_sizes([tmp_path / "photo.jpg"], stop_checker=lambda: True)
+
+        # Assert
+        assert sizes is None
+
+
+class TestReadImageSize:
+    @pytest.mark.parametrize(
+        ("name", "progressive"),
+        [
+            ("baseline.jpg", False),
+            ("progressive.jpg", True),
+            ("photo.png", False),
+        ],
+    )
+    def test_probes_the_header(self, tmp_path: Path, name: str, progressive: bool) -> None:
+        # Arrange
+        path = tmp_path / name
+        Image.new("RGB", (64, 48)).save(path, progressive=progressive)
+
+        # Act
+        with path.open("rb") as f:
+            size = _probe_image_size(f)
+
+        # Assert
+        assert size == (64, 48)
+        assert read_image_size(path) == (64, 48)
+
+    @pytest.mark.parametrize(("orientation", "expected"), [(1, (64, 48)), (3, (64, 48)), (6, (48, 64)), (8, (48, 64))])
+    def test_applies_the_exif_orientation(self, tmp_path: Path, orientation: int, expected: tuple[int, int]) -> None:
+        # Arrange
+        path = tmp_path / "photo.jpg"
+        exif = Image.Exif()
+        exif[0x0112] = orientation
+        Image.new("RGB", (64, 48)).save(path, exif=exif)
+
+        # Act
+        size = read_image_size(path)
+
+        # Assert: the size matches the loaded image
+        img = load_image(str(path))
+        assert img is not None
+        assert size == expected
+        assert size == (img.shape[1], img.shape[0])
+
+    def test_falls_back_to_pil(self, tmp_path: Path) -> None:
+        # Arrange
+        path = tmp_path / "photo.bmp"
+        Image.new("RGB", (64, 48)).save(path)
+
+        # Act
+        with path.open("rb") as f:
+            size = _probe_image_size(f)
+
+        # Assert
+        assert size is None
+        assert read_image_size(path) == (64, 48)
+
+    def test_truncated_jpeg(self, tmp_path: Path) -> None:
+        # Arrange
+        path = tmp_path / "photo.jpg"
+        Image.new("RGB", (64, 48)).save(path)
+        path.write_bytes(path.read_bytes()[:30])
+
+        # Act
+        size = read_image_size(path)
+
+        # Assert
+        assert size is None
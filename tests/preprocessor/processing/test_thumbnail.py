@@ -0,0 +1,54 @@
+import os
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from preprocessor.processing.thumbnail import get_thumbnail
+
+
+def _create_photo(path: Path, value: int) -> Path:
+    cv2.imwrite(str(path), np.full((300, 400, 3), value, dtype=np.uint8))
+    return path
+
+
+class TestThumbnail:
+    def test_thumbnail_is_created_and_cached(self, tmp_path: Path) -> None:
+        # Arrange
+        photo = _create_photo(tmp_path / "photo.jpg", 100)
+        cache_dir = tmp_path / "cache"
+
+        # Act
+        thumbnail1 = get_thumbnail(photo, cache_dir)
+        assert thumbnail1 is not None
+        mtime = thumbnail1.stat().st_mtime_ns
+        thumbnail2 = get_thumbnail(photo, cache_dir)
+
+        # Assert: the second call reuses the cached thumbnail
+        assert thumbnail2 == thumbnail1
+        assert thumbnail2.stat().st_mtime_ns == mtime
+        img = cv2.imread(str(thumbnail1))
+        assert img.shape == (90, 120, 3)
+
+    def test_thumbnail_is_recreated_when_photo_changes(self, tmp_path: Path) -> None:
+        # Arrange
+        photo = _create_photo(tmp_path / "photo.jpg", 100)
+        cache_dir = tmp_path / "cache"
+        thumbnail1 = get_thumbnail(photo, cache_dir)
+        _create_photo(photo, 200)
+        os.utime(photo, ns=(0, 1_000_000_000))
+
+        # Act
+        thumbnail2 = get_thumbnail(photo, cache_dir)
+
+        # Assert
+        assert thumbnail2 is not None
+        assert thumbnail2 != thumbnail1
+        assert cv2.imread(str(thumbnail2)).mean() > 150
+
+    def test_missing_photo_has_no_thumbnail(self, tmp_path: Path) -> None:
+        # Act
+        thumbnail = get_thumbnail(tmp_path / "missing.jpg", tmp_path / "cache")
+
+        # Assert
+        assert thumbnail is None
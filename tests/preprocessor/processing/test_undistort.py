@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from preprocessor.processing.params import UndistortMapType
+from preprocessor.processing.undistort import UndistortMapsCache, undistort_image, undistort_maps
+
+CAMERA_MATRIX = ((200.0, 0.0, 80.0), (0.0, 200.0, 60.0), (0.0, 0.0, 1.0))
+
+
+class TestUndistortMaps:
+    def test_maps_are_cached(self) -> None:
+        # Act
+        maps1 = undistort_maps(CAMERA_MATRIX, [0.1, 0.0, 0.0, 0.0, 0.0], 160, 120)
+        maps2 = undistort_maps(CAMERA_MATRIX, (0.1, 0, 0, 0, 0), 160, 120)
+        maps3 = undistort_maps(CAMERA_MATRIX, [0.2, 0.0, 0.0, 0.0, 0.0], 160, 120)
+
+        # Assert: equal parameters share the maps, different parameters don't
+        assert maps1[0] is maps2[0]
+        assert maps1[1] is maps2[1]
+        assert maps1[0] is not maps3[0]
+        assert maps1[0].shape == (120, 160)
+
+    def test_cache_is_limited_by_size(self) -> None:
+        # Arrange: one pair of float maps for 160x120 pixels takes 153,600 bytes
+        cache = UndistortMapsCache(max_bytes=2 * 160 * 120 * 4 * 2)
+        first = cache.get(CAMERA_MATRIX, [0.1, 0.0, 0.0, 0.0, 0.0], 160, 120, UndistortMapType.FLOAT)
+        cache.get(CAMERA_MATRIX, [0.2, 0.0, 0.0, 0.0, 0.0], 160, 120, UndistortMapType.FLOAT)
+
+        # Act
+        cache.get(CAMERA_MATRIX, [0.1, 0.0, 0.0, 0.0, 0.0], 160, 120, UndistortMapType.FLOAT)
+        cache.get(CAMERA_MATRIX, [0.3, 0.0, 0.0, 0.0, 0.0], 160, 120, UndistortMapType.FLOAT)
+
+        # Assert: the least recently used maps have been dropped
+        assert len(cache) == 2
+        assert cache.nbytes == 2 * 160 * 120 * 4 * 2
+        assert cache.get(CAMERA_MATRIX, [0.1, 0.0, 0.0, 0.0, 0.0], 160, 120, UndistortMapType.FLOAT) is first
+
+    def test_cache_keeps_the_last_maps(self) -> None:
+        # Arrange
+        cache = UndistortMapsCache(max_bytes=1)
+
+        # Act
+        maps = cache.get(CAMERA_MATRIX, [0.1, 0.0, 0.0, 0.0, 0.0], 160, 120, UndistortMapType.FLOAT)
+
+        # Assert
+        assert len(cache) == 1
+        assert cache.get(CAMERA_MATRIX, [0.1, 0.0, 0.0, 0.0, 0.0], 160, 120, UndistortMapType.FLOAT) is maps
+
+    def test_maps_are_read_only(self) -> None:
+        # Arrange
+        map1, _ = undistort_maps(CAMERA_MATRIX, [0.1, 0.0, 0.0, 0.0, 0.0], 160, 120)
+
+        # Act / Assert
+        with pytest.raises(ValueError):  # noqa: PT011
+            map1[0, 0] = 1.0
+
+    def test_undistort_image_without_distortion_is_identity(self) -> None:
+        # Arrange
+        rng = np.random.default_rng(42)
+        img = rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+
+        # Act
+        result = undistort_image(img, CAMERA_MATRIX, [0.0, 0.0, 0.0, 0.0, 0.0])
+
+        # Assert
+        assert result is not None
+        assert np.array_equal(result, img)
+
+    def test_fixed_point_maps(self) -> None:
+        # Act
+        map1, map2 = undistort_maps(CAMERA_MATRIX, [0.1, 0.0, 0.0, 0.0, 0.0], 160, 120, UndistortMapType.FIXED_POINT)
+
+        # Assert
+        assert map1.shape == (120, 160, 2)
+        assert map1.dtype == np.int16
+        assert map2.shape == (120, 160)
+        assert map2.dtype == np.uint16
+
+    def test_fixed_point_matches_float(self) -> None:
+        # Arrange
+        rng = np.random.default_rng(42)
+        img = rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+        dist = [0.1, 0.0, 0.0, 0.0, 0.0]
+
+        # Act
+        float_result = undistort_image(img, CAMERA_MATRIX, dist, map_type=UndistortMapType.FLOAT)
+        fixed_result = undistort_image(img, CAMERA_MATRIX, dist, map_type=UndistortMapType.FIXED_POINT)
+
+        # Assert
+        assert float_result is not None
+        assert fixed_result is not None
+        diff = np.abs(float_result.astype(np.int16) - fixed_result.astype(np.int16))
+        assert diff.max() <= 1
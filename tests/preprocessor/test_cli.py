@@ -0,0 +1,81 @@
+import subprocess
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from preprocessor.cli import cli
+from preprocessor.model.project_model import ProjectModel
+
+
+class TestCli:
+    def test_export(self, tmp_path: Path, create_project: Callable[..., ProjectModel]) -> None:
+        # Arrange
+        project_file = create_project(2).file
+
+        # Act
+        result = CliRunner().invoke(cli, ["export", str(project_file), "--output", str(tmp_path / "out"), "-j", "1"])
+
+        # Assert
+        assert result.exit_code == 0, result.output
+        assert "photos/s" in result.output
+        assert sorted(p.name for p in (tmp_path / "out").iterdir()) == ["0001.jpg", "0002.jpg"]
+
+    def test_export_fails_when_a_photo_fails(self, tmp_path: Path, create_project: Callable[..., ProjectModel]) -> None:
+        # Arrange
+        project_file = create_project(2).file
+        (tmp_path / "photo1.jpg").unlink()
+
+        # Act
+        result = CliRunner().invoke(cli, ["export", str(project_file), "--output", str(tmp_path / "out"), "-j", "1"])
+
+        # Assert
+        assert result.exit_code == 1
+        assert "Exported 1 of 2 photos" in result.output
+
+    def test_undistort(self, tmp_path: Path, create_project: Callable[..., ProjectModel]) -> None:
+        # Arrange
+        project_file = create_project(2).file
+
+        # Act
+        result = CliRunner().invoke(cli, ["undistort", str(project_file), "--output", str(tmp_path / "out"), "-j", "1"])
+
+        # Assert
+        assert result.exit_code == 0, result.output
+        assert sorted(p.name for p in (tmp_path / "out").iterdir()) == ["photo0.jpg", "photo1.jpg"]
+
+    def test_undistort_keeps_the_project_relative_paths(
+        self, tmp_path: Path, create_project: Callable[..., ProjectModel]
+    ) -> None:
+        # Arrange: photos with the same filename in different transect folders
+        project_file = create_project(2, filename="transect{i}/photo.jpg").file
+
+        # Act
+        result = CliRunner().invoke(cli, ["undistort", str(project_file), "--output", str(tmp_path / "out"), "-j", "1"])
+
+        # Assert
+        assert result.exit_code == 0, result.output
+        assert sorted(p.relative_to(tmp_path / "out") for p in (tmp_path / "out").rglob("*.jpg")) == [
+            Path("transect0/photo.jpg"),
+            Path("transect1/photo.jpg"),
+        ]
+
+    def test_detect_reports_photos_without_quadrat(self, create_project: Callable[..., ProjectModel]) -> None:
+        # Arrange: the photos are blank, so no quadrat can be found
+        project_file = create_project(1).file
+
+        # Act
+        result = CliRunner().invoke(cli, ["detect", str(project_file), "--force", "-j", "1"])
+
+        # Assert
+        assert result.exit_code == 1
+        assert "Detected the quadrat in 0 of 1 photos" in result.output
+
+    def test_headless_commands_do_not_import_qt_widgets(self) -> None:
+        # Act
+        code = "import sys, preprocessor.cli; print('PySide6.QtWidgets' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+
+        # Assert
+        assert output.strip() == "False"